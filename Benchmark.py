@@ -0,0 +1,189 @@
+import sys
+import time
+import argparse
+from typing import Any, Callable, Dict, List
+from Market import Market
+from Option import Option
+from Model import Model
+from Node import Node
+from Tree import Tree
+from Lattice import Lattice
+from NumbaLattice import NumbaLattice, ThreadedRollingLattice, NUMBA_AVAILABLE
+from ExcelInterface import DEFAULT_DATA
+from Scenarios import ScenarioGrid
+
+
+def create_objects(data: Dict[str, Any], nbsteps: int):
+    """
+    Crée Market, Option et Model à partir des paramètres de pricing.
+    """
+    market = Market(**{k: data[k] for k in ['r', 'vol', 's0', 'div', 'div_date']})
+    option = Option(**{k: data[k] for k in ['option_type', 'type', 'strike', 'maturity']})
+    model = Model(pricing_date=data['pricing_date'], nbsteps=nbsteps, option=option, market=market)
+    return market, option, model
+
+
+def price_tree(data: Dict[str, Any], nbsteps: int) -> float:
+    """
+    Chemin historique Node/Tree.
+    """
+    market, option, model = create_objects(data, nbsteps)
+    node = Node(data['s0'], i=0, market=market, model=model, p_total=1)
+    tree = Tree(node, seuil=data['pruned_level'], market=market, model=model)
+    tree.build_tree(output="S", print_tree=False)
+    return node.price(option, tree)
+
+
+def price_lattice(lattice_class: type) -> Callable[[Dict[str, Any], int], float]:
+    """
+    Renvoie une fonction de valorisation sur un arbre en tableaux de la classe donnée.
+    """
+    def price(data: Dict[str, Any], nbsteps: int) -> float:
+        market, option, model = create_objects(data, nbsteps)
+        return lattice_class(market, model, seuil=data['pruned_level']).price_option(option)
+    return price
+
+
+def timeit(pricer: Callable[[Dict[str, Any], int], float], data: Dict[str, Any], nbsteps: int,
+           repeat: int) -> float:
+    """
+    Renvoie le meilleur temps d'exécution sur repeat valorisations.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pricer(data, nbsteps)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_backends(steps: List[int], repeat: int = 3, data: Dict[str, Any] = None) -> List[List[Any]]:
+    """
+    Compare les temps de valorisation Node/Tree, Lattice (NumPy) et NumbaLattice.
+
+    La compilation Numba est déclenchée (ou relue du cache disque) avant les mesures et n'est pas comptée.
+
+    Args:
+        steps (List[int]): Nombres de pas à mesurer.
+        repeat (int): Nombre de répétitions par mesure (le meilleur temps est retenu).
+        data (Dict[str, Any]): Paramètres de pricing (DEFAULT_DATA par défaut).
+
+    Returns:
+        List[List[Any]]: Lignes [NbSteps, temps Tree, temps NumPy, temps Numba, accélérations vs Tree].
+    """
+    data = data or DEFAULT_DATA
+    # Node.price est récursif : profondeur proportionnelle au nombre de pas
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(steps) + 1000))
+    price_lattice(NumbaLattice)(data, 2)
+
+    results = []
+    for nbsteps in steps:
+        tree_time = timeit(price_tree, data, nbsteps, repeat)
+        numpy_time = timeit(price_lattice(Lattice), data, nbsteps, repeat)
+        numba_time = timeit(price_lattice(NumbaLattice), data, nbsteps, repeat)
+        results.append([nbsteps, tree_time, numpy_time, numba_time, tree_time / numpy_time, tree_time / numba_time])
+    return results
+
+
+def threaded_share(nbsteps: int, min_chunk: int) -> float:
+    """
+    Part des nœuds d'un arbre non élagué (colonne i : 2i + 1 nœuds) situés dans des colonnes assez larges
+    pour être découpées en blocs (au moins 2 * min_chunk nœuds, soit i >= min_chunk).
+    """
+    return max(0.0, 1 - min_chunk ** 2 / (nbsteps + 1) ** 2)
+
+
+def benchmark_threads(nbsteps: int, threads: List[int], repeat: int = 1, data: Dict[str, Any] = None,
+                      min_chunk: int = 2048) -> List[List[Any]]:
+    """
+    Mesure l'accélération d'une seule valorisation sur un arbre profond non élagué (ThreadedRollingLattice,
+    mémoire O(N)) en fonction du nombre de threads. L'arbre doit dépasser min_chunk pas, sans quoi aucune
+    colonne n'est découpée et seul le chemin mono-thread serait mesuré.
+
+    Args:
+        nbsteps (int): Nombre de pas de l'arbre.
+        threads (List[int]): Nombres de threads à mesurer (1 = référence mono-thread).
+        repeat (int): Nombre de répétitions par mesure (le meilleur temps est retenu).
+        data (Dict[str, Any]): Paramètres de pricing (DEFAULT_DATA par défaut).
+        min_chunk (int): Nombre minimal de nœuds par bloc.
+
+    Returns:
+        List[List[Any]]: Lignes [threads, temps, accélération vs 1 thread, prix].
+    """
+    if threaded_share(nbsteps, min_chunk) == 0:
+        raise ValueError(f"Arbre trop peu profond : il faut plus de min_chunk = {min_chunk} pas pour que des "
+                         f"colonnes soient découpées entre les threads.")
+    data = data or DEFAULT_DATA
+    price_lattice(NumbaLattice)(data, 2)
+    results = []
+    for nb_threads in threads:
+        prices = []
+
+        def pricer(data: Dict[str, Any], nbsteps: int) -> float:
+            market, option, model = create_objects(data, nbsteps)
+            lattice = ThreadedRollingLattice(market, model, threads=nb_threads, min_chunk=min_chunk)
+            prices.append(lattice.price_option(option))
+            return prices[-1]
+
+        elapsed = timeit(pricer, data, nbsteps, repeat)
+        results.append([nb_threads, elapsed, (results[0][1] if results else elapsed) / elapsed, prices[-1]])
+    return results
+
+
+def benchmark_scenarios(workers: List[int], nb_positions: int = 8, nbsteps: int = 200, repeat: int = 1,
+                        data: Dict[str, Any] = None) -> List[List[Any]]:
+    """
+    Mesure le passage à l'échelle de ScenarioGrid.run (démarrage des processus compris) en fonction du
+    nombre de processus, sur une grille de 9 chocs de spot, 5 chocs de volatilité et 3 chocs de taux.
+
+    Args:
+        workers (List[int]): Nombres de processus à mesurer (1 = référence).
+        nb_positions (int): Nombre de positions (strikes de 80 % à 120 % du strike de data).
+        nbsteps (int): Nombre de pas des arbres.
+        repeat (int): Nombre de répétitions par mesure (le meilleur temps est retenu).
+        data (Dict[str, Any]): Paramètres de pricing (DEFAULT_DATA par défaut).
+
+    Returns:
+        List[List[Any]]: Lignes [processus, temps, accélération vs 1 processus, efficacité].
+    """
+    data = data or DEFAULT_DATA
+    positions = [dict(data, nbsteps=nbsteps, max_steps=10, print_arbre=False, is_pruned='Oui',
+                      strike=data['strike'] * (0.8 + 0.4 * j / max(nb_positions - 1, 1)))
+                 for j in range(nb_positions)]
+    grid = ScenarioGrid(positions, [x / 20 for x in range(-4, 5)], [x / 100 for x in range(-2, 3)], [-0.01, 0, 0.01])
+    results = []
+    for nb_workers in workers:
+        elapsed = timeit(lambda *_: grid.run(max_workers=nb_workers), data, nbsteps, repeat)
+        speedup = (results[0][1] if results else elapsed) / elapsed
+        results.append([nb_workers, elapsed, speedup, speedup / nb_workers])
+    return results
+
+
+def print_table(header: List[str], rows: List[List[Any]]):
+    print(" | ".join(f"{title:>12}" for title in header))
+    for row in rows:
+        print(" | ".join(f"{value:>12.4f}" if isinstance(value, float) else f"{value:>12}" for value in row))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks des backends de pricing trinomial.")
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, nargs="+", help="Mesure aussi 1 à N threads sur un arbre profond.")
+    parser.add_argument("--deep-steps", type=int, default=20000)
+    parser.add_argument("--min-chunk", type=int, default=2048, help="Nombre minimal de nœuds par bloc.")
+    parser.add_argument("--scenario-workers", type=int, nargs="+",
+                        help="Mesure aussi la grille de scénarios avec 1 à N processus.")
+    args = parser.parse_args()
+
+    print(f"Numba disponible : {NUMBA_AVAILABLE}")
+    print_table(["NbSteps", "Tree (s)", "NumPy (s)", "Numba (s)", "x NumPy", "x Numba"],
+                benchmark_backends(args.steps, args.repeat))
+    if args.threads:
+        print(f"Arbre profond : {args.deep_steps} pas, {threaded_share(args.deep_steps, args.min_chunk):.0%} des "
+              f"nœuds dans des colonnes découpées entre les threads")
+        print_table(["Threads", "Temps (s)", "Accélération", "Prix"],
+                    benchmark_threads(args.deep_steps, sorted(set([1] + args.threads)), min_chunk=args.min_chunk))
+    if args.scenario_workers:
+        print_table(["Processus", "Temps (s)", "Accélération", "Efficacité"],
+                    benchmark_scenarios(sorted(set([1] + args.scenario_workers)), repeat=args.repeat))
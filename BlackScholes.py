@@ -1,4 +1,5 @@
 import math as m
+import numpy as np
 import scipy.stats as stats
 from typing import Dict
 from datetime import datetime
@@ -18,6 +19,10 @@ class BlackScholes:
         self.market = market
         self.option = option
         self.model = model
+        # Taux zéro-coupon et volatilité implicite à maturité (structures par terme ou valeurs plates)
+        t = (model.maturity - model.prdate).days / 365
+        self.r = market.rate(t)
+        self.vol = market.volatility(t)
 
     def d1(self) -> float:
         """
@@ -27,8 +32,8 @@ class BlackScholes:
             float: Valeur calculée de d1.
         """
         t = (self.option.maturity - self.model.prdate).days / 365
-        numerator = m.log(self.market.s0 / self.option.strike) + (self.market.r + 0.5 * self.market.vol ** 2) * t
-        denominator = self.market.vol * m.sqrt(t)
+        numerator = m.log(self.market.s0 / self.option.strike) + (self.r + 0.5 * self.vol ** 2) * t
+        denominator = self.vol * m.sqrt(t)
         return numerator / denominator
 
     def d2(self) -> float:
@@ -39,7 +44,7 @@ class BlackScholes:
             float: Valeur calculée de d2.
         """
         t = (self.option.maturity - self.model.prdate).days / 365
-        return self.d1() - self.market.vol * m.sqrt(t)
+        return self.d1() - self.vol * m.sqrt(t)
 
     def price(self) -> float:
         """
@@ -51,9 +56,9 @@ class BlackScholes:
         t = (self.option.maturity - self.model.prdate).days / 365
         if self.option.op_type == "Call":
             return (self.market.s0 * stats.norm.cdf(self.d1()) -
-                    self.option.strike * m.exp(-self.market.r * t) * stats.norm.cdf(self.d2()))
+                    self.option.strike * m.exp(-self.r * t) * stats.norm.cdf(self.d2()))
         else:
-            return (self.option.strike * m.exp(-self.market.r * t) * stats.norm.cdf(-self.d2()) -
+            return (self.option.strike * m.exp(-self.r * t) * stats.norm.cdf(-self.d2()) -
                     self.market.s0 * stats.norm.cdf(-self.d1()))
 
     def calculate_greeks(self) -> Dict[str, float]:
@@ -96,7 +101,7 @@ class BlackScholes:
             float: Valeur calculée de Gamma.
         """
         t = (self.option.maturity - self.model.prdate).days / 365
-        return stats.norm.pdf(self.d1()) / (self.market.s0 * self.market.vol * m.sqrt(t))
+        return stats.norm.pdf(self.d1()) / (self.market.s0 * self.vol * m.sqrt(t))
 
     def vega(self) -> float:
         """
@@ -117,11 +122,11 @@ class BlackScholes:
         """
         t = (self.option.maturity - self.model.prdate).days / 365
         if self.option.op_type == "Call":
-            return -(self.market.s0 * stats.norm.pdf(self.d1()) * self.market.vol) / (2 * m.sqrt(t)) - \
-                self.market.r * self.option.strike * m.exp(-self.market.r * t) * stats.norm.cdf(self.d2())
+            return -(self.market.s0 * stats.norm.pdf(self.d1()) * self.vol) / (2 * m.sqrt(t)) - \
+                self.r * self.option.strike * m.exp(-self.r * t) * stats.norm.cdf(self.d2())
         else:
-            return -(self.market.s0 * stats.norm.pdf(self.d1()) * self.market.vol) / (2 * m.sqrt(t)) + \
-                self.market.r * self.option.strike * m.exp(-self.market.r * t) * stats.norm.cdf(-self.d2())
+            return -(self.market.s0 * stats.norm.pdf(self.d1()) * self.vol) / (2 * m.sqrt(t)) + \
+                self.r * self.option.strike * m.exp(-self.r * t) * stats.norm.cdf(-self.d2())
 
     def rho(self) -> float:
         """
@@ -132,6 +137,51 @@ class BlackScholes:
         """
         t = (self.option.maturity - self.model.prdate).days / 365
         if self.option.op_type == "Call":
-            return self.option.strike * t * m.exp(-self.market.r * t) * stats.norm.cdf(self.d2())
+            return self.option.strike * t * m.exp(-self.r * t) * stats.norm.cdf(self.d2())
         else:
-            return -self.option.strike * t * m.exp(-self.market.r * t) * stats.norm.cdf(-self.d2())
+            return -self.option.strike * t * m.exp(-self.r * t) * stats.norm.cdf(-self.d2())
+
+    @staticmethod
+    def price_array(s0, strikes, r, vol, t, is_call) -> np.ndarray:
+        """
+        Calcule le prix Black-Scholes de plusieurs options à la fois (arguments diffusés par NumPy).
+
+        Args:
+            s0: Prix du sous-jacent.
+            strikes: Prix d'exercice.
+            r: Taux d'intérêt sans risque (taux zéro-coupon de la maturité de chaque option).
+            vol: Volatilité.
+            t: Temps jusqu'à maturité en années.
+            is_call: Vrai pour un Call, faux pour un Put.
+
+        Returns:
+            np.ndarray: Prix calculés des options.
+        """
+        s0, strikes, r, vol, t = (np.asarray(x, dtype=float) for x in (s0, strikes, r, vol, t))
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(s0 / strikes) + (r + 0.5 * vol ** 2) * t) / (vol * sqrt_t)
+        d2 = d1 - vol * sqrt_t
+        discounted_strike = strikes * np.exp(-r * t)
+        call = s0 * stats.norm.cdf(d1) - discounted_strike * stats.norm.cdf(d2)
+        put = discounted_strike * stats.norm.cdf(-d2) - s0 * stats.norm.cdf(-d1)
+        return np.where(is_call, call, put)
+
+    @staticmethod
+    def vega_array(s0, strikes, r, vol, t) -> np.ndarray:
+        """
+        Calcule le Vega Black-Scholes de plusieurs options à la fois (identique pour un Call et un Put).
+
+        Args:
+            s0: Prix du sous-jacent.
+            strikes: Prix d'exercice.
+            r: Taux d'intérêt sans risque (taux zéro-coupon de la maturité de chaque option).
+            vol: Volatilité.
+            t: Temps jusqu'à maturité en années.
+
+        Returns:
+            np.ndarray: Vegas calculés.
+        """
+        s0, strikes, r, vol, t = (np.asarray(x, dtype=float) for x in (s0, strikes, r, vol, t))
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(s0 / strikes) + (r + 0.5 * vol ** 2) * t) / (vol * sqrt_t)
+        return s0 * stats.norm.pdf(d1) * sqrt_t
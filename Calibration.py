@@ -0,0 +1,181 @@
+import time
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from Market import Market
+from BlackScholes import BlackScholes
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+
+
+class VolCalibrator:
+    """
+    Calibre une volatilité (plate ou par maturité) sur des primes observées d'options européennes et
+    américaines, par moindres carrés (Levenberg-Marquardt).
+
+    À chaque itération, toutes les cotations sont valorisées en un seul lot : un arbre par maturité,
+    partagé par toutes les cotations de cette maturité grâce à l'induction multi-payoff du Lattice. Les
+    arbres sont construits par Convergence.create_lattice, avec les mêmes réglages (backend, lissage BBS,
+    grille raffinée) que les prix calibrés.
+    Le jacobien utilise les vegas analytiques de Black-Scholes.
+    """
+
+    def __init__(self, data: Dict[str, Any], quotes: List[Dict[str, Any]], term_structure: bool = False,
+                 backend: Optional[str] = None, smooth: bool = False, refine_grid: bool = False):
+        """
+        Initialise le calibrateur.
+
+        Args:
+            data (Dict[str, Any]): Paramètres de marché et de pricing (format de ExcelInterface.read_data),
+                la volatilité 'vol' (plate ou courbe, lue à la maturité de chaque groupe) sert de point de départ.
+            quotes (List[Dict[str, Any]]): Cotations avec les clés 'option_type', 'type', 'strike',
+                'maturity' et 'premium'.
+            term_structure (bool): Vrai pour calibrer une volatilité par maturité, faux pour une volatilité plate.
+            backend (Optional[str]): Backend des arbres ("numpy", "numba" ou "threaded", celui de Convergence
+                par défaut).
+            smooth (bool): Vrai pour le lissage BBS du dernier pas (voir Convergence.smooth).
+            refine_grid (bool): Vrai pour la grille de temps raffinée (voir Convergence.refine_grid).
+        """
+        if not quotes:
+            raise ValueError("Aucune cotation à calibrer.")
+        self.data = data
+        self.term_structure = term_structure
+        self.prdate = self.to_datetime(data['pricing_date'])
+        # Paramètres et réglages communs, copiés pour chaque maturité et chaque volatilité essayée
+        self.convergence = Convergence(DataInterface(dict(data, print_arbre=False)))
+        if backend is not None:
+            self.convergence.backend = backend
+        self.convergence.smooth = smooth
+        self.convergence.refine_grid = refine_grid
+
+        self.maturities = np.array([self.to_datetime(q['maturity']) for q in quotes])
+        self.strikes = np.array([q['strike'] for q in quotes], dtype=float)
+        self.is_call = np.array([q['option_type'] == "Call" for q in quotes])
+        self.is_american = np.array([q['type'] == "American" for q in quotes])
+        self.premiums = np.array([q['premium'] for q in quotes], dtype=float)
+        self.t = np.array([(mat - self.prdate).days / 365 for mat in self.maturities])
+        # Taux plat ou courbe de taux : taux zéro-coupon de la maturité de chaque cotation pour les vegas
+        self.market = Market(data['r'], data['vol'], data['s0'], data['div'], data['div_date'])
+        self.rates = np.array([self.market.rate(t) for t in self.t])
+
+        # Regroupement des cotations par maturité : un arbre par groupe et par itération
+        self.expiries = sorted(set(self.maturities))
+        self.groups = [np.flatnonzero(self.maturities == mat) for mat in self.expiries]
+        self.nb_builds = 0
+
+    @staticmethod
+    def to_datetime(value) -> datetime:
+        """
+        Convertit une date au format '%Y-%m-%d' en datetime (comme Model).
+        """
+        return value if isinstance(value, datetime) else datetime.strptime(value, '%Y-%m-%d')
+
+    def quote_vols(self, params: np.ndarray) -> np.ndarray:
+        """
+        Renvoie la volatilité appliquée à chaque cotation.
+
+        Args:
+            params (np.ndarray): Volatilité plate (taille 1) ou volatilités par maturité.
+
+        Returns:
+            np.ndarray: Volatilité de chaque cotation.
+        """
+        vols = np.empty(len(self.premiums))
+        for g, idx in enumerate(self.groups):
+            vols[idx] = params[g] if self.term_structure else params[0]
+        return vols
+
+    def price_all(self, params: np.ndarray) -> np.ndarray:
+        """
+        Valorise toutes les cotations en un lot, avec un arbre par maturité.
+
+        Args:
+            params (np.ndarray): Paramètres de volatilité.
+
+        Returns:
+            np.ndarray: Prix trinomiaux de toutes les cotations.
+        """
+        prices = np.empty(len(self.premiums))
+        for g, (maturity, idx) in enumerate(zip(self.expiries, self.groups)):
+            vol = params[g] if self.term_structure else params[0]
+            convergence = self.convergence.scenario(vol=float(vol), maturity=maturity)
+            market, _, model = convergence.create_objects()
+            lattice = convergence.create_lattice(market, model)
+            prices[idx] = lattice.price(self.strikes[idx], self.is_call[idx], self.is_american[idx])
+            self.nb_builds += 1
+        return prices
+
+    def jacobian(self, params: np.ndarray) -> np.ndarray:
+        """
+        Calcule le jacobien des prix par rapport aux paramètres à partir des vegas analytiques.
+
+        Args:
+            params (np.ndarray): Paramètres de volatilité.
+
+        Returns:
+            np.ndarray: Jacobien de taille (nombre de cotations, nombre de paramètres).
+        """
+        vegas = BlackScholes.vega_array(self.data['s0'], self.strikes, self.rates, self.quote_vols(params), self.t)
+        if not self.term_structure:
+            return vegas[:, None]
+        jac = np.zeros((len(self.premiums), len(self.groups)))
+        for g, idx in enumerate(self.groups):
+            jac[idx, g] = vegas[idx]
+        return jac
+
+    def calibrate(self, max_iter: int = 50, tol: float = 1e-6, vol_bounds=(1e-4, 5.0)) -> Dict[str, Any]:
+        """
+        Ajuste la volatilité par Levenberg-Marquardt.
+
+        Args:
+            max_iter (int): Nombre maximal d'itérations.
+            tol (float): Tolérance sur le pas de volatilité pour l'arrêt.
+            vol_bounds (tuple): Bornes de la volatilité.
+
+        Returns:
+            Dict[str, Any]: Volatilités calibrées, nombre d'itérations, nombre d'arbres construits,
+            temps d'exécution et résidus (prix modèle - prime).
+        """
+        start = time.perf_counter()
+        self.nb_builds = 0
+        expiry_times = [self.t[idx[0]] for idx in self.groups]
+        start_times = expiry_times if self.term_structure else expiry_times[-1:]
+        params = np.array([self.market.volatility(t) for t in start_times])
+        residuals = self.price_all(params) - self.premiums
+        cost = residuals @ residuals
+        damping = 1e-3
+        iterations = 0
+
+        for iterations in range(1, max_iter + 1):
+            jac = self.jacobian(params)
+            hessian = jac.T @ jac
+            gradient = jac.T @ residuals
+            step = -np.linalg.solve(hessian + damping * np.diag(np.diag(hessian)) + 1e-12 * np.eye(len(params)),
+                                    gradient)
+            new_params = np.clip(params + step, *vol_bounds)
+            new_residuals = self.price_all(new_params) - self.premiums
+            new_cost = new_residuals @ new_residuals
+
+            if new_cost <= cost:
+                step = new_params - params
+                params, residuals, cost = new_params, new_residuals, new_cost
+                damping = max(damping / 10, 1e-10)
+                if np.max(np.abs(step)) < tol:
+                    break
+            else:
+                damping *= 10
+                if damping > 1e10:
+                    break
+
+        if self.term_structure:
+            vols = {maturity: float(vol) for maturity, vol in zip(self.expiries, params)}
+        else:
+            vols = {maturity: float(params[0]) for maturity in self.expiries}
+        return {
+            "Vols": vols,
+            "Iterations": iterations,
+            "Builds": self.nb_builds,
+            "Time": time.perf_counter() - start,
+            "Residuals": residuals.tolist(),
+            "RMSE": float(np.sqrt(cost / len(residuals)))
+        }
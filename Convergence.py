@@ -1,10 +1,15 @@
+import numpy as np
 from Market import Market
 from Option import Option
 from Model import Model
 from Node import Node
 from Tree import Tree
+from Lattice import Lattice, RollingLattice
+from NumbaLattice import (NumbaLattice, NumbaRollingLattice, ThreadedLattice, ThreadedRollingLattice,
+                          NUMBA_AVAILABLE)
 from BlackScholes import BlackScholes
-from ExcelInterface import ExcelInterface
+from ExcelInterface import ExcelInterface, DataInterface
+from typing import List, Optional, Sequence, Tuple
 class Convergence:
 
     def __init__(self, interface: ExcelInterface):
@@ -12,6 +17,43 @@ class Convergence:
         self.data = interface.read_data()
         self.is_pruned = self.data.get('is_pruned', 'Non') == 'Oui'
         self.print_arbre = False
+        # Backend des arbres en tableaux : "numba" (noyaux compilés) si disponible, sinon "numpy" ; "threaded"
+        # répartit en plus les colonnes des arbres très profonds sur un pool de threads
+        self.backend = "numba" if NUMBA_AVAILABLE else "numpy"
+        # Grille de temps des arbres en tableaux resserrée autour du dividende et de la maturité
+        self.refine_grid = False
+        # Dernier pas remplacé par la formule de Black-Scholes (méthode BBS) dans les arbres en tableaux
+        self.smooth = False
+
+    def scenario(self, **overrides) -> 'Convergence':
+        # Copie indépendante des paramètres (éventuellement modifiés) avec les mêmes réglages de moteur, pour
+        # valoriser des scénarios bumpés, y compris en parallèle, sans toucher à l'instance courante
+        convergence = Convergence(DataInterface(dict(self.data, **overrides)))
+        convergence.is_pruned = self.is_pruned
+        convergence.print_arbre = self.print_arbre
+        convergence.backend = self.backend
+        convergence.refine_grid = self.refine_grid
+        convergence.smooth = self.smooth
+        return convergence
+
+    def create_objects(self) -> Tuple[Market, Option, Model]:
+        market = Market(**{k: self.data[k] for k in ['r', 'vol', 's0', 'div', 'div_date']})
+        option = Option(**{k: self.data[k] for k in ['option_type', 'type', 'strike', 'maturity']})
+        model = Model(pricing_date=self.data['pricing_date'], nbsteps=self.data['nbsteps'],
+                      option=option, market=market, refine=self.refine_grid)
+        return market, option, model
+
+    def lattice_class(self, price_only: bool = False) -> type:
+        if self.backend == "threaded" and NUMBA_AVAILABLE:
+            return ThreadedRollingLattice if price_only else ThreadedLattice
+        if self.backend == "numba" and NUMBA_AVAILABLE:
+            return NumbaRollingLattice if price_only else NumbaLattice
+        return RollingLattice if price_only else Lattice
+
+    def create_lattice(self, market: Market, model: Model, price_only: bool = False) -> Lattice:
+        seuil = self.data['pruned_level'] if self.is_pruned else 0
+        return self.lattice_class(price_only)(market, model, seuil=seuil, smooth=self.smooth)
+
     def run_trinomial(self) -> float:
         market = Market(**{k: self.data[k] for k in ['r', 'vol', 's0', 'div', 'div_date']})
         option = Option(**{k: self.data[k] for k in ['option_type', 'type', 'strike', 'maturity']})
@@ -29,6 +71,94 @@ class Convergence:
     
         return node.price(option, tree)
 
+    def run_lattice(self, price_only: bool = False) -> float:
+        # En mode prix seul, seules deux colonnes sont gardées en mémoire (O(N)) : utile pour nbsteps >= 10^4
+        market, option, model = self.create_objects()
+        return self.create_lattice(market, model, price_only).price_option(option)
+
+    def run_adaptive(self, tol: float = 1e-3, rel_tol: float = 0.0, extrapolate: bool = False,
+                     start_steps: int = 25, growth: int = 2, max_steps: int = 20000) -> dict:
+        # N croît géométriquement jusqu'à ce que deux estimations successives concordent à la tolérance près.
+        # Avec extrapolate, l'erreur de l'arbre étant en O(1/N), chaque estimation est extrapolée (Richardson) :
+        # (growth * P(growth * N) - P(N)) / (growth - 1). Peu fiable tant que le prix oscille avec N : à combiner
+        # avec smooth (méthode BBS), qui supprime l'oscillation due à la position du strike.
+        original_nbsteps = self.data['nbsteps']
+        nb_steps = start_steps
+        previous_price, previous_estimate = None, None
+        # Nombre d'estimations déjà calculées : avec extrapolate, la première (prix brut) n'est pas comparable
+        nb_estimates = 0
+        try:
+            while True:
+                self.data['nbsteps'] = nb_steps
+                price = self.run_lattice(price_only=True)
+                estimate = price
+                if extrapolate and previous_price is not None:
+                    estimate = (growth * price - previous_price) / (growth - 1)
+
+                # Une estimation extrapolée n'est comparable qu'à une autre estimation extrapolée
+                comparable = nb_estimates >= (2 if extrapolate else 1)
+                if comparable:
+                    error = abs(estimate - previous_estimate)
+                    if error <= max(tol, rel_tol * abs(estimate)) or nb_steps * growth > max_steps:
+                        return {"Price": estimate, "NbSteps": nb_steps, "Error": error,
+                                "Converged": error <= max(tol, rel_tol * abs(estimate))}
+                elif nb_steps * growth > max_steps:
+                    return {"Price": estimate, "NbSteps": nb_steps, "Error": None, "Converged": False}
+
+                previous_price, previous_estimate = price, estimate
+                nb_estimates += 1
+                nb_steps *= growth
+        finally:
+            self.data['nbsteps'] = original_nbsteps
+
+    def run_control_variate(self, price_only: bool = False) -> dict:
+        # Prix américain corrigé par l'erreur de l'arbre sur l'européenne équivalente (connue exactement par
+        # Black-Scholes) : P_CV = P_am + (P_BS - P_eu). Les deux payoffs sont valorisés sur le même arbre.
+        # Pour une option européenne, la correction redonne exactement le prix Black-Scholes, renvoyé tel quel.
+        market, option, model = self.create_objects()
+        lattice = self.create_lattice(market, model, price_only)
+        if not lattice.is_scale_invariant():
+            raise ValueError("Black-Scholes ne prend pas en compte le dividende : variable de contrôle impossible.")
+        if option.type != "American":
+            european_price = lattice.price_option(option)
+            bs_price = BlackScholes(market, option, model).price()
+            return {"Price": float(bs_price), "American": None, "European": float(european_price),
+                    "BlackScholes": float(bs_price)}
+        american_price, european_price = lattice.price([option.strike, option.strike], option.op_type == "Call",
+                                                       [True, False])
+        european = Option(option.op_type, "European", option.strike, model.maturity)
+        bs_price = BlackScholes(market, european, model).price()
+        return {"Price": float(american_price + bs_price - european_price), "American": float(american_price),
+                "European": float(european_price), "BlackScholes": float(bs_price)}
+
+    def convergence_control_variate(self, steps: Sequence[int], reference_steps: int = 5000) -> dict:
+        # Compare, sur les mêmes N, l'erreur du prix américain brut et du prix corrigé par rapport à un prix
+        # de référence (arbre brut à reference_steps pas, en mémoire O(N)).
+        if self.data['type'] != "American":
+            raise ValueError("La variable de contrôle ne s'applique qu'aux options américaines.")
+        original_nbsteps = self.data['nbsteps']
+        try:
+            self.data['nbsteps'] = reference_steps
+            reference = self.run_lattice(price_only=True)
+            rows = []
+            for nb_steps in steps:
+                self.data['nbsteps'] = nb_steps
+                result = self.run_control_variate()
+                rows.append([nb_steps, result["American"], result["Price"], reference])
+        finally:
+            self.data['nbsteps'] = original_nbsteps
+
+        plain_errors = np.array([row[1] - reference for row in rows])
+        cv_errors = np.array([row[2] - reference for row in rows])
+        return {
+            "Rows": rows,
+            "Reference": reference,
+            "PlainRMSE": float(np.sqrt(np.mean(plain_errors ** 2))),
+            "ControlVariateRMSE": float(np.sqrt(np.mean(cv_errors ** 2))),
+            "ErrorReduction": float(np.sqrt(np.mean(plain_errors ** 2) / np.mean(cv_errors ** 2))),
+            "VarianceReduction": float(np.var(plain_errors) / np.var(cv_errors))
+        }
+
     def run_black_scholes(self) -> dict:
         market = Market(**{k: self.data[k] for k in ['r', 'vol', 's0', 'div', 'div_date']})
         option = Option(**{k: self.data[k] for k in ['option_type', 'type', 'strike', 'maturity']})
@@ -41,14 +171,21 @@ class Convergence:
 
         return {"Price": price, "Greeks": greeks}
 
-    def convergence_nbsteps(self) -> list:
+    def run_spot_ladder(self, spots: Sequence[float]) -> List[float]:
+        # Un seul arbre pour toute la gamme de spots tant qu'aucun dividende ne casse l'invariance d'échelle
+        market, option, model = self.create_objects()
+        lattice = self.create_lattice(market, model)
+        return lattice.price_spot_ladder(spots, option.strike, option.op_type == "Call",
+                                         option.type == "American").tolist()
+
+    def convergence_nbsteps(self, price_only: bool = False, steps: Optional[Sequence[int]] = None) -> list:
         max_steps = self.data['max_steps']
         convergence_results = []
 
         bs_result = self.run_black_scholes()  # Appeler run_black_scholes pour obtenir le résultat complet
-        for nb_steps in range(1, max_steps + 1):
+        for nb_steps in (steps if steps is not None else range(1, max_steps + 1)):
             self.data['nbsteps'] = nb_steps
-            trinomial_price = self.run_trinomial()
+            trinomial_price = self.run_lattice(price_only=True) if price_only else self.run_trinomial()
             # Extraire le prix de Black & Scholes du résultat
             bs_price = bs_result["Price"]
             convergence_diff = (trinomial_price - bs_price) * nb_steps
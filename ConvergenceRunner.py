@@ -0,0 +1,140 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+
+
+def price_convergence_job(data: Dict[str, Any], nb_steps: int, strike: float) -> float:
+    """
+    Valorise une option (arbre trinomial Node/Tree, comme la version série) pour un couple (N, strike).
+
+    Args:
+        data (Dict[str, Any]): Paramètres de pricing.
+        nb_steps (int): Nombre de pas de l'arbre.
+        strike (float): Prix d'exercice.
+
+    Returns:
+        float: Prix trinomial.
+    """
+    data = dict(data, nbsteps=nb_steps, strike=strike, print_arbre=False)
+    return Convergence(DataInterface(data)).run_trinomial()
+
+
+class ConvergenceRunner:
+    """
+    Exécute les études de convergence (en N et en strike) sur un pool de processus.
+
+    Les tâches (N, strike) sont indépendantes et soumises des plus coûteuses aux moins coûteuses pour
+    équilibrer la charge. Les lignes sont produites au fil de l'eau (pour mettre à jour Excel, un CSV ou un
+    affichage de progression) ; les résultats finaux sont ordonnés et identiques aux versions série
+    Convergence.convergence_nbsteps et Convergence.convergence_strike.
+    """
+
+    def __init__(self, convergence: Convergence, max_workers: Optional[int] = None):
+        """
+        Initialise le runner.
+
+        Args:
+            convergence (Convergence): Objet Convergence portant les paramètres de pricing.
+            max_workers (Optional[int]): Nombre de processus (nombre de cœurs par défaut).
+        """
+        self.convergence = convergence
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def submit_all(self, executor: ProcessPoolExecutor, jobs: List[Tuple[int, float]]) -> Dict[Any, int]:
+        """
+        Soumet les tâches (N, strike), les plus grands arbres en premier.
+
+        Returns:
+            Dict[Any, int]: Indice de ligne de chaque tâche soumise.
+        """
+        data = self.convergence.data
+        order = sorted(range(len(jobs)), key=lambda index: -jobs[index][0])
+        return {executor.submit(price_convergence_job, data, *jobs[index]): index for index in order}
+
+    def stream_nbsteps(self) -> Iterator[Tuple[int, list]]:
+        """
+        Produit les lignes de convergence en N au fur et à mesure de leur calcul.
+
+        Yields:
+            Tuple[int, list]: Indice de la ligne et ligne [NbSteps, prix trinomial, prix BS, écart x NbSteps].
+        """
+        steps = list(range(1, self.convergence.data['max_steps'] + 1))
+        bs_price = self.convergence.run_black_scholes()["Price"]
+        strike = self.convergence.data['strike']
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = self.submit_all(executor, [(nb_steps, strike) for nb_steps in steps])
+            for future in as_completed(futures):
+                index = futures[future]
+                trinomial_price = future.result()
+                nb_steps = steps[index]
+                yield index, [nb_steps, trinomial_price, bs_price, (trinomial_price - bs_price) * nb_steps]
+
+    def stream_strike(self, nb_steps: int = 10) -> Iterator[Tuple[int, list]]:
+        """
+        Produit les lignes de convergence en strike au fur et à mesure et dans l'ordre des strikes : une ligne
+        est produite dès que les prix de tous les strikes jusqu'au sien sont connus (le précédent sert aux pentes).
+
+        Yields:
+            Tuple[int, list]: Indice de la ligne et ligne [Strike, prix trinomial, prix BS, écart, pentes].
+        """
+        original_strike = int(self.convergence.data['strike'])
+        max_range = int(original_strike * 0.10)
+        strike_range = list(range(original_strike - max_range, original_strike + max_range + 1))
+
+        bs_prices = []
+        try:
+            for strike in strike_range:
+                self.convergence.data['strike'] = strike
+                bs_prices.append(self.convergence.run_black_scholes()["Price"])
+        finally:
+            self.convergence.data['strike'] = original_strike
+
+        trinomial_prices = {}
+        next_row = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = self.submit_all(executor, [(nb_steps, strike) for strike in strike_range])
+            for future in as_completed(futures):
+                trinomial_prices[futures[future]] = future.result()
+                # Lignes devenues complètes à la suite des lignes déjà produites
+                while next_row in trinomial_prices:
+                    yield next_row, self.strike_row(next_row, strike_range, trinomial_prices, bs_prices)
+                    next_row += 1
+
+    @staticmethod
+    def strike_row(index: int, strike_range: List[int], trinomial_prices: Dict[int, float],
+                   bs_prices: List[float]) -> list:
+        """
+        Construit une ligne de convergence en strike (mêmes calculs que Convergence.convergence_strike).
+        """
+        strike = strike_range[index]
+        trinomial_price, bs_price = trinomial_prices[index], bs_prices[index]
+        if index > 0:
+            trinomial_slope = (trinomial_price - trinomial_prices[index - 1]) / (strike - (strike - 1))
+            bs_slope = (bs_price - bs_prices[index - 1]) / (strike - (strike - 1))
+        else:
+            trinomial_slope = None
+            bs_slope = None
+        return [strike, trinomial_price, bs_price, trinomial_price - bs_price, trinomial_slope, bs_slope]
+
+    @staticmethod
+    def collect(stream: Iterator[Tuple[int, list]]) -> list:
+        """
+        Rassemble les lignes d'un flux dans l'ordre de la version série.
+        """
+        rows = dict(stream)
+        return [rows[index] for index in range(len(rows))]
+
+    def convergence_nbsteps(self) -> list:
+        """
+        Équivalent parallèle de Convergence.convergence_nbsteps.
+        """
+        return self.collect(self.stream_nbsteps())
+
+    def convergence_strike(self, nb_steps: int = 10) -> list:
+        """
+        Équivalent parallèle de Convergence.convergence_strike.
+        """
+        return self.collect(self.stream_strike(nb_steps))
@@ -1,11 +1,93 @@
 import xlwings as xw
+from datetime import datetime
 from typing import Dict, Any, List, Tuple, Optional
 
 
+# Paramètres lus dans la feuille 'Pricing' : clé du dictionnaire de données -> plage nommée
+INPUT_NAMES = {
+    'r': 'Rate',
+    'vol': 'Vol',
+    's0': 'StartPrice',
+    'div': 'Div',
+    'div_date': 'Div_Date',
+    'option_type': 'Type',
+    'type': 'Type_exercice',
+    'strike': 'Strike',
+    'maturity': 'Maturity',
+    'pricing_date': 'AsOfDate',
+    'nbsteps': 'Nb_Steps',
+    'max_steps': 'max_steps',
+    'print_arbre': 'Print_tree',
+    'is_pruned': 'is_pruning',
+    'pruned_level': 'level_pruning'
+}
+
+# Paramètres par défaut de la feuille 'Pricing', pour les outils en ligne de commande (Benchmark, PriceSurface)
+DEFAULT_DATA = {
+    'r': 0.02, 'vol': 0.3, 's0': 100, 'div': 0, 'div_date': datetime(2024, 3, 1),
+    'option_type': 'Put', 'type': 'American', 'strike': 101, 'maturity': datetime(2024, 9, 1),
+    'pricing_date': datetime(2023, 9, 1), 'pruned_level': 1e-7
+}
+
+# Blocs de résultats de la feuille 'Pricing' : cellule du prix et première cellule du bloc des Grecques
+TRINOMIAL_CELLS = ('H3', 'H8')
+BLACK_SCHOLES_CELLS = ('J3', 'J8')
+# Ligne de chaque Grecque dans le bloc (une ligne sur deux)
+GREEKS_ROWS = {'Delta': 0, 'Gamma': 2, 'Vega': 4, 'Rho': 6, 'Theta': 8}
+
+EURO_SYMBOL = '€'
+DECIMAL_PLACES = 6  # Nombre de décimales après la virgule
+
+
+def parse_inputs(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convertit les valeurs brutes des plages nommées en paramètres de pricing.
+
+    Args:
+        values (Dict[str, Any]): Valeurs lues, indexées par les clés de INPUT_NAMES.
+
+    Returns:
+        Dict[str, Any]: Un dictionnaire contenant les paramètres lus.
+    """
+    data = dict(values)
+    data['nbsteps'] = int(values['nbsteps'])
+    data['max_steps'] = int(values['max_steps'])
+    data['print_arbre'] = bool(values['print_arbre'])
+    data['is_pruned'] = values['is_pruned'].strip()
+    return data
+
+
+def price_text(price: float) -> str:
+    """
+    Formate un prix pour l'affichage dans la feuille (arrondi, symbole euro).
+    """
+    return f"{round(price, DECIMAL_PLACES):.{DECIMAL_PLACES}f} {EURO_SYMBOL}"
+
+
+def greeks_block(greeks: Dict[str, float]) -> List[List[Optional[str]]]:
+    """
+    Construit le bloc colonne des Grecques (une Grecque une ligne sur deux) pour une écriture en une fois.
+
+    Args:
+        greeks (Dict[str, float]): Grecques à écrire.
+
+    Returns:
+        List[List[Optional[str]]]: Le bloc de cellules, ligne par ligne.
+    """
+    block = [[None] for _ in range(max(GREEKS_ROWS.values()) + 1)]
+    for greek, row in GREEKS_ROWS.items():
+        if greek in greeks:
+            block[row][0] = f"{greeks[greek]:.{DECIMAL_PLACES}f}"
+    return block
+
+
 class ExcelInterface:
     """
     Interface pour interagir avec un classeur Excel en utilisant xlwings.
     Gère la lecture des données et l'écriture des résultats dans des feuilles de calcul spécifiques.
+
+    Les entrées sont lues en un seul appel (bloc couvrant toutes les plages nommées) et chaque bloc de
+    résultats est écrit en une seule affectation de tableau.
     """
 
     def __init__(self, workbook_path: str):
@@ -21,30 +103,25 @@ class ExcelInterface:
         self.sht_conv_strike = self.wb.sheets['Convergence_Strike']
         self.sht_arbre = self.wb.sheets['Arbre']
 
+        # Position (ligne, colonne) de chaque plage nommée, résolue une seule fois
+        self.input_cells = {}
+        for key, name in INPUT_NAMES.items():
+            cell = self.sht.range(name)
+            self.input_cells[key] = (cell.row, cell.column)
+
     def read_data(self) -> Dict[str, Any]:
         """
-        Lit les données de configuration à partir de la feuille Excel 'Pricing'.
+        Lit les données de configuration à partir de la feuille Excel 'Pricing', en un seul appel.
 
         Returns:
             Dict[str, Any]: Un dictionnaire contenant les paramètres lus.
         """
-        return {
-            'r': self.sht.range('Rate').value,
-            'vol': self.sht.range('Vol').value,
-            's0': self.sht.range('StartPrice').value,
-            'div': self.sht.range('Div').value,
-            'div_date': self.sht.range('Div_Date').value,
-            'option_type': self.sht.range('Type').value,
-            'type': self.sht.range('Type_exercice').value,
-            'strike': self.sht.range('Strike').value,
-            'maturity': self.sht.range('Maturity').value,
-            'pricing_date': self.sht.range('AsOfDate').value,
-            'nbsteps': int(self.sht.range('Nb_Steps').value),
-            'max_steps': int(self.sht.range('max_steps').value),
-            'print_arbre': bool(self.sht.range('Print_tree').value),
-            'is_pruned': self.sht.range('is_pruning').value.strip(),
-            'pruned_level': self.sht.range('level_pruning').value
-        }
+        rows = [row for row, _ in self.input_cells.values()]
+        columns = [column for _, column in self.input_cells.values()]
+        top, left = min(rows), min(columns)
+        block = self.sht.range((top, left), (max(rows), max(columns))).options(ndim=2).value
+        return parse_inputs({key: block[row - top][column - left]
+                             for key, (row, column) in self.input_cells.items()})
 
     def write_trinomial_results(self, trinomial_result: Optional[float] = None,
                                 trinomial_greeks: Optional[Dict[str, float]] = None):
@@ -55,27 +132,11 @@ class ExcelInterface:
             trinomial_result (Optional[float]): Prix calculé par le modèle trinomial.
             trinomial_greeks (Optional[Dict[str, float]]): Grecques du modèle trinomial.
         """
-        euro_symbol = '€'
-        decimal_places = 6  # Nombre de décimales après la virgule
-    
-        # Définition des cellules de résultat
-        trinomial_price_cell = 'H3'
-        greeks_cells = {
-            'Delta': 'H8',
-            'Gamma': 'H10',
-            'Vega': 'H12',
-            'Rho': 'H14',
-            'Theta': 'H16'
-        }
-    
+        price_cell, greeks_cell = TRINOMIAL_CELLS
         if trinomial_result is not None:
-            formatted_trinomial_result = f"{round(trinomial_result, decimal_places):.{decimal_places}f} {euro_symbol}"
-            self.sht.range(trinomial_price_cell).value = formatted_trinomial_result
-    
+            self.sht.range(price_cell).value = price_text(trinomial_result)
         if trinomial_greeks:
-            for greek, cell in greeks_cells.items():
-                if greek in trinomial_greeks:
-                    self.sht.range(cell).value = f"{trinomial_greeks[greek]:.{decimal_places}f}"
+            self.sht.range(greeks_cell).value = greeks_block(trinomial_greeks)
                     
     def write_black_scholes_results(self, bs_result: Optional[Dict[str, float]] = None):
         """
@@ -84,26 +145,26 @@ class ExcelInterface:
         Args:
             bs_result (Optional[Dict[str, float]]): Résultats du modèle Black & Scholes.
         """
-        euro_symbol = '€'
-        decimal_places = 6  # Nombre de décimales après la virgule
-    
-        # Définition des cellules de résultat
-        bs_price_cell = 'J3'
-        bs_greeks_cells = {
-            'Delta': 'J8',
-            'Gamma': 'J10',
-            'Vega': 'J12',
-            'Rho': 'J14',
-            'Theta': 'J16'
-        }
-    
+        price_cell, greeks_cell = BLACK_SCHOLES_CELLS
         if bs_result and 'Greeks' in bs_result and bs_result['Greeks'] is not None:
-            self.sht.range(bs_price_cell).value = f"{bs_result['Price']:.{decimal_places}f} {euro_symbol}"
-            for greek, cell in bs_greeks_cells.items():
-                if greek in bs_result['Greeks']:
-                    self.sht.range(cell).value = f"{bs_result['Greeks'][greek]:.{decimal_places}f}"
+            self.sht.range(price_cell).value = f"{bs_result['Price']:.{DECIMAL_PLACES}f} {EURO_SYMBOL}"
+            self.sht.range(greeks_cell).value = greeks_block(bs_result['Greeks'])
+
+    def write_block(self, sheet_name: str, cell: str, rows: List[List[Any]]):
+        """
+        Écrit un bloc de valeurs en une seule affectation.
 
+        Args:
+            sheet_name (str): Nom de la feuille.
+            cell (str): Cellule en haut à gauche du bloc.
+            rows (List[List[Any]]): Valeurs, ligne par ligne.
+        """
+        self.wb.sheets[sheet_name].range(cell).value = rows
 
+    def save(self):
+        """
+        Les écritures xlwings sont faites directement dans le classeur ouvert : rien à enregistrer.
+        """
 
     def write_nbsteps_convergence_results(self, convergence_results: List[Tuple[int, float, float, float]]):
         """
@@ -142,3 +203,179 @@ class ExcelInterface:
 
         # Écriture des données
         self.sht_conv_strike.range(data_start_cell).value = convergence_results
+
+
+class OpenpyxlInterface:
+    """
+    Interface hors Excel : lit et écrit directement le fichier .xlsm avec openpyxl, sans Excel ouvert
+    (serveurs batch Linux). Mêmes méthodes que ExcelInterface ; les écritures sont enregistrées par save().
+
+    Les entrées sont lues sur les valeurs mises en cache par Excel lors du dernier enregistrement (les
+    formules ne sont pas recalculées). L'affichage de l'arbre dans Excel n'est pas disponible.
+    """
+
+    def __init__(self, workbook_path: str, output_path: Optional[str] = None):
+        """
+        Initialise l'interface avec le chemin vers le classeur.
+
+        Args:
+            workbook_path (str): Chemin d'accès au fichier Excel.
+            output_path (Optional[str]): Fichier de sortie (le classeur lu par défaut).
+        """
+        self.workbook_path = workbook_path
+        self.output_path = output_path or workbook_path
+        import openpyxl  # Dépendance nécessaire uniquement hors Excel
+        # Classeur des formules (écriture, macros conservées) ; les valeurs calculées sont lues par read_data
+        self.wb = openpyxl.load_workbook(workbook_path, keep_vba=True)
+        self.sht = self.wb['Pricing']
+        self.sht_conv_nbsteps = self.wb['Convergence_NbSteps']
+        self.sht_conv_strike = self.wb['Convergence_Strike']
+        self.sht_arbre = None
+
+    def read_data(self) -> Dict[str, Any]:
+        """
+        Lit les données de configuration à partir de la feuille 'Pricing'.
+
+        Returns:
+            Dict[str, Any]: Un dictionnaire contenant les paramètres lus.
+        """
+        import openpyxl
+        # Classeur des valeurs calculées ouvert en lecture seule le temps de la lecture : en mode read_only,
+        # openpyxl garde le fichier ouvert jusqu'à close()
+        wb_values = openpyxl.load_workbook(self.workbook_path, data_only=True, read_only=True)
+        try:
+            values, missing = {}, []
+            for key, name in INPUT_NAMES.items():
+                sheet_name, address = next(self.wb.defined_names[name].destinations)
+                address = address.replace('$', '')
+                values[key] = wb_values[sheet_name][address].value
+                # Un classeur enregistré par openpyxl ne contient plus les valeurs calculées des formules
+                formula = self.wb[sheet_name][address].value
+                if values[key] is None and isinstance(formula, str) and formula.startswith('='):
+                    missing.append(name)
+        finally:
+            wb_values.close()
+        if missing:
+            raise ValueError(f"Valeurs non calculées pour {', '.join(missing)} : le classeur a été enregistré hors "
+                             f"Excel, il doit être recalculé et enregistré dans Excel avant d'être relu.")
+        data = parse_inputs(values)
+        data['print_arbre'] = False
+        return data
+
+    def write_trinomial_results(self, trinomial_result: Optional[float] = None,
+                                trinomial_greeks: Optional[Dict[str, float]] = None):
+        """
+        Écrit les résultats du modèle trinomial dans la feuille 'Pricing'.
+
+        Args:
+            trinomial_result (Optional[float]): Prix calculé par le modèle trinomial.
+            trinomial_greeks (Optional[Dict[str, float]]): Grecques du modèle trinomial.
+        """
+        price_cell, greeks_cell = TRINOMIAL_CELLS
+        if trinomial_result is not None:
+            self.sht[price_cell].value = price_text(trinomial_result)
+        if trinomial_greeks:
+            self.write_block('Pricing', greeks_cell, greeks_block(trinomial_greeks))
+
+    def write_black_scholes_results(self, bs_result: Optional[Dict[str, float]] = None):
+        """
+        Écrit les résultats du modèle Black & Scholes dans la feuille 'Pricing'.
+
+        Args:
+            bs_result (Optional[Dict[str, float]]): Résultats du modèle Black & Scholes.
+        """
+        price_cell, greeks_cell = BLACK_SCHOLES_CELLS
+        if bs_result and 'Greeks' in bs_result and bs_result['Greeks'] is not None:
+            self.sht[price_cell].value = f"{bs_result['Price']:.{DECIMAL_PLACES}f} {EURO_SYMBOL}"
+            self.write_block('Pricing', greeks_cell, greeks_block(bs_result['Greeks']))
+
+    def write_block(self, sheet_name: str, cell: str, rows: List[List[Any]]):
+        """
+        Écrit un bloc de valeurs à partir d'une cellule.
+
+        Args:
+            sheet_name (str): Nom de la feuille.
+            cell (str): Cellule en haut à gauche du bloc.
+            rows (List[List[Any]]): Valeurs, ligne par ligne (ou une seule ligne).
+        """
+        ws = self.wb[sheet_name]
+        top_left = ws[cell]
+        if rows and not isinstance(rows[0], (list, tuple)):
+            rows = [rows]
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                ws.cell(row=top_left.row + i, column=top_left.column + j, value=value)
+
+    def save(self):
+        """
+        Enregistre le classeur (macros VBA conservées).
+        """
+        self.wb.save(self.output_path)
+
+    def write_nbsteps_convergence_results(self, convergence_results: List[Tuple[int, float, float, float]]):
+        """
+        Écrit les résultats de convergence en fonction du nombre d'étapes dans la feuille dédiée.
+
+        Args:
+            convergence_results (List[Tuple[int, float, float, float]]): Résultats de convergence.
+        """
+        self.write_block('Convergence_NbSteps', 'A1', [
+            'NbSteps', 'TrinomialPrice', 'BlackScholesPrice', '(Trinomial - Black_Scholes) x NbSteps'
+        ])
+        self.write_block('Convergence_NbSteps', 'A2', convergence_results)
+
+    def write_strike_convergence_results(self, convergence_results: List[Tuple[int, float, float, float, float, float]]):
+        """
+        Écrit les résultats de convergence en fonction du prix d'exercice (strike) dans la feuille dédiée.
+
+        Args:
+            convergence_results (List[Tuple[int, float, float, float, float, float]]): Résultats de convergence.
+        """
+        self.write_block('Convergence_Strike', 'A1', [
+            'Strike', 'TrinomialPrice', 'BlackScholesPrice', 'Trinomial - Black_Scholes', 'Trinomial Slope', 'BS Slope'
+        ])
+        self.write_block('Convergence_Strike', 'A2', convergence_results)
+
+
+def open_interface(workbook_path: str):
+    """
+    Ouvre le classeur avec xlwings si Excel est lancé, sinon avec openpyxl (mode batch hors Excel).
+
+    Args:
+        workbook_path (str): Chemin d'accès au fichier Excel.
+
+    Returns:
+        ExcelInterface ou OpenpyxlInterface: L'interface ouverte.
+    """
+    try:
+        excel_running = xw.apps.count > 0
+    except Exception:
+        # xlwings n'a pas de mode interactif hors Windows/macOS
+        excel_running = False
+    return ExcelInterface(workbook_path) if excel_running else OpenpyxlInterface(workbook_path)
+
+
+class DataInterface:
+    """
+    Interface minimale qui fournit des paramètres déjà lus (dictionnaire) à la place du classeur Excel,
+    pour valoriser hors Excel (processus de calcul, scripts batch).
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialise l'interface avec les paramètres de pricing.
+
+        Args:
+            data (Dict[str, Any]): Paramètres au format de ExcelInterface.read_data.
+        """
+        self.data = data
+        self.sht_arbre = None
+
+    def read_data(self) -> Dict[str, Any]:
+        """
+        Renvoie une copie des paramètres.
+
+        Returns:
+            Dict[str, Any]: Un dictionnaire contenant les paramètres.
+        """
+        return dict(self.data)
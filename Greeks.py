@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import numpy as np
 from Convergence import Convergence
 from ExcelInterface import ExcelInterface
@@ -8,137 +10,122 @@ class GreeksCalculator:
         self.convergence = convergence
         self.convergence.data['print_arbre'] = False  # Désactive l'affichage de l'arbre par défaut
     
-    def calculate_delta(self, bump: float = 0.01) -> float:
-        self.convergence.print_arbre = False
-        original_s0 = self.convergence.data['s0']
-        bumped_s0 = original_s0 * (1 + bump)
-    
-        # Sauvegarder la valeur originale de s0
-        original_s0_value = self.convergence.data['s0']
-    
+    def spot_ladder(self, spots, key: str = None, value=None) -> np.ndarray:
+        """
+        Valorise l'option pour une gamme de spots, éventuellement avec un paramètre de data modifié.
+
+        Args:
+            spots: Prix du sous-jacent à valoriser.
+            key (str): Paramètre de data à modifier le temps du calcul (None pour aucun).
+            value: Nouvelle valeur du paramètre.
+
+        Returns:
+            np.ndarray: Prix de l'option pour chaque spot.
+        """
+        if key is None:
+            return np.array(self.convergence.run_spot_ladder(spots))
+        original_value = self.convergence.data[key]
         try:
-            self.convergence.data['s0'] = bumped_s0
-            self.convergence.print_arbre = False  # Assurez-vous que print_arbre est correctement défini ici
-            bumped_price = self.convergence.run_trinomial()
+            self.convergence.data[key] = value
+            return np.array(self.convergence.run_spot_ladder(spots))
         finally:
-            # Restaurer la valeur originale de s0 et print_arbre
-            self.convergence.data['s0'] = original_s0_value
-            self.convergence.print_arbre = True  # Restaurez la valeur précédente de print_arbre
-    
-        original_price = self.convergence.run_trinomial()
-    
+            self.convergence.data[key] = original_value
+
+    def calculate_delta(self, bump: float = 0.01) -> float:
+        original_s0 = self.convergence.data['s0']
+
+        # Spot bumpé et spot original valorisés sur le même arbre
+        bumped_price, original_price = self.spot_ladder([original_s0 * (1 + bump), original_s0])
+
         delta = (bumped_price - original_price) / (bump * original_s0)
         return delta
 
-    
     def calculate_gamma(self, bump: float = 0.01) -> float:
-        self.convergence.print_arbre = False
         original_s0 = self.convergence.data['s0']
-        bumped_s0_up = original_s0 * (1 + bump)
-        bumped_s0_down = original_s0 * (1 - bump)
-    
-        # Sauvegarder la valeur originale de s0 et de print_arbre
-        original_s0_value = self.convergence.data['s0']
-        original_print_arbre = self.convergence.print_arbre
-    
-        try:
-            self.convergence.data['s0'] = bumped_s0_up
-            self.convergence.print_arbre = False
-            price_up = self.convergence.run_trinomial()
-    
-            self.convergence.data['s0'] = bumped_s0_down
-            price_down = self.convergence.run_trinomial()
-    
-            self.convergence.data['s0'] = original_s0
-            original_price = self.convergence.run_trinomial()
-    
-            gamma = (price_up - 2 * original_price + price_down) / ((bump * original_s0) ** 2)
-            return gamma
-        finally:
-            # Restaurer la valeur originale de s0 et de print_arbre
-            self.convergence.data['s0'] = original_s0_value
-            self.convergence.print_arbre = original_print_arbre
 
-    
+        price_up, original_price, price_down = self.spot_ladder(
+            [original_s0 * (1 + bump), original_s0, original_s0 * (1 - bump)])
+
+        gamma = (price_up - 2 * original_price + price_down) / ((bump * original_s0) ** 2)
+        return gamma
+
+    def calculate_all(self, bump: float = 0.01, volatility_increment: float = 0.01, interest_increment: float = 0.01,
+                      time_decrement_days: int = 1, max_workers: Optional[int] = 4) -> Dict[str, float]:
+        """
+        Calcule toutes les Grecques trinomiales en valorisant une seule fois chaque scénario distinct : cas de
+        base et spots bumpés (un seul arbre sans dividende), volatilité, taux et maturité bumpés. Les scénarios
+        sont valorisés en parallèle (threads) sur des copies des paramètres. Le Theta est exprimé par jour, la
+        maturité étant avancée d'un nombre entier de jours.
+
+        Returns:
+            Dict[str, float]: Delta, Gamma, Vega, Rho et Theta.
+        """
+        data = dict(self.convergence.data, print_arbre=False)
+        original_s0 = data['s0']
+        new_maturity = self.bumped_maturity(time_decrement_days)
+
+        # Scénarios uniques : (paramètres modifiés, spots valorisés)
+        scenarios = {
+            'spot': ({}, [original_s0 * (1 + bump), original_s0, original_s0 * (1 - bump)]),
+            'vol': ({'vol': data['vol'] + volatility_increment}, [original_s0]),
+            'rate': ({'r': data['r'] + interest_increment}, [original_s0]),
+            'maturity': ({'maturity': new_maturity}, [original_s0])
+        }
+
+        def price_scenario(name: str) -> List[float]:
+            overrides, spots = scenarios[name]
+            return self.convergence.scenario(print_arbre=False, **overrides).run_spot_ladder(spots)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prices = dict(zip(scenarios, executor.map(price_scenario, scenarios)))
+
+        price_up, original_price, price_down = prices['spot']
+        return {
+            'Delta': (price_up - original_price) / (bump * original_s0),
+            'Gamma': (price_up - 2 * original_price + price_down) / ((bump * original_s0) ** 2),
+            'Vega': (prices['vol'][0] - original_price) / volatility_increment,
+            'Rho': (prices['rate'][0] - original_price) / interest_increment,
+            'Theta': (prices['maturity'][0] - original_price) / time_decrement_days
+        }
+
+    def bumped_maturity(self, time_decrement_days: int) -> datetime:
+        """
+        Renvoie la maturité avancée d'un nombre entier de jours. Model compte la maturité en jours entiers :
+        un décalage fractionnaire serait arrondi au jour et fausserait le Theta.
+
+        Args:
+            time_decrement_days (int): Nombre de jours retirés à la maturité (au moins 1).
+
+        Returns:
+            datetime: Maturité décalée.
+        """
+        if time_decrement_days < 1 or time_decrement_days != int(time_decrement_days):
+            raise ValueError("La maturité est comptée en jours entiers : le décalage du Theta doit être un nombre "
+                             "entier de jours (au moins 1).")
+        maturity = self.convergence.data['maturity']
+        if isinstance(maturity, str):
+            maturity = datetime.strptime(maturity, '%Y-%m-%d')
+        return maturity - timedelta(days=int(time_decrement_days))
+
+    def bumped_difference(self, increment: float, **overrides) -> float:
+        """
+        Différence finie (prix bumpé - prix de base) / incrément, les deux prix valorisés sur l'arbre en
+        tableaux avec les mêmes réglages que calculate_all.
+        """
+        bumped_price = self.convergence.scenario(print_arbre=False, **overrides).run_lattice()
+        return (bumped_price - self.convergence.run_lattice()) / increment
+
     def calculate_vega(self, volatility_increment: float = 0.01) -> float:
-        self.convergence.print_arbre = False
-        original_vol = self.convergence.data['vol']
-    
-        # Sauvegarder la valeur originale de vol et de print_arbre
-        original_vol_value = self.convergence.data['vol']
-        original_print_arbre = self.convergence.print_arbre
-    
-        try:
-            self.convergence.data['vol'] += volatility_increment
-            self.convergence.print_arbre = False
-            price_up = self.convergence.run_trinomial()
-    
-            self.convergence.data['vol'] = original_vol
-            original_price = self.convergence.run_trinomial()
-    
-            vega = (price_up - original_price) / volatility_increment
-            return vega
-        finally:
-            # Restaurer la valeur originale de vol et de print_arbre
-            self.convergence.data['vol'] = original_vol_value
-            self.convergence.print_arbre = original_print_arbre
+        return self.bumped_difference(volatility_increment, vol=self.convergence.data['vol'] + volatility_increment)
 
-    
     def calculate_rho(self, interest_increment: float = 0.01) -> float:
-        self.convergence.print_arbre = False
-        original_rate = self.convergence.data['r']
-    
-        # Sauvegarder la valeur originale de r et de print_arbre
-        original_rate_value = self.convergence.data['r']
-        original_print_arbre = self.convergence.print_arbre
-    
-        try:
-            self.convergence.data['r'] += interest_increment
-            self.convergence.print_arbre = False
-            price_up = self.convergence.run_trinomial()
-    
-            self.convergence.data['r'] = original_rate
-            original_price = self.convergence.run_trinomial()
-    
-            rho = (price_up - original_price) / interest_increment
-            return rho
-        finally:
-            # Restaurer la valeur originale de r et de print_arbre
-            self.convergence.data['r'] = original_rate_value
-            self.convergence.print_arbre = original_print_arbre
+        return self.bumped_difference(interest_increment, r=self.convergence.data['r'] + interest_increment)
 
-    
-    def calculate_theta(self, time_decrement_days: float = 0.01) -> float:
-        self.convergence.print_arbre = False
-        original_maturity = self.convergence.data['maturity']
-    
-        # Sauvegarder la valeur originale de maturity et de print_arbre
-        original_maturity_value = self.convergence.data['maturity']
-        original_print_arbre = self.convergence.print_arbre
-    
-        try:
-            self.convergence.print_arbre = False
-            time_decrement = timedelta(days=time_decrement_days)
-    
-            if isinstance(original_maturity, str):
-                original_maturity = datetime.strptime(original_maturity, '%Y-%m-%d')
-    
-            new_maturity = original_maturity - time_decrement
-            self.convergence.data['maturity'] = new_maturity.strftime('%Y-%m-%d')
-            price_down = self.convergence.run_trinomial()
-    
-            self.convergence.data['maturity'] = original_maturity_value
-            original_price = self.convergence.run_trinomial()
-    
-            theta = (price_down - original_price) / time_decrement_days
-            return theta
-        finally:
-            # Restaurer la valeur originale de maturity et de print_arbre
-            self.convergence.data['maturity'] = original_maturity_value
-            self.convergence.print_arbre = original_print_arbre
+    def calculate_theta(self, time_decrement_days: int = 1) -> float:
+        # Theta par jour : variation du prix quand la maturité est avancée de time_decrement_days jours
+        return self.bumped_difference(time_decrement_days, maturity=self.bumped_maturity(time_decrement_days))
 
-    
-    def Graph_delta(self, excel_interface: ExcelInterface) -> None:
+    def Graph_delta(self, excel_interface: ExcelInterface, bump: float = 0.01) -> None:
         """
         Calcule le Delta pour une plage de valeurs du sous-jacent autour du strike et exporte dans Excel.
 
@@ -151,78 +138,80 @@ class GreeksCalculator:
         # Gamme de prix du sous-jacent de 0 à 2 fois le strike, par pas de 1
         s0_range = np.arange(1, strike * 2.00 + 1, 1)
 
+        # Toute la gamme (spots bumpés et originaux) est valorisée en une seule passe
+        prices = self.spot_ladder(np.concatenate((s0_range * (1 + bump), s0_range)))
+        bumped_prices, original_prices = np.split(prices, 2)
+        deltas = (bumped_prices - original_prices) / (bump * s0_range)
+
         # Liste pour stocker les résultats du Delta
         delta_results = [('Sous-jacent', 'Delta')]  # En-tête pour les colonnes
-
-        # Calcul de Delta pour chaque prix du sous-jacent
-        for s0 in s0_range:
-            self.convergence.data['s0'] = s0
-            delta = round(self.calculate_delta(), 6)
-            delta_results.append((s0, delta))
+        delta_results += [(s0, round(delta, 6)) for s0, delta in zip(s0_range, deltas)]
 
         # Exportation des résultats dans Excel
-        excel_interface.wb.sheets['Greeks'].range('A1').value = delta_results
+        excel_interface.write_block('Greeks', 'A1', delta_results)
 
-    def Graph_gamma(self, excel_interface: ExcelInterface) -> None:
+    def Graph_gamma(self, excel_interface: ExcelInterface, bump: float = 0.01) -> None:
         """
         Calcule le Gamma pour une plage de valeurs du sous-jacent autour du strike et exporte dans Excel.
         """
         strike = self.convergence.data['strike']
         s0_range = np.arange(0, strike * 2.00 + 1, 1)
 
-        gamma_results = [('Sous-jacent', 'Gamma')]
+        prices = self.spot_ladder(np.concatenate((s0_range * (1 + bump), s0_range, s0_range * (1 - bump))))
+        price_up, original_price, price_down = np.split(prices, 3)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gammas = np.where(s0_range > 0, (price_up - 2 * original_price + price_down) /
+                              ((bump * s0_range) ** 2), 0.0)
 
-        for s0 in s0_range:
-            self.convergence.data['s0'] = s0
-            gamma = round(self.calculate_gamma(), 6)
-            gamma_results.append((s0, gamma))
+        gamma_results = [('Sous-jacent', 'Gamma')]
+        gamma_results += [(s0, round(gamma, 6)) for s0, gamma in zip(s0_range, gammas)]
 
-        excel_interface.wb.sheets['Greeks'].range('B1').value = gamma_results
+        excel_interface.write_block('Greeks', 'B1', gamma_results)
 
-    def Graph_vega(self, excel_interface: ExcelInterface) -> None:
+    def Graph_vega(self, excel_interface: ExcelInterface, volatility_increment: float = 0.01) -> None:
         """
         Calcule le Vega pour une plage de valeurs du sous-jacent autour du strike et exporte dans Excel.
         """
         strike = self.convergence.data['strike']
         s0_range = np.arange(0, strike * 2.00 + 1, 1)
 
-        vega_results = [('Sous-jacent', 'Vega')]
+        price_up = self.spot_ladder(s0_range, 'vol', self.convergence.data['vol'] + volatility_increment)
+        original_price = self.spot_ladder(s0_range)
+        vegas = (price_up - original_price) / volatility_increment
 
-        for s0 in s0_range:
-            self.convergence.data['s0'] = s0
-            vega = round(self.calculate_vega(), 6)
-            vega_results.append((s0, vega))
+        vega_results = [('Sous-jacent', 'Vega')]
+        vega_results += [(s0, round(vega, 6)) for s0, vega in zip(s0_range, vegas)]
 
-        excel_interface.wb.sheets['Greeks'].range('C1').value = vega_results
+        excel_interface.write_block('Greeks', 'C1', vega_results)
 
-    def Graph_theta(self, excel_interface: ExcelInterface) -> None:
+    def Graph_theta(self, excel_interface: ExcelInterface, time_decrement_days: int = 1) -> None:
         """
         Calcule le Theta pour une plage de valeurs du sous-jacent autour du strike et exporte dans Excel.
         """
         strike = self.convergence.data['strike']
         s0_range = np.arange(0, strike * 2.00 + 1, 1)
 
-        theta_results = [('Sous-jacent', 'Theta')]
+        price_down = self.spot_ladder(s0_range, 'maturity', self.bumped_maturity(time_decrement_days))
+        original_price = self.spot_ladder(s0_range)
+        thetas = (price_down - original_price) / time_decrement_days
 
-        for s0 in s0_range:
-            self.convergence.data['s0'] = s0
-            theta = round(self.calculate_theta(), 6)
-            theta_results.append((s0, theta))
+        theta_results = [('Sous-jacent', 'Theta')]
+        theta_results += [(s0, round(theta, 6)) for s0, theta in zip(s0_range, thetas)]
 
-        excel_interface.wb.sheets['Greeks'].range('E1').value = theta_results
+        excel_interface.write_block('Greeks', 'E1', theta_results)
 
-    def Graph_rho(self, excel_interface: ExcelInterface) -> None:
+    def Graph_rho(self, excel_interface: ExcelInterface, interest_increment: float = 0.01) -> None:
         """
         Calcule le Rho pour une plage de valeurs du sous-jacent autour du strike et exporte dans Excel.
         """
         strike = self.convergence.data['strike']
         s0_range = np.arange(0, strike * 2.00 + 1, 1)
 
-        rho_results = [('Sous-jacent', 'Rho')]
+        price_up = self.spot_ladder(s0_range, 'r', self.convergence.data['r'] + interest_increment)
+        original_price = self.spot_ladder(s0_range)
+        rhos = (price_up - original_price) / interest_increment
 
-        for s0 in s0_range:
-            self.convergence.data['s0'] = s0
-            rho = round(self.calculate_rho(), 6)
-            rho_results.append((s0, rho))
+        rho_results = [('Sous-jacent', 'Rho')]
+        rho_results += [(s0, round(rho, 6)) for s0, rho in zip(s0_range, rhos)]
 
-        excel_interface.wb.sheets['Greeks'].range('G1').value = rho_results
\ No newline at end of file
+        excel_interface.write_block('Greeks', 'G1', rho_results)
@@ -0,0 +1,250 @@
+import os
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from Market import Market, Curve
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+
+# État des processus de calcul, initialisé une fois par processus (voir init_worker)
+worker_state: Dict[str, Any] = {}
+
+
+def to_datetime(date) -> datetime:
+    """
+    Convertit une date lue dans les paramètres (datetime ou texte 'AAAA-MM-JJ').
+    """
+    return date if isinstance(date, datetime) else datetime.strptime(date, '%Y-%m-%d')
+
+
+def init_worker(data: Dict[str, Any], days: np.ndarray, backend: Optional[str]):
+    """
+    Mémorise les paramètres de la couverture ; les arbres de chaque date de rebalancement sont construits à
+    la première utilisation puis réutilisés pour tous les lots de trajectoires traités par le processus.
+    """
+    worker_state.update(data=data, days=days, backend=backend, lattices={}, builds=0)
+
+
+def lattice_at(k: int):
+    """
+    Renvoie l'arbre (construit au spot de marché) et l'option vus depuis la k-ième date de rebalancement.
+    Le nombre de pas est proportionnel à la maturité résiduelle, pour garder le pas de temps de l'arbre initial.
+    """
+    if k not in worker_state['lattices']:
+        data, days = worker_state['data'], worker_state['days']
+        pricing_date = to_datetime(data['pricing_date'])
+        total_days = (to_datetime(data['maturity']) - pricing_date).days
+        nb_steps = max(3, int(round(data['nbsteps'] * (total_days - days[k]) / total_days)))
+        convergence = Convergence(DataInterface(dict(data, pricing_date=pricing_date + timedelta(days=int(days[k])),
+                                                     nbsteps=nb_steps, print_arbre=False)))
+        if worker_state['backend'] is not None:
+            convergence.backend = worker_state['backend']
+        market, option, model = convergence.create_objects()
+        worker_state['lattices'][k] = (convergence.create_lattice(market, model), option)
+    return worker_state['lattices'][k]
+
+
+def value_at(k: int, spots: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valorise l'option et lit son delta sur l'arbre, pour tous les spots d'une date de rebalancement.
+
+    Sans dividende à venir, un seul arbre sert toutes les trajectoires : prix(S, K) = (S / s0) · prix(s0, K s0 / S)
+    et delta(S, K) = delta(s0, K s0 / S), en une seule induction multi-strike. Sinon, un arbre par spot.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Prix et deltas.
+    """
+    lattice, option = lattice_at(k)
+    is_call, is_american = option.op_type == "Call", option.type == "American"
+    if lattice.is_scale_invariant():
+        if not lattice.is_built():
+            lattice.build()
+            worker_state['builds'] += 1
+        scale = spots / lattice.market.s0
+        prices = scale * lattice.price(option.strike / scale, is_call, is_american)
+        return prices, lattice.greeks()["Delta"]
+
+    prices, deltas = np.empty(len(spots)), np.empty(len(spots))
+    market = lattice.market
+    for j, spot in enumerate(spots):
+        spot_lattice = type(lattice)(Market(market.r, market.vol, spot, market.div, market.div_date), lattice.model,
+                                     lattice.seuil, lattice.smooth)
+        prices[j] = spot_lattice.price(option.strike, is_call, is_american)[0]
+        deltas[j] = spot_lattice.greeks()["Delta"][0]
+        worker_state['builds'] += 1
+    return prices, deltas
+
+
+def hedge_batch_job(job: Tuple[int, np.ndarray]) -> Tuple[int, np.ndarray, int, int]:
+    """
+    Simule la couverture en delta d'une option vendue sur un lot de trajectoires.
+
+    Args:
+        job (Tuple[int, np.ndarray]): Indice du lot et spots de forme (trajectoires, dates de rebalancement).
+
+    Returns:
+        Tuple[int, np.ndarray, int, int]: Indice du lot, erreur de couverture de chaque trajectoire,
+        nombre de valorisations et nombre d'arbres construits pour ce lot.
+    """
+    batch_index, spots = job
+    data, days = worker_state['data'], worker_state['days']
+    builds_before = worker_state['builds']
+    pricing_date = to_datetime(data['pricing_date'])
+    maturity_days = (to_datetime(data['maturity']) - pricing_date).days
+    div_day = (to_datetime(data['div_date']) - pricing_date).days if data['div'] and data['div_date'] else None
+    last = len(days) - 1
+
+    premium, delta = value_at(0, spots[:, 0])
+    cash = premium - delta * spots[:, 0]
+    repricings = len(spots)
+    for k in range(1, last + 1):
+        cash = cash * np.exp(data['r'] * (days[k] - days[k - 1]) / 365)
+        # Les actions détenues touchent le dividende détaché entre les deux dates
+        if div_day is not None and days[k - 1] < div_day <= days[k]:
+            cash = cash + delta * data['div']
+        if k == last:
+            break
+        _, new_delta = value_at(k, spots[:, k])
+        cash = cash - (new_delta - delta) * spots[:, k]
+        delta = new_delta
+        repricings += len(spots)
+
+    final_spots = spots[:, last]
+    if days[last] >= maturity_days:
+        liability = np.maximum(final_spots - data['strike'], 0) if data['option_type'] == "Call" \
+            else np.maximum(data['strike'] - final_spots, 0)
+    else:
+        liability, _ = value_at(last, final_spots)
+        repricings += len(spots)
+    return batch_index, cash + delta * final_spots - liability, repricings, worker_state['builds'] - builds_before
+
+
+def simulate_paths(data: Dict[str, Any], days: Sequence[int], nb_paths: int, drift: Optional[float] = None,
+                   seed: Optional[int] = None) -> np.ndarray:
+    """
+    Simule des trajectoires log-normales du sous-jacent aux dates de rebalancement, dividende discret compris.
+
+    Args:
+        data (Dict[str, Any]): Paramètres de pricing (format de ExcelInterface.read_data).
+        days (Sequence[int]): Dates de rebalancement en jours depuis la date de pricing (0 en premier).
+        nb_paths (int): Nombre de trajectoires.
+        drift (Optional[float]): Tendance annuelle du sous-jacent (taux sans risque par défaut, plat ou courbe).
+        seed (Optional[int]): Graine du générateur aléatoire.
+
+    Returns:
+        np.ndarray: Spots de forme (trajectoires, dates de rebalancement).
+    """
+    days = np.asarray(days)
+    rng = np.random.default_rng(seed)
+    # Tendance et variance de chaque intervalle, taux et volatilité plats ou structures par terme
+    market = Market(data['r'], data['vol'], data['s0'], data['div'], data['div_date'])
+    times = days / 365
+    drifts = np.diff(market.rate_integral(times)) if drift is None else drift * np.diff(times)
+    variances = np.diff(market.variance_integral(times))
+    pricing_date = to_datetime(data['pricing_date'])
+    div_day = (to_datetime(data['div_date']) - pricing_date).days if data['div'] and data['div_date'] else None
+
+    paths = np.empty((nb_paths, len(days)))
+    paths[:, 0] = data['s0']
+    for k in range(1, len(days)):
+        shocks = rng.standard_normal(nb_paths)
+        log_return = drifts[k - 1] - variances[k - 1] / 2 + np.sqrt(variances[k - 1]) * shocks
+        paths[:, k] = paths[:, k - 1] * np.exp(log_return)
+        if div_day is not None and days[k - 1] < div_day <= days[k]:
+            paths[:, k] = np.maximum(paths[:, k] - data['div'], 1e-8)
+    return paths
+
+
+class DeltaHedgeBacktest:
+    """
+    Backtest de la couverture en delta d'une option vendue le long de trajectoires historiques ou simulées.
+
+    À chaque date de rebalancement, le prix et le delta sont lus sur un arbre en tableaux (delta des
+    colonnes 1 et 2, sans arbre choqué). Sans dividende à venir, l'arbre d'une date est construit une seule
+    fois par processus et sert toutes les trajectoires en une induction multi-strike. Les lots de trajectoires
+    sont répartis sur un pool de processus et les résultats produits au fil de l'eau. L'option américaine est
+    couverte jusqu'à maturité, sans exercice anticipé.
+    """
+
+    def __init__(self, data: Dict[str, Any], days: Sequence[int], backend: Optional[str] = None):
+        """
+        Initialise le backtest.
+
+        Args:
+            data (Dict[str, Any]): Paramètres de pricing (format de ExcelInterface.read_data).
+            days (Sequence[int]): Dates de rebalancement en jours depuis la date de pricing, croissantes,
+                de 0 jusqu'à la maturité (incluse pour un règlement au payoff).
+            backend (Optional[str]): Backend des arbres ("numpy", "numba" ou "threaded", celui de Convergence
+                par défaut).
+        """
+        if isinstance(data['r'], Curve) or isinstance(data['vol'], Curve):
+            # Les arbres des dates de rebalancement repartent de leur date : il faudrait les courbes forward vues
+            # depuis chaque date, non représentables exactement par des piliers au-delà du dernier
+            raise ValueError("Le backtest de couverture suppose un taux et une volatilité plats : structures par "
+                             "terme non prises en charge.")
+        self.data = dict(data, print_arbre=False)
+        self.days = np.asarray(days, dtype=np.int64)
+        maturity_days = (to_datetime(data['maturity']) - to_datetime(data['pricing_date'])).days
+        if self.days[0] != 0 or np.any(np.diff(self.days) <= 0) or self.days[-1] > maturity_days:
+            raise ValueError("Les dates de rebalancement doivent croître strictement de 0 à la maturité.")
+        self.backend = backend
+
+    def stream(self, batches: Iterable[np.ndarray], max_workers: Optional[int] = None
+               ) -> Iterator[Tuple[int, np.ndarray, int, int]]:
+        """
+        Simule la couverture lot par lot et produit les résultats au fur et à mesure de leur calcul.
+
+        Args:
+            batches (Iterable[np.ndarray]): Lots de spots de forme (trajectoires, dates de rebalancement).
+            max_workers (Optional[int]): Nombre de processus (nombre de cœurs par défaut).
+
+        Yields:
+            Tuple[int, np.ndarray, int, int]: Indice du lot, erreurs de couverture, valorisations et arbres construits.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                 initargs=(self.data, self.days, self.backend)) as executor:
+            futures = [executor.submit(hedge_batch_job, (index, np.asarray(batch, dtype=float)))
+                       for index, batch in enumerate(batches)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, paths: np.ndarray, batch_size: int = 256, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simule la couverture sur toutes les trajectoires et résume l'erreur de couverture.
+
+        Args:
+            paths (np.ndarray): Spots de forme (trajectoires, dates de rebalancement).
+            batch_size (int): Nombre de trajectoires par tâche.
+            max_workers (Optional[int]): Nombre de processus (nombre de cœurs par défaut).
+
+        Returns:
+            Dict[str, Any]: Erreur de couverture par trajectoire et statistiques, nombre de valorisations,
+            d'arbres construits et valorisations par seconde.
+        """
+        paths = np.asarray(paths, dtype=float)
+        if paths.ndim != 2 or paths.shape[1] != len(self.days):
+            raise ValueError("Les trajectoires doivent avoir une colonne par date de rebalancement.")
+        start = time.perf_counter()
+        batches = [paths[index:index + batch_size] for index in range(0, len(paths), batch_size)]
+        errors, repricings, builds = [None] * len(batches), 0, 0
+        for batch_index, batch_errors, batch_repricings, batch_builds in self.stream(batches, max_workers):
+            errors[batch_index] = batch_errors
+            repricings += batch_repricings
+            builds += batch_builds
+        elapsed = time.perf_counter() - start
+
+        errors = np.concatenate(errors)
+        return {
+            "HedgeError": errors,
+            "Mean": float(errors.mean()),
+            "Std": float(errors.std()),
+            "RMSE": float(np.sqrt(np.mean(errors ** 2))),
+            "Quantiles": {q: float(np.quantile(errors, q)) for q in (0.01, 0.05, 0.5, 0.95, 0.99)},
+            "Repricings": repricings,
+            "Builds": builds,
+            "Time": elapsed,
+            "RepricingsPerSecond": repricings / elapsed
+        }
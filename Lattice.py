@@ -0,0 +1,655 @@
+import os
+import json
+import math as m
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Union
+from Market import Market, Curve
+from Option import Option
+from Model import Model
+from BlackScholes import BlackScholes
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# Version du format de sauvegarde sur disque (voir Lattice.save)
+LATTICE_FORMAT_VERSION = 1
+LATTICE_ARRAYS = ('spots', 'p_total', 'pup', 'pmid', 'pdown', 'mid', 'trunk', 'offsets')
+
+
+class Lattice:
+    """
+    Arbre trinomial stocké sous forme de tableaux NumPy, colonne par colonne.
+
+    La construction reprend celle de Tree/Node (nœud central aligné sur le forward, probabilités de
+    transition par appariement des moments, pruning par seuil de probabilité totale, dividende discret)
+    sur une grille géométrique stricte autour du tronc. Les colonnes sont concaténées dans des tableaux
+    plats : la colonne i occupe les indices offsets[i]:offsets[i + 1].
+
+    Attributs:
+        spots (np.ndarray): Prix du sous-jacent de chaque nœud.
+        p_total (np.ndarray): Probabilité totale d'atteindre chaque nœud depuis la racine.
+        pup, pmid, pdown (np.ndarray): Probabilités de transition de chaque nœud.
+        mid (np.ndarray): Indice (local à la colonne suivante) du nœud médian de chaque nœud.
+        trunk (np.ndarray): Indice local du tronc dans chaque colonne.
+        offsets (np.ndarray): Début de chaque colonne dans les tableaux plats.
+    """
+
+    def __init__(self, market, model, seuil: float = 0, smooth: bool = False):
+        """
+        Initialise le lattice sans le construire.
+
+        Args:
+            market: Objet contenant les données du marché.
+            model: Modèle utilisé pour la tarification.
+            seuil (float): Seuil de probabilité totale utilisé pour le pruning.
+            smooth (bool): Vrai pour remplacer le dernier pas par la valeur Black-Scholes (méthode BBS).
+        """
+        self.market = market
+        self.model = model
+        self.seuil = seuil
+        self.smooth = smooth
+        self.spots = None
+        self.p_total = None
+        self.pup, self.pmid, self.pdown = None, None, None
+        self.mid = None
+        self.trunk = None
+        self.offsets = None
+        self.early_values = {}
+
+    def df(self, i: int) -> float:
+        """
+        Renvoie le facteur d'actualisation du pas i (entre les colonnes i et i + 1).
+
+        Args:
+            i (int): L'indice de temps.
+
+        Returns:
+            float: Le facteur d'actualisation.
+        """
+        return self.model.dfs[i]
+
+    def have_div(self, i: int) -> bool:
+        """
+        Détermine si le dividende tombe entre les colonnes i et i + 1 (même règle que Tree.have_div, sur la
+        grille de temps du modèle).
+
+        Args:
+            i (int): L'indice de temps.
+
+        Returns:
+            bool: Vrai si un dividende est dû, faux sinon.
+        """
+        times = self.model.times
+        return (self.model.prdate + timedelta(days=times[i] * 365) < self.market.div_date <=
+                self.model.prdate + timedelta(days=times[i + 1] * 365))
+
+    def div_step(self) -> Optional[int]:
+        """
+        Renvoie l'indice du pas qui porte le dividende, ou None si aucun dividende non nul n'est versé.
+
+        Returns:
+            Optional[int]: L'indice du pas de détachement du dividende.
+        """
+        if not self.market.div or self.market.div_date is None:
+            return None
+        for i in range(self.model.nbsteps):
+            if self.have_div(i):
+                return i
+        return None
+
+    def is_scale_invariant(self) -> bool:
+        """
+        Sans dividende discret, l'arbre construit depuis s0 est exactement proportionnel à s0 : le prix
+        au spot λ·s0 et au strike K vaut λ fois le prix au spot s0 et au strike K/λ.
+
+        Returns:
+            bool: Vrai si l'arbre est invariant d'échelle en s0.
+        """
+        return self.div_step() is None
+
+    def column(self, i: int) -> slice:
+        """
+        Renvoie la tranche des tableaux plats correspondant à la colonne i.
+
+        Args:
+            i (int): L'indice de la colonne.
+
+        Returns:
+            slice: La tranche de la colonne.
+        """
+        return slice(self.offsets[i], self.offsets[i + 1])
+
+    def grid(self, i: int, trunk_spot: float, ks: np.ndarray) -> np.ndarray:
+        """
+        Renvoie les prix des nœuds situés à ks crans du tronc sur la grille géométrique de la colonne i,
+        dont l'écart est l'alpha du pas qui y mène.
+
+        Args:
+            i (int): L'indice de la colonne.
+            trunk_spot (float): Prix du tronc de la colonne.
+            ks (np.ndarray): Décalages (entiers) par rapport au tronc.
+
+        Returns:
+            np.ndarray: Prix des nœuds.
+        """
+        return trunk_spot * self.model.alphas[max(i - 1, 0)] ** np.asarray(ks, dtype=float)
+
+    def transition(self, i: int, spots: np.ndarray, trunk: int, full: np.ndarray):
+        """
+        Calcule le passage de la colonne i à la colonne i + 1 : tronc suivant, nœud médian de chaque nœud
+        (en crans par rapport au tronc suivant) et probabilités de transition.
+
+        Args:
+            i (int): L'indice de la colonne.
+            spots (np.ndarray): Prix des nœuds de la colonne i.
+            trunk (int): Indice local du tronc dans la colonne i.
+            full (np.ndarray): Vrai pour les nœuds au-dessus du seuil (transition complète), faux sinon.
+
+        Returns:
+            tuple: (prix du tronc suivant, crans des nœuds médians, pup, pmid, pdown).
+        """
+        a = self.model.alphas[i]
+        fwd = spots * self.model.growths[i] - (self.market.div if self.have_div(i) else 0)
+        if np.any(fwd <= 0):
+            raise ValueError("Le prix forward doit être positif, le dividende est trop élevé.")
+        trunk_next = fwd[trunk]
+        # Le forward est proche du nœud S si S(1 + 1/a)/2 < fwd < S(1 + a)/2 (cf. Node.is_close)
+        k = np.floor((np.log(fwd / trunk_next) - m.log((1 + 1 / a) / 2)) / m.log(a)).astype(np.int64)
+
+        s_mid = self.grid(i + 1, trunk_next, k)
+        ratio = fwd / s_mid
+        var = spots ** 2 * self.model.var_factors[i]
+        pdown = ((var + fwd ** 2) / s_mid ** 2 - 1 - (a + 1) * (ratio - 1)) / ((1 - a) * (a ** -2 - 1))
+        pup = (ratio - 1 - pdown * (1 / a - 1)) / (a - 1)
+        pmid = 1 - pdown - pup
+        if np.any(full & ((pdown < 0) | (pup < 0) | (pmid < 0))):
+            raise ValueError("Les probabilités de transition ne peuvent pas être négatives, il y'a un problème.")
+        return (trunk_next, k, np.where(full, pup, 0.0), np.where(full, pmid, 1.0),
+                np.where(full, pdown, 0.0))
+
+    def next_column(self, i: int, spots: np.ndarray, p_total: np.ndarray, trunk: int):
+        """
+        Construit la colonne i + 1 à partir de la colonne i.
+
+        Args:
+            i (int): L'indice de la colonne.
+            spots (np.ndarray): Prix des nœuds de la colonne i.
+            p_total (np.ndarray): Probabilités totales des nœuds de la colonne i.
+            trunk (int): Indice local du tronc dans la colonne i.
+
+        Returns:
+            tuple: (transitions de la colonne i (pup, pmid, pdown, mid), prix, probabilités totales et
+            tronc de la colonne i + 1, crans min et max de la colonne i + 1).
+        """
+        full = p_total > self.seuil
+        # Comme dans Node.build_block, un nœud sous le seuil ne crée pas de nœuds up/down
+        grow = (p_total >= self.seuil).astype(np.int64)
+        trunk_next, k, pup, pmid, pdown = self.transition(i, spots, trunk, full)
+        k_min, k_max = int(np.min(k - grow)), int(np.max(k + grow))
+        mid = k - k_min
+        spots_next = self.grid(i + 1, trunk_next, np.arange(k_min, k_max + 1))
+
+        size = len(spots_next)
+        p_next = (np.bincount(mid, pmid * p_total, minlength=size) +
+                  np.bincount(np.minimum(mid + 1, size - 1), pup * p_total, minlength=size) +
+                  np.bincount(np.maximum(mid - 1, 0), pdown * p_total, minlength=size))
+        return (pup, pmid, pdown, mid), spots_next, p_next, -k_min, k_min, k_max
+
+    def build(self) -> 'Lattice':
+        """
+        Construit l'arbre colonne par colonne, de gauche à droite.
+
+        Returns:
+            Lattice: Le lattice construit (self).
+        """
+        spots = np.array([float(self.market.s0)])
+        p_total = np.array([1.0])
+        trunk = 0
+        columns = []
+        trunks = [trunk]
+        for i in range(self.model.nbsteps):
+            transitions, spots_next, p_next, trunk, _, _ = self.next_column(i, spots, p_total, trunk)
+            columns.append((spots, p_total) + transitions)
+            spots, p_total = spots_next, p_next
+            trunks.append(trunk)
+
+        size = len(spots)
+        columns.append((spots, p_total, np.zeros(size), np.zeros(size), np.zeros(size), np.zeros(size, np.int64)))
+        self.spots, self.p_total, self.pup, self.pmid, self.pdown, self.mid = (
+            np.concatenate(field) for field in zip(*columns))
+        self.trunk = np.array(trunks)
+        self.offsets = np.concatenate(([0], np.cumsum([len(col[0]) for col in columns])))
+        return self
+
+    def is_built(self) -> bool:
+        """
+        Indique si l'arbre a été construit.
+        """
+        return self.offsets is not None
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Résume la taille de l'arbre à partir des crans min et max conservés pour chaque colonne.
+
+        Returns:
+            Dict[str, Any]: Nombre de pas, de nœuds, largeur maximale et probabilité totale de la dernière colonne.
+        """
+        if not self.is_built():
+            self.build()
+        widths = self.k_range[:, 1] - self.k_range[:, 0] + 1
+        return {
+            "NbSteps": self.model.nbsteps,
+            "Nodes": int(widths.sum()),
+            "MaxWidth": int(widths.max()),
+            "LastColumnProba": self.last_column_proba
+        }
+
+    def column_size(self, i: int) -> int:
+        """
+        Renvoie le nombre de nœuds de la colonne i.
+        """
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def column_spots(self, i: int) -> np.ndarray:
+        """
+        Renvoie les prix des nœuds de la colonne i.
+        """
+        return self.spots[self.column(i)]
+
+    def column_transitions(self, i: int):
+        """
+        Renvoie les transitions (pup, pmid, pdown, mid) des nœuds de la colonne i.
+        """
+        col = self.column(i)
+        return self.pup[col], self.pmid[col], self.pdown[col], self.mid[col]
+
+    @staticmethod
+    def payoff(spots: np.ndarray, strikes: np.ndarray, is_call: np.ndarray) -> np.ndarray:
+        """
+        Calcule les payoffs d'une colonne de nœuds pour plusieurs options à la fois.
+
+        Args:
+            spots (np.ndarray): Prix du sous-jacent, de taille n.
+            strikes (np.ndarray): Strikes, de taille p.
+            is_call (np.ndarray): Vrai pour un Call, faux pour un Put, de taille p.
+
+        Returns:
+            np.ndarray: Matrice des payoffs de taille (n, p).
+        """
+        intrinsic = spots[:, None] - strikes[None, :]
+        return np.maximum(np.where(is_call, intrinsic, -intrinsic), 0.0)
+
+    def rollback(self, i: int, values: np.ndarray, strikes: np.ndarray, is_call: np.ndarray,
+                 is_american: np.ndarray) -> np.ndarray:
+        """
+        Remonte d'une colonne les valeurs des options (induction backward de la colonne i + 1 vers i).
+
+        Args:
+            i (int): L'indice de la colonne à valoriser.
+            values (np.ndarray): Valeurs de la colonne i + 1, de taille (n, p).
+            strikes, is_call, is_american (np.ndarray): Caractéristiques des p options.
+
+        Returns:
+            np.ndarray: Valeurs de la colonne i.
+        """
+        pup, pmid, pdown, mid = self.column_transitions(i)
+        size = values.shape[0]
+        values = (pup[:, None] * values[np.minimum(mid + 1, size - 1)] +
+                  pmid[:, None] * values[mid] +
+                  pdown[:, None] * values[np.maximum(mid - 1, 0)]) * self.df(i)
+        if is_american.any():
+            exercise = self.payoff(self.column_spots(i), strikes, is_call)
+            values = np.where(is_american, np.maximum(values, exercise), values)
+        return values
+
+    def smoothed_values(self, i: int, strikes: np.ndarray, is_call: np.ndarray,
+                        is_american: np.ndarray) -> np.ndarray:
+        """
+        Valeurs des options sur l'avant-dernière colonne par la formule fermée de Black-Scholes sur le dernier
+        pas (méthode BBS) : le payoff non dérivable n'est plus échantillonné sur les nœuds finaux, ce qui
+        supprime l'oscillation du prix avec la position du strike. Un dividende détaché sur ce pas est retiré
+        du spot actualisé (spot forward actualisé). Le taux et la volatilité sont ceux du pas (forwards
+        de la structure par terme).
+
+        Args:
+            i (int): L'indice de l'avant-dernière colonne.
+            strikes, is_call, is_american (np.ndarray): Caractéristiques des p options.
+
+        Returns:
+            np.ndarray: Valeurs de la colonne i, de taille (n, p).
+        """
+        spots = self.column_spots(i)
+        forward_spots = spots - self.market.div * self.df(i) if self.have_div(i) else spots
+        dt = self.model.delta_ts[i]
+        values = BlackScholes.price_array(forward_spots[:, None], strikes[None, :], m.log(self.model.growths[i]) / dt,
+                                          m.sqrt(self.model.variances[i] / dt), dt, is_call[None, :])
+        if is_american.any():
+            values = np.where(is_american, np.maximum(values, self.payoff(spots, strikes, is_call)), values)
+        return values
+
+    def price(self, strikes: ArrayLike, is_call: Union[bool, ArrayLike] = True,
+              is_american: Union[bool, ArrayLike] = False) -> np.ndarray:
+        """
+        Valorise plusieurs options sur le même arbre en une seule induction backward.
+
+        Args:
+            strikes (ArrayLike): Strikes des options.
+            is_call (Union[bool, ArrayLike]): Vrai pour un Call, faux pour un Put.
+            is_american (Union[bool, ArrayLike]): Vrai pour un exercice américain.
+
+        Returns:
+            np.ndarray: Prix des options à la racine.
+        """
+        if not self.is_built():
+            self.build()
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), strikes.shape)
+        is_american = np.broadcast_to(np.asarray(is_american, dtype=bool), strikes.shape)
+
+        n = self.model.nbsteps
+        self.early_values = {}
+        if self.smooth:
+            values = self.smoothed_values(n - 1, strikes, is_call, is_american)
+            if n - 1 <= 2:
+                self.early_values[n - 1] = values
+            last = n - 2
+        else:
+            values = self.payoff(self.column_spots(n), strikes, is_call)
+            last = n - 1
+        for i in range(last, -1, -1):
+            values = self.rollback(i, values, strikes, is_call, is_american)
+            # Valeurs des premières colonnes conservées pour les Grecques lues sur l'arbre
+            if i <= 2:
+                self.early_values[i] = values
+        return values[0]
+
+    def greeks(self) -> Dict[str, np.ndarray]:
+        """
+        Calcule Delta, Gamma et Theta (par jour) des options de la dernière valorisation, à partir des
+        valeurs des colonnes 1 et 2 de l'arbre (sans nouvelle construction).
+
+        Returns:
+            Dict[str, np.ndarray]: Grecques de chaque option.
+        """
+        if len(self.early_values) < 3:
+            # Valeurs des colonnes 0 à 2 avant l'échéance : la colonne de payoff n'est pas conservée
+            raise ValueError("Les Grecques lues sur l'arbre nécessitent au moins 3 pas et une valorisation.")
+        s1, t1, v1 = self.column_spots(1), self.trunk[1], self.early_values[1]
+        delta = (v1[t1 + 1] - v1[t1 - 1]) / (s1[t1 + 1] - s1[t1 - 1])
+
+        s2, t2, v2 = self.column_spots(2), self.trunk[2], self.early_values[2]
+        delta_up = (v2[t2 + 1] - v2[t2]) / (s2[t2 + 1] - s2[t2])
+        delta_down = (v2[t2] - v2[t2 - 1]) / (s2[t2] - s2[t2 - 1])
+        gamma = (delta_up - delta_down) / ((s2[t2 + 1] - s2[t2 - 1]) / 2)
+
+        # Le tronc de la colonne 2 est au forward : on ramène sa valeur au spot initial avant de comparer
+        v2_s0 = v2[t2] + (delta_up + delta_down) / 2 * (self.market.s0 - s2[t2])
+        theta = (v2_s0 - self.early_values[0][0]) / (self.model.times[2] * 365)
+        return {"Delta": delta, "Gamma": gamma, "Theta": theta}
+
+    def price_option(self, option) -> float:
+        """
+        Valorise une option sur l'arbre.
+
+        Args:
+            option (Option): L'option à évaluer.
+
+        Returns:
+            float: Le prix de l'option.
+        """
+        return float(self.price(option.strike, option.op_type == "Call", option.type == "American")[0])
+
+    def save(self, path: str):
+        """
+        Enregistre l'arbre construit dans un répertoire : un fichier .npy par tableau et un en-tête JSON
+        versionné (paramètres de marché et de modèle). Les tableaux se rouvrent en numpy.memmap avec load.
+
+        Args:
+            path (str): Répertoire de destination (créé si besoin).
+        """
+        if not self.is_built():
+            self.build()
+        if self.spots is None:
+            raise ValueError("Seul un arbre stocké en entier (Lattice) peut être enregistré.")
+        os.makedirs(path, exist_ok=True)
+        for name in LATTICE_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+        def to_text(date) -> Optional[str]:
+            return date.isoformat() if isinstance(date, datetime) else date
+
+        def to_json(value) -> Union[float, dict]:
+            return value.to_dict() if isinstance(value, Curve) else float(value)
+
+        header = {
+            'version': LATTICE_FORMAT_VERSION,
+            'market': {'r': to_json(self.market.r), 'vol': to_json(self.market.vol), 's0': float(self.market.s0),
+                       'div': float(self.market.div or 0), 'div_date': to_text(self.market.div_date)},
+            'model': {'pricing_date': to_text(self.model.prdate), 'maturity': to_text(self.model.maturity),
+                      'nbsteps': int(self.model.nbsteps), 'delta_t': self.model.delta_t, 'alpha': self.model.alpha,
+                      'times': self.model.times.tolist()},
+            'seuil': float(self.seuil),
+            'smooth': bool(self.smooth),
+            'nodes': int(len(self.spots))
+        }
+        with open(os.path.join(path, "lattice.json"), "w") as file:
+            json.dump(header, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'Lattice':
+        """
+        Rouvre un arbre enregistré par save, sans reconstruction : les tableaux sont projetés en mémoire
+        (numpy.memmap, aucune copie) et partageables entre processus.
+
+        Args:
+            path (str): Répertoire de l'arbre enregistré.
+            mmap_mode (Optional[str]): Mode de projection mémoire ('r' par défaut, None pour tout charger).
+
+        Returns:
+            Lattice: L'arbre prêt à valoriser de nouveaux payoffs.
+        """
+        with open(os.path.join(path, "lattice.json")) as file:
+            header = json.load(file)
+        if header.get('version') != LATTICE_FORMAT_VERSION:
+            raise ValueError(f"Version de format d'arbre non supportée : {header.get('version')}")
+
+        def to_date(text):
+            return datetime.fromisoformat(text) if isinstance(text, str) else text
+
+        def to_curve(value):
+            return Curve(**value) if isinstance(value, dict) else value
+
+        market_data = header['market']
+        market = Market(**dict(market_data, r=to_curve(market_data['r']), vol=to_curve(market_data['vol']),
+                               div_date=to_date(market_data['div_date'])))
+        option = Option("Call", "European", 0, to_date(header['model']['maturity']))
+        model = Model(to_date(header['model']['pricing_date']), header['model']['nbsteps'], option, market,
+                      time_grid=header['model'].get('times'))
+        lattice = cls(market, model, seuil=header['seuil'], smooth=header.get('smooth', False))
+        for name in LATTICE_ARRAYS:
+            setattr(lattice, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode))
+        return lattice
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Résume la taille de l'arbre construit, pour inspecter de grands arbres sans les afficher dans Excel.
+
+        Returns:
+            Dict[str, Any]: Nombre de pas, de nœuds, largeur maximale et probabilité totale de la dernière colonne.
+        """
+        if not self.is_built():
+            self.build()
+        widths = np.diff(self.offsets)
+        return {
+            "NbSteps": self.model.nbsteps,
+            "Nodes": int(self.offsets[-1]),
+            "MaxWidth": int(widths.max()),
+            "LastColumnProba": float(self.p_total[self.column(self.model.nbsteps)].sum())
+        }
+
+    def price_spot_ladder(self, spots: ArrayLike, strike: float, is_call: bool = True,
+                          is_american: bool = False) -> np.ndarray:
+        """
+        Valorise une option pour une gamme de prix du sous-jacent.
+
+        Sans dividende discret, un seul arbre est construit (au spot du marché) et toute la gamme est
+        valorisée par une induction multi-strike : prix(λ·s0, K) = λ · prix(s0, K/λ). Sinon, le dividende
+        casse l'invariance d'échelle et un arbre est construit par spot.
+
+        Args:
+            spots (ArrayLike): Prix du sous-jacent à valoriser.
+            strike (float): Strike de l'option.
+            is_call (bool): Vrai pour un Call, faux pour un Put.
+            is_american (bool): Vrai pour un exercice américain.
+
+        Returns:
+            np.ndarray: Prix de l'option pour chaque spot.
+        """
+        spots = np.atleast_1d(np.asarray(spots, dtype=float))
+        prices = np.empty(len(spots))
+        positive = spots > 0
+
+        # Sous-jacent nul : il reste nul jusqu'à maturité, seul le Put a une valeur
+        if is_call:
+            prices[~positive] = 0.0
+        else:
+            prices[~positive] = strike if is_american else strike * np.prod(self.model.dfs)
+
+        if self.is_scale_invariant():
+            scale = spots[positive] / self.market.s0
+            prices[positive] = scale * self.price(strike / scale, is_call, is_american)
+        else:
+            for j in np.flatnonzero(positive):
+                market = Market(self.market.r, self.market.vol, spots[j], self.market.div, self.market.div_date)
+                prices[j] = type(self)(market, self.model, self.seuil, self.smooth).price(strike, is_call,
+                                                                                         is_american)[0]
+        return prices
+
+    def greeks_spot_ladder(self, spots: ArrayLike, strike: float, is_call: bool = True,
+                           is_american: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Valorise une option et lit ses Grecques sur l'arbre pour une gamme de prix (positifs) du sous-jacent.
+
+        Sans dividende discret, un seul arbre sert toute la gamme : avec λ = S / s0, le prix et le Theta
+        sont homogènes de degré 1, le Delta de degré 0 et le Gamma de degré -1 en (S, K). Sinon, un arbre
+        est construit par spot.
+
+        Args:
+            spots (ArrayLike): Prix du sous-jacent à valoriser.
+            strike (float): Strike de l'option.
+            is_call (bool): Vrai pour un Call, faux pour un Put.
+            is_american (bool): Vrai pour un exercice américain.
+
+        Returns:
+            Dict[str, np.ndarray]: Prix, Delta, Gamma et Theta (par jour) pour chaque spot.
+        """
+        spots = np.atleast_1d(np.asarray(spots, dtype=float))
+        if np.any(spots <= 0):
+            raise ValueError("Les prix du sous-jacent doivent être positifs.")
+
+        if self.is_scale_invariant():
+            scale = spots / self.market.s0
+            prices = scale * self.price(strike / scale, is_call, is_american)
+            greeks = self.greeks()
+            return {"Price": prices, "Delta": greeks["Delta"], "Gamma": greeks["Gamma"] / scale,
+                    "Theta": scale * greeks["Theta"]}
+
+        results = {name: np.empty(len(spots)) for name in ("Price", "Delta", "Gamma", "Theta")}
+        for j, spot in enumerate(spots):
+            market = Market(self.market.r, self.market.vol, spot, self.market.div, self.market.div_date)
+            lattice = type(self)(market, self.model, self.seuil, self.smooth)
+            results["Price"][j] = lattice.price(strike, is_call, is_american)[0]
+            for name, value in lattice.greeks().items():
+                results[name][j] = value[0]
+        return results
+
+
+class RollingLattice(Lattice):
+    """
+    Variante « prix seul » du Lattice en mémoire O(N) : la construction ne garde que la colonne courante
+    et la suivante et ne conserve, pour chaque colonne, que quelques scalaires (prix du tronc, crans min et
+    max, plages des nœuds au-dessus du seuil). L'induction backward reconstruit chaque colonne à la volée,
+    à l'identique de la construction.
+
+    Seules les valeurs des colonnes 0 à 2 sont conservées, pour les Grecques lues sur l'arbre.
+    """
+
+    def build(self) -> 'RollingLattice':
+        """
+        Parcourt l'arbre de gauche à droite en ne conservant que les métadonnées de chaque colonne.
+
+        Returns:
+            RollingLattice: Le lattice construit (self).
+        """
+        n = self.model.nbsteps
+        self.trunk_spots = np.empty(n + 1)
+        self.k_range = np.zeros((n + 1, 2), dtype=np.int64)
+        self.trunk = np.zeros(n + 1, dtype=np.int64)
+        full_runs = []
+
+        spots = np.array([float(self.market.s0)])
+        p_total = np.array([1.0])
+        self.trunk_spots[0] = spots[0]
+        for i in range(n + 1):
+            # Plages [début, fin) des nœuds au-dessus du seuil (quelques plages par colonne avec le pruning)
+            full = np.concatenate(([0], (p_total > self.seuil).astype(np.int8), [0]))
+            full_runs.append(np.flatnonzero(np.diff(full)))
+            if i < n:
+                _, spots, p_total, trunk, k_min, k_max = self.next_column(i, spots, p_total, self.trunk[i])
+                self.trunk[i + 1] = trunk
+                self.trunk_spots[i + 1] = spots[trunk]
+                self.k_range[i + 1] = k_min, k_max
+
+        self.full_runs = np.concatenate(full_runs)
+        self.run_offsets = np.concatenate(([0], np.cumsum([len(runs) for runs in full_runs])))
+        self.last_column_proba = float(p_total.sum())
+        return self
+
+    def is_built(self) -> bool:
+        """
+        Indique si les métadonnées de l'arbre ont été calculées.
+        """
+        return hasattr(self, 'trunk_spots')
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Résume la taille de l'arbre à partir des crans min et max conservés pour chaque colonne.
+
+        Returns:
+            Dict[str, Any]: Nombre de pas, de nœuds, largeur maximale et probabilité totale de la dernière colonne.
+        """
+        if not self.is_built():
+            self.build()
+        widths = self.k_range[:, 1] - self.k_range[:, 0] + 1
+        return {
+            "NbSteps": self.model.nbsteps,
+            "Nodes": int(widths.sum()),
+            "MaxWidth": int(widths.max()),
+            "LastColumnProba": self.last_column_proba
+        }
+
+    def column_size(self, i: int) -> int:
+        """
+        Renvoie le nombre de nœuds de la colonne i.
+        """
+        k_min, k_max = self.k_range[i]
+        return int(k_max - k_min + 1)
+
+    def column_spots(self, i: int) -> np.ndarray:
+        """
+        Reconstruit les prix des nœuds de la colonne i.
+        """
+        k_min, k_max = self.k_range[i]
+        return self.grid(i, self.trunk_spots[i], np.arange(k_min, k_max + 1))
+
+    def column_transitions(self, i: int):
+        """
+        Recalcule les transitions (pup, pmid, pdown, mid) des nœuds de la colonne i.
+        """
+        spots = self.column_spots(i)
+        full = np.zeros(len(spots), dtype=bool)
+        runs = self.full_runs[self.run_offsets[i]:self.run_offsets[i + 1]]
+        for start, end in zip(runs[::2], runs[1::2]):
+            full[start:end] = True
+        _, k, pup, pmid, pdown = self.transition(i, spots, self.trunk[i], full)
+        return pup, pmid, pdown, k - self.k_range[i + 1, 0]
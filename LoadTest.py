@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import numpy as np
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+from Greeks import GreeksCalculator
+
+try:
+    import resource
+except ImportError:  # Windows : pas de mesure de la mémoire maximale
+    resource = None
+
+# Points d'entrée de pricing mesurés (une option par appel)
+ENTRY_POINTS: Dict[str, Callable[[Convergence], Any]] = {
+    'trinomial': lambda convergence: convergence.run_trinomial(),
+    'lattice': lambda convergence: convergence.run_lattice(),
+    'black_scholes': lambda convergence: convergence.run_black_scholes(),
+    'greeks': lambda convergence: GreeksCalculator(convergence).calculate_all(max_workers=1),
+}
+LOAD_TEST_FORMAT_VERSION = 2
+
+
+def generate_book(nb_options: int, seed: int = 0, nbsteps: int = 100, pricing_date: datetime = datetime(2023, 9, 1),
+                  div_share: float = 0.3) -> List[Dict[str, Any]]:
+    """
+    Génère un portefeuille synthétique reproductible : Calls et Puts, européennes et américaines, strikes de
+    70 % à 130 % du spot, maturités de 2 semaines à 2 ans, et une part des options avec un dividende discret
+    détaché avant maturité.
+
+    Args:
+        nb_options (int): Nombre d'options.
+        seed (int): Graine du générateur aléatoire (même graine, même portefeuille).
+        nbsteps (int): Nombre de pas des arbres.
+        pricing_date (datetime): Date de pricing.
+        div_share (float): Part des options avec dividende.
+
+    Returns:
+        List[Dict[str, Any]]: Paramètres de chaque option (format de ExcelInterface.read_data).
+    """
+    rng = np.random.default_rng(seed)
+    book = []
+    for _ in range(nb_options):
+        s0 = float(rng.uniform(20, 200))
+        maturity_days = int(rng.integers(14, 731))
+        has_div = rng.random() < div_share
+        book.append({
+            'r': float(rng.uniform(0.0, 0.05)),
+            'vol': float(rng.uniform(0.1, 0.6)),
+            's0': s0,
+            'div': round(float(s0 * rng.uniform(0.005, 0.02)), 2) if has_div else 0,
+            'div_date': pricing_date + timedelta(days=int(rng.integers(1, maturity_days))),
+            'option_type': 'Call' if rng.random() < 0.5 else 'Put',
+            'type': 'American' if rng.random() < 0.5 else 'European',
+            'strike': round(float(s0 * rng.uniform(0.7, 1.3)), 2),
+            'maturity': pricing_date + timedelta(days=maturity_days),
+            'pricing_date': pricing_date,
+            'nbsteps': nbsteps,
+            'max_steps': 20,
+            'print_arbre': False,
+            'is_pruned': 'Oui',
+            'pruned_level': 1e-7
+        })
+    return book
+
+
+def init_worker(max_depth: int):
+    """
+    Prépare un processus de calcul : limite de récursion de Node.price et chargement des noyaux compilés,
+    hors mesure.
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max_depth))
+    warm_up = generate_book(1, nbsteps=10, div_share=0)[0]
+    ENTRY_POINTS['lattice'](Convergence(DataInterface(warm_up)))
+
+
+def price_job(job: Tuple[str, Dict[str, Any]]) -> Tuple[float, float, bool, Optional[float]]:
+    """
+    Valorise une option par le point d'entrée demandé et mesure la latence et le temps CPU du processus
+    (significatif en mode processus, où chaque processus ne traite qu'une option à la fois).
+
+    Returns:
+        Tuple[float, float, bool, Optional[float]]: Latence et temps CPU en secondes, succès du pricing et
+        mémoire maximale du processus de calcul (Mo).
+    """
+    entry, data = job
+    start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        ENTRY_POINTS[entry](Convergence(DataInterface(data)))
+        success = True
+    except Exception:
+        # Toute erreur de pricing (paramètres rejetés, récursion trop profonde...) est comptée comme un échec
+        # sans interrompre la mesure du reste du portefeuille
+        success = False
+    return time.perf_counter() - start, time.process_time() - cpu_start, success, peak_memory_mb()
+
+
+def peak_memory_mb() -> Optional[float]:
+    """
+    Mémoire résidente maximale du processus courant depuis son démarrage (Mo), None si indisponible.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Décrit la machine et la version du code, pour comparer des mesures entre versions.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'cpu_count': os.cpu_count()}
+
+
+def run_load_test(book: List[Dict[str, Any]], entry: str = 'lattice', concurrency: int = 1,
+                  mode: str = 'process') -> Dict[str, Any]:
+    """
+    Valorise tout le portefeuille par un point d'entrée de pricing, avec le niveau de concurrence demandé.
+
+    Args:
+        book (List[Dict[str, Any]]): Portefeuille (voir generate_book).
+        entry (str): Point d'entrée mesuré (clé de ENTRY_POINTS).
+        concurrency (int): Nombre de processus ou de threads.
+        mode (str): "process" ou "thread".
+
+    Returns:
+        Dict[str, Any]: Options par seconde, latences p50/p95/p99 (ms), utilisation CPU (part de la capacité
+        de la machine), mémoire maximale (Mo) et nombre d'échecs. En mode processus, la mémoire est celle du
+        plus gros processus de calcul, créés pour cette mesure ; en mode thread, c'est le maximum atteint par
+        le processus courant depuis son démarrage, cumulé sur les mesures précédentes (PeakMemoryCumulative).
+    """
+    if entry not in ENTRY_POINTS:
+        raise ValueError(f"Point d'entrée inconnu : {entry}. Choix possibles : {', '.join(ENTRY_POINTS)}")
+    max_depth = 10 * max(data['nbsteps'] for data in book) + 1000
+    if mode == 'process':
+        executor = ProcessPoolExecutor(max_workers=concurrency, initializer=init_worker, initargs=(max_depth,))
+    elif mode == 'thread':
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+    else:
+        raise ValueError("Le mode doit être 'process' ou 'thread'.")
+
+    jobs = [(entry, data) for data in book]
+    with executor:
+        # Démarrage des processus et chargement des noyaux hors mesure
+        list(executor.map(init_worker, [max_depth] * concurrency))
+        cpu_start, start = time.process_time(), time.perf_counter()
+        results = list(executor.map(price_job, jobs, chunksize=1))
+        wall_time = time.perf_counter() - start
+        # En mode thread, le temps CPU du processus couvre tous les threads
+        cpu_time = sum(cpu for _, cpu, _, _ in results) if mode == 'process' else time.process_time() - cpu_start
+
+    latencies = np.array([latency for latency, _, _, _ in results]) * 1000
+    memories = [memory for _, _, _, memory in results if memory is not None]
+    return {
+        'Options': len(book),
+        'Errors': sum(1 for _, _, success, _ in results if not success),
+        'WallTime': wall_time,
+        'OptionsPerSecond': len(book) / wall_time,
+        'LatencyP50': float(np.percentile(latencies, 50)),
+        'LatencyP95': float(np.percentile(latencies, 95)),
+        'LatencyP99': float(np.percentile(latencies, 99)),
+        'CPUUtilisation': cpu_time / (wall_time * (os.cpu_count() or 1)),
+        'PeakMemoryMB': max(memories) if memories else None,
+        'PeakMemoryCumulative': mode == 'thread'
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[List[Any]]:
+    """
+    Compare deux rapports de load test ligne à ligne (même point d'entrée et même concurrence).
+
+    Returns:
+        List[List[Any]]: Lignes [point d'entrée, concurrence, options/s avant, après, ratio, p99 avant, après].
+    """
+    previous = {(row['Entry'], row['Concurrency']): row for row in baseline['Results']}
+    rows = []
+    for row in current['Results']:
+        before = previous.get((row['Entry'], row['Concurrency']))
+        if before is not None:
+            rows.append([row['Entry'], row['Concurrency'], before['OptionsPerSecond'], row['OptionsPerSecond'],
+                         row['OptionsPerSecond'] / before['OptionsPerSecond'], before['LatencyP99'],
+                         row['LatencyP99']])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test du pricing sur un portefeuille synthétique.")
+    parser.add_argument("--options", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--nbsteps", type=int, default=100)
+    parser.add_argument("--entry", nargs="+", default=["lattice"], choices=list(ENTRY_POINTS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--mode", choices=["process", "thread"], default="process")
+    parser.add_argument("--output", help="Fichier JSON du rapport.")
+    parser.add_argument("--compare", help="Rapport JSON d'une version précédente.")
+    args = parser.parse_args()
+
+    from Benchmark import print_table
+    book = generate_book(args.options, args.seed, args.nbsteps)
+    results = []
+    for entry in args.entry:
+        for concurrency in sorted(set(args.concurrency)):
+            results.append(dict(run_load_test(book, entry, concurrency, args.mode), Entry=entry,
+                                Concurrency=concurrency))
+    memory_header = "Mémoire cumulée (Mo)" if args.mode == "thread" else "Mémoire (Mo)"
+    print_table(["Entrée", "Concurrence", "Options/s", "p50 (ms)", "p95 (ms)", "p99 (ms)", "CPU", memory_header,
+                 "Erreurs"],
+                [[row['Entry'], row['Concurrency'], row['OptionsPerSecond'], row['LatencyP50'], row['LatencyP95'],
+                  row['LatencyP99'], row['CPUUtilisation'], row['PeakMemoryMB'] or "n/a", row['Errors']]
+                 for row in results])
+
+    report = {'version': LOAD_TEST_FORMAT_VERSION, 'environment': environment(),
+              'config': {'options': args.options, 'seed': args.seed, 'nbsteps': args.nbsteps, 'mode': args.mode},
+              'Results': results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            print_table(["Entrée", "Concurrence", "Avant (op/s)", "Après (op/s)", "Ratio", "p99 avant", "p99 après"],
+                        compare(json.load(file), report))
@@ -1,22 +1,96 @@
+import numpy as np
+from typing import Sequence, Union
+
+
+class Curve:
+    """
+    Structure par terme déterministe définie par des piliers (maturité en années, valeur) : courbe de taux
+    zéro-coupon ou de volatilités implicites.
+
+    L'interpolation est linéaire sur la quantité cumulée valeur^p × t (p = 1 pour un taux : taux forward
+    constant entre deux piliers ; p = 2 pour une volatilité : variance forward constante), et la valeur est
+    prolongée à plat avant le premier et après le dernier pilier.
+
+    Attributs:
+        times (np.ndarray): Maturités des piliers en années, strictement croissantes.
+        values (np.ndarray): Valeurs aux piliers.
+    """
+
+    def __init__(self, times: Sequence[float], values: Sequence[float]):
+        """
+        Initialise la courbe.
+
+        Args:
+            times (Sequence[float]): Maturités des piliers en années.
+            values (Sequence[float]): Valeurs aux piliers.
+        """
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        if (self.times.ndim != 1 or len(self.times) == 0 or self.times.shape != self.values.shape or
+                self.times[0] <= 0 or np.any(np.diff(self.times) <= 0)):
+            raise ValueError("Les piliers de la courbe doivent avoir des maturités positives strictement croissantes.")
+
+    def __add__(self, shift: float) -> 'Curve':
+        """
+        Renvoie la courbe déplacée parallèlement (chocs et Grecques par différences finies).
+        """
+        return Curve(self.times, self.values + shift)
+
+    __radd__ = __add__
+
+    def __sub__(self, shift: float) -> 'Curve':
+        return Curve(self.times, self.values - shift)
+
+    def cumulative(self, t, power: int = 1) -> np.ndarray:
+        """
+        Renvoie la quantité cumulée valeur(t)^power × t (intégrale du taux ou variance totale).
+
+        Args:
+            t: Temps en années (scalaire ou tableau).
+            power (int): 1 pour un taux, 2 pour une volatilité.
+
+        Returns:
+            np.ndarray: Quantité cumulée en chaque temps.
+        """
+        t = np.asarray(t, dtype=float)
+        pillars = self.values ** power * self.times
+        inside = np.interp(t, np.concatenate(([0.0], self.times)), np.concatenate(([0.0], pillars)))
+        return np.where(t > self.times[-1], self.values[-1] ** power * t, inside)
+
+    def value(self, t: float, power: int = 1) -> float:
+        """
+        Renvoie la valeur interpolée de la courbe (taux zéro-coupon ou volatilité implicite) à la maturité t.
+        """
+        if t <= 0:
+            return float(self.values[0])
+        return float((self.cumulative(t, power) / t) ** (1 / power))
+
+    def to_dict(self) -> dict:
+        """
+        Décrit la courbe pour l'enregistrement JSON (voir Lattice.save).
+        """
+        return {'times': self.times.tolist(), 'values': self.values.tolist()}
+
+
 class Market:
     """
     La classe Market définit l'environnement de marché pour une option.
 
     Attributs:
-        r (float): Taux d'intérêt sans risque.
-        vol (float): Volatilité du sous-jacent.
+        r (float ou Curve): Taux d'intérêt sans risque, plat ou courbe de taux zéro-coupon.
+        vol (float ou Curve): Volatilité du sous-jacent, plate ou courbe de volatilités implicites.
         s0 (float): Prix initial du sous-jacent.
         div (float): Dividende.
         div_date (date): Date d'ex-dividende.
     """
 
-    def __init__(self, r, vol, s0, div, div_date):
+    def __init__(self, r: Union[float, Curve], vol: Union[float, Curve], s0, div, div_date):
         """
         Initialise une nouvelle instance de la classe Market.
 
         Args:
-            r (float): Taux d'intérêt sans risque.
-            vol (float): Volatilité du sous-jacent.
+            r (float ou Curve): Taux d'intérêt sans risque.
+            vol (float ou Curve): Volatilité du sous-jacent.
             s0 (float): Prix initial du sous-jacent.
             div (float): Dividende.
             div_date (date): Date d'ex-dividende.
@@ -26,3 +100,30 @@ class Market:
         self.s0 = s0
         self.div = div
         self.div_date = div_date
+        if isinstance(vol, Curve) and (np.any(vol.values <= 0) or
+                                       np.any(np.diff(vol.cumulative(vol.times, 2)) <= 0)):
+            raise ValueError("La variance totale de la courbe de volatilité doit croître strictement.")
+
+    def rate(self, t: float) -> float:
+        """
+        Renvoie le taux zéro-coupon de maturité t (en années).
+        """
+        return self.r.value(t) if isinstance(self.r, Curve) else self.r
+
+    def volatility(self, t: float) -> float:
+        """
+        Renvoie la volatilité implicite de maturité t (en années).
+        """
+        return self.vol.value(t, 2) if isinstance(self.vol, Curve) else self.vol
+
+    def rate_integral(self, t) -> np.ndarray:
+        """
+        Renvoie l'intégrale du taux instantané entre 0 et t (le facteur d'actualisation vaut exp(-intégrale)).
+        """
+        return self.r.cumulative(t) if isinstance(self.r, Curve) else self.r * np.asarray(t, dtype=float)
+
+    def variance_integral(self, t) -> np.ndarray:
+        """
+        Renvoie la variance totale du log du sous-jacent entre 0 et t.
+        """
+        return self.vol.cumulative(t, 2) if isinstance(self.vol, Curve) else self.vol ** 2 * np.asarray(t, dtype=float)
@@ -1,9 +1,21 @@
 import math as m
+import numpy as np
+from typing import NamedTuple, Optional, Sequence
 from Option import Option
 from Market import Market
 from datetime import datetime
 
 
+class Step(NamedTuple):
+    """
+    Paramètres d'un pas de temps en floats Python, lus par l'arbre de nœuds (Node/Tree) sans surcoût NumPy.
+    """
+    df: float
+    growth: float
+    var_factor: float
+    alpha: float
+
+
 class Model:
     """
     La classe Model configure les spécificités du modèle utilisé pour le pricing.
@@ -14,9 +26,18 @@ class Model:
         nbsteps (int): Nombre d'étapes dans le modèle.
         delta_t (float): Intervalle de temps entre les étapes.
         alpha (float): Paramètre alpha utilisé pour ajuster les mouvements de prix.
+        times (np.ndarray): Dates des colonnes en années depuis la date de pricing (nbsteps + 1 valeurs).
+        delta_ts (np.ndarray): Pas de temps de chaque pas.
+        dfs, growths (np.ndarray): Facteur d'actualisation et facteur de croissance du forward de chaque pas.
+        variances (np.ndarray): Variance du log du sous-jacent sur chaque pas.
+        var_factors (np.ndarray): Variance du sous-jacent sur chaque pas rapportée à S², soit
+            croissance² × (exp(variance) - 1).
+        alphas (np.ndarray): Alpha de chaque pas.
+        steps (List[Step]): Les mêmes paramètres pas par pas, pour l'arbre de nœuds.
     """
 
-    def __init__(self, pricing_date, nbsteps, option, market):
+    def __init__(self, pricing_date, nbsteps, option, market, time_grid: Optional[Sequence[float]] = None,
+                 refine: bool = False):
         """
         Initialise une nouvelle instance de la classe Model.
 
@@ -25,6 +46,9 @@ class Model:
             nbsteps (int): Nombre d'étapes dans le modèle.
             option (Option): Instance de la classe Option.
             market (Market): Instance de la classe Market.
+            time_grid (Optional[Sequence[float]]): Grille de temps non uniforme (en années, de 0 à maturité,
+                nbsteps + 1 valeurs), utilisée par les arbres en tableaux (Lattice).
+            refine (bool): Vrai pour raffiner la grille autour du dividende et de la maturité.
         """
 
         self.prdate = pricing_date if isinstance(pricing_date, datetime) else datetime.strptime(pricing_date,
@@ -41,6 +65,62 @@ class Model:
         self.delta_t = (self.maturity - self.prdate).days / 365 / nbsteps
         self.alpha = self.calc_alpha()
 
+        if time_grid is None and refine:
+            time_grid = self.refined_time_grid()
+        if time_grid is None:
+            self.times = np.arange(nbsteps + 1) * self.delta_t
+            self.delta_ts = np.full(nbsteps, self.delta_t)
+        else:
+            self.times = np.asarray(time_grid, dtype=float)
+            if (len(self.times) != nbsteps + 1 or self.times[0] != 0 or np.any(np.diff(self.times) <= 0) or
+                    not m.isclose(self.times[-1], nbsteps * self.delta_t)):
+                raise ValueError("La grille de temps doit croître strictement de 0 à la maturité en nbsteps pas.")
+            self.delta_ts = np.diff(self.times)
+
+        # Paramètres de chaque pas calculés une seule fois : taux et volatilité plats ou structures par terme,
+        # l'arbre ne fait ensuite qu'une lecture par nœud
+        rates = np.diff(self.market.rate_integral(self.times))
+        self.variances = np.diff(self.market.variance_integral(self.times))
+        self.dfs = np.exp(-rates)
+        self.growths = np.exp(rates)
+        self.var_factors = self.growths ** 2 * np.expm1(self.variances)
+        self.alphas = np.exp(np.sqrt(3 * self.variances))
+        self.steps = [Step(*values) for values in zip(self.dfs.tolist(), self.growths.tolist(),
+                                                      self.var_factors.tolist(), self.alphas.tolist())]
+
+    def refined_time_grid(self, refinement: float = 4.0, width: float = 0.05) -> np.ndarray:
+        """
+        Construit une grille de temps resserrée autour de la date de dividende et de la maturité : la densité
+        de pas vaut 1 + refinement * exp(-((t - t_k) / (width * T))²) autour de chaque point t_k, et la date
+        de dividende est placée exactement sur une colonne.
+
+        Args:
+            refinement (float): Surdensité maximale de pas autour des points raffinés.
+            width (float): Largeur des zones raffinées, en fraction de la maturité.
+
+        Returns:
+            np.ndarray: Dates des colonnes en années (nbsteps + 1 valeurs).
+        """
+        maturity_t = self.nbsteps * self.delta_t
+        points = [maturity_t]
+        div_t = None
+        if self.market.div and self.market.div_date is not None:
+            div_t = (self.market.div_date - self.prdate).total_seconds() / 86400 / 365
+            if 0 < div_t < maturity_t:
+                points.append(div_t)
+
+        fine = np.linspace(0, maturity_t, 20 * self.nbsteps + 1)
+        density = 1 + refinement * sum(np.exp(-((fine - point) / (width * maturity_t)) ** 2) for point in points)
+        cumulative = np.concatenate(([0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(fine))))
+        times = np.interp(np.linspace(0, cumulative[-1], self.nbsteps + 1), cumulative, fine)
+        times[0], times[-1] = 0.0, maturity_t
+
+        # Avec un seul pas il n'y a pas de colonne intérieure : le dividende reste dans l'unique pas.
+        if div_t is not None and 0 < div_t < maturity_t and len(times) > 2:
+            j = int(np.argmin(np.abs(times[1:-1] - div_t))) + 1
+            times[j] = div_t
+        return times
+
     def calc_alpha(self) -> float:
         """
         Calcule le paramètre alpha utilisé pour ajuster les mouvements de prix.
@@ -51,4 +131,4 @@ class Model:
         # Assurer que self.delta_t est positif
         if self.delta_t <= 0:
             raise ValueError(f"Delta_t est non positif.")
-        return m.exp(self.market.vol * m.sqrt(3 * self.delta_t))
\ No newline at end of file
+        return m.exp(m.sqrt(3 * float(self.market.variance_integral(self.delta_t))))
\ No newline at end of file
@@ -1,5 +1,3 @@
-import math as m
-
 class Node:
     """
     Classe représentant un nœud dans un arbre trinomial pour la modélisation d'options financières.
@@ -21,7 +19,7 @@ class Node:
         self.model = model
         self.S = price  # Prix du sous-jacent à ce nœud
         self.i = i  # Index du nœud (niveau dans l'arbre)
-        self.var = self.variance()  # Variance pour ce nœud
+        self.var = None  # Variance pour ce nœud, calculée avec les probabilités de transition
         self.p_total = p_total  # Proba totale de se retrouver à ce nœud depuis la racine de l'arbre
         self.pdown, self.pmid, self.pup = 0, 0, 0  # Initialisation des probabilités de transition
         self.opt_value = None  # Payoff de l'option à ce nœud
@@ -30,13 +28,12 @@ class Node:
 
     def variance(self) -> float:
         """
-        Calcule la variance à ce nœud.
+        Calcule la variance à ce nœud (sur le pas qui part de sa colonne, précalculé par Model).
 
         Returns:
             float: La variance calculée pour ce nœud.
         """
-        return ((self.S ** 2) * m.exp(2 * self.market.r * self.model.delta_t) *
-                (m.exp(self.market.vol ** 2 * self.model.delta_t) - 1))
+        return self.S ** 2 * self.model.steps[self.i].var_factor
     def forward_mid(self, have_div: bool) -> float:
         """
         Calcule le prix forward médian du nœud.
@@ -48,21 +45,13 @@ class Node:
             float: Le prix forward médian.
         """
         if have_div:
-            return self.S * m.exp(self.market.r * self.model.delta_t) - self.market.div
+            return self.S * self.model.steps[self.i].growth - self.market.div
         else:
-            return self.S * m.exp(self.market.r * self.model.delta_t)
-
-    # Calcule le prix suivant pour un mouvement à la hausse
-    def forward_up(self, have_div) -> float:
-        return self.forward_mid(have_div) * self.model.alpha
-
-    # Calcule le prix suivant pour un mouvement à la baisse
-    def forward_down(self, have_div) -> float:
-        return self.forward_mid(have_div) / self.model.alpha
+            return self.S * self.model.steps[self.i].growth
 
     def is_close(self, fwn: float) -> bool:
         """
-        Détermine si le prix forward est proche du prix spot.
+        Détermine si le prix forward est proche du prix spot (écart de la colonne : alpha du pas qui y mène).
 
         Args:
             fwn (float): Le prix forward à comparer.
@@ -70,7 +59,8 @@ class Node:
         Returns:
             bool: True si fwn est proche du spot, sinon False.
         """
-        return self.S * (1 + (1 / self.model.alpha)) / 2 < fwn < self.S * (1 + self.model.alpha) / 2
+        alpha = self.model.steps[self.i - 1].alpha
+        return self.S * (1 + (1 / alpha)) / 2 < fwn < self.S * (1 + alpha) / 2
 
     def move_up(self) -> 'Node':
         """
@@ -80,7 +70,8 @@ class Node:
             Node: Le nouveau nœud créé ou existant après le déplacement vers le haut.
         """
         if self.up is None:
-            self.up = Node(self.S * self.model.alpha, self.i + 1, self.market, self.model)
+            self.up = Node(self.S * self.model.steps[self.i - 1].alpha, self.i, self.market, self.model)
+            self.up.down = self
         return self.up
 
     def move_down(self) -> 'Node':
@@ -91,7 +82,8 @@ class Node:
             Node: Le nouveau nœud créé ou existant après le déplacement vers le bas.
         """
         if self.down is None:
-            self.down = Node(self.S / self.model.alpha, self.i + 1, self.market, self.model)
+            self.down = Node(self.S / self.model.steps[self.i - 1].alpha, self.i, self.market, self.model)
+            self.down.up = self
         return self.down
 
     def get_mid(self, n: 'Node', have_div) -> 'Node':
@@ -108,7 +100,8 @@ class Node:
 
         if n.is_close(fwd):
             return n
-        elif fwd > self.S:
+        # Sens de recherche par rapport au nœud de départ : l'écart des colonnes varie avec la volatilité
+        elif fwd > n.S:
             while not n.is_close(fwd):
                 n = n.move_up()
         else:
@@ -135,9 +128,9 @@ class Node:
             if self.p_total > tree.seuil:
                 self.opt_value = (self.pup * self.n_up.price(option, tree) +
                                   self.pmid * self.n_mid.price(option, tree) +
-                                  self.pdown * self.n_down.price(option, tree)) * tree.df()
+                                  self.pdown * self.n_down.price(option, tree)) * tree.df(self.i)
             else:
-                self.opt_value = self.pmid * self.n_mid.price(option, tree) * tree.df()
+                self.opt_value = self.pmid * self.n_mid.price(option, tree) * tree.df(self.i)
 
             if option.type == "American":
                 immediate_exercise_value = option.payoff(self.S)
@@ -154,13 +147,12 @@ class Node:
             have_div (bool): Indique si un dividende doit être pris en compte.
         """
         if self.p_total > tree.seuil:
-
-            self.pdown = (1/self.n_mid.S ** 2 * (self.var + self.forward_mid(have_div) ** 2) - 1 -
-                          (self.model.alpha + 1) * (
-                    self.forward_mid(have_div)/self.n_mid.S - 1)) / ((1 - self.model.alpha) *
-                                                                     (self.model.alpha ** (-2) - 1))
-            self.pup = ((self.forward_mid(have_div)/self.n_mid.S - 1 - self.pdown * (1/self.model.alpha - 1))/
-                        (self.model.alpha - 1))
+            self.var = self.variance()
+            fwd = self.forward_mid(have_div)
+            alpha = self.model.steps[self.i].alpha
+            self.pdown = (1/self.n_mid.S ** 2 * (self.var + fwd ** 2) - 1 -
+                          (alpha + 1) * (fwd/self.n_mid.S - 1)) / ((1 - alpha) * (alpha ** (-2) - 1))
+            self.pup = (fwd/self.n_mid.S - 1 - self.pdown * (1/alpha - 1)) / (alpha - 1)
             self.pmid = 1 - self.pdown - self.pup
             # Vérifier que les probabilités ne sont pas négatives
             if self.pdown < 0 or self.pup < 0 or self.pmid < 0:
@@ -201,8 +193,10 @@ class Node:
 
             self.n_mid = self.get_mid(n, have_div)
 
+            # Nœuds up et down sur la grille de la colonne suivante (écart alpha du pas, cf. proba_transition)
+            alpha = self.model.steps[self.i].alpha
             if self.n_mid.up is None:
-                self.n_up = Node(self.forward_up(have_div), self.i + 1, self.market, self.model)
+                self.n_up = Node(self.n_mid.S * alpha, self.i + 1, self.market, self.model)
 
                 # Branchages Nmid / Nup
                 self.n_up.down = self.n_mid
@@ -212,7 +206,7 @@ class Node:
 
             # Créer le Node down si pas créé + branchement OU si il existe déjà fait simplement branchement
             if self.n_mid.down is None:
-                self.n_down = Node(self.forward_down(have_div), self.i + 1, self.market, self.model)
+                self.n_down = Node(self.n_mid.S / alpha, self.i + 1, self.market, self.model)
 
                 # Branchages Nmid / Ndown
                 self.n_down.up = self.n_mid
@@ -0,0 +1,338 @@
+import os
+import numpy as np
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from Lattice import Lattice, RollingLattice
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Remplace numba.njit quand Numba n'est pas installé : les noyaux restent du Python pur.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+@njit(cache=True, nogil=True)
+def next_column_kernel(spots, p_total, trunk, alpha, growth, var_factor, div, seuil):
+    """
+    Noyau compilé de Lattice.next_column : construit la colonne i + 1 à partir de la colonne i.
+    """
+    n = spots.shape[0]
+    fwd = np.empty(n)
+    for j in range(n):
+        fwd[j] = spots[j] * growth - div
+        if fwd[j] <= 0:
+            raise ValueError("Le prix forward doit être positif, le dividende est trop élevé.")
+    trunk_next = fwd[trunk]
+    log_low = np.log((1 + 1 / alpha) / 2)
+    log_a = np.log(alpha)
+    denominator = (1 - alpha) * (alpha ** -2 - 1)
+
+    k = np.empty(n, dtype=np.int64)
+    k_min = n + 1
+    k_max = -n - 1
+    for j in range(n):
+        k[j] = np.int64(np.floor((np.log(fwd[j] / trunk_next) - log_low) / log_a))
+        grow = 1 if p_total[j] >= seuil else 0
+        k_min = min(k_min, k[j] - grow)
+        k_max = max(k_max, k[j] + grow)
+
+    size = k_max - k_min + 1
+    spots_next = np.empty(size)
+    for j in range(size):
+        spots_next[j] = trunk_next * alpha ** np.float64(k_min + j)
+
+    pup = np.zeros(n)
+    pmid = np.ones(n)
+    pdown = np.zeros(n)
+    mid = np.empty(n, dtype=np.int64)
+    p_next = np.zeros(size)
+    for j in range(n):
+        mid[j] = k[j] - k_min
+        if p_total[j] > seuil:
+            s_mid = spots_next[mid[j]]
+            ratio = fwd[j] / s_mid
+            var = spots[j] ** 2 * var_factor
+            pdown[j] = ((var + fwd[j] ** 2) / s_mid ** 2 - 1 - (alpha + 1) * (ratio - 1)) / denominator
+            pup[j] = (ratio - 1 - pdown[j] * (1 / alpha - 1)) / (alpha - 1)
+            pmid[j] = 1 - pdown[j] - pup[j]
+            if pdown[j] < 0 or pup[j] < 0 or pmid[j] < 0:
+                raise ValueError("Les probabilités de transition ne peuvent pas être négatives, il y'a un problème.")
+            p_next[mid[j] + 1] += pup[j] * p_total[j]
+            p_next[mid[j] - 1] += pdown[j] * p_total[j]
+        p_next[mid[j]] += pmid[j] * p_total[j]
+    return pup, pmid, pdown, mid, spots_next, p_next, -k_min, k_min, k_max
+
+
+@njit(cache=True, nogil=True)
+def rollback_kernel(values, pup, pmid, pdown, mid, spots, df, strikes, is_call, is_american):
+    """
+    Noyau compilé de Lattice.rollback : induction backward d'une colonne, exercice américain compris.
+    """
+    n = pup.shape[0]
+    size = values.shape[0]
+    nb_options = strikes.shape[0]
+    out = np.empty((n, nb_options))
+    for j in range(n):
+        up = min(mid[j] + 1, size - 1)
+        down = max(mid[j] - 1, 0)
+        for q in range(nb_options):
+            value = (pup[j] * values[up, q] + pmid[j] * values[mid[j], q] + pdown[j] * values[down, q]) * df
+            if is_american[q]:
+                exercise = spots[j] - strikes[q] if is_call[q] else strikes[q] - spots[j]
+                if exercise > value:
+                    value = exercise
+            out[j, q] = value
+    return out
+
+
+@njit(cache=True, nogil=True)
+def forward_chunk_kernel(spots, p_total, growth, div, trunk_next, alpha, seuil):
+    """
+    Première passe de next_column_kernel sur un bloc de nœuds : forwards, nœuds médians (en crans par
+    rapport au tronc suivant) et crans min et max atteints par le bloc.
+    """
+    n = spots.shape[0]
+    fwd = np.empty(n)
+    k = np.empty(n, dtype=np.int64)
+    log_low = np.log((1 + 1 / alpha) / 2)
+    log_a = np.log(alpha)
+    k_min = np.int64(2 ** 62)
+    k_max = -np.int64(2 ** 62)
+    for j in range(n):
+        fwd[j] = spots[j] * growth - div
+        if fwd[j] <= 0:
+            raise ValueError("Le prix forward doit être positif, le dividende est trop élevé.")
+        k[j] = np.int64(np.floor((np.log(fwd[j] / trunk_next) - log_low) / log_a))
+        grow = 1 if p_total[j] >= seuil else 0
+        k_min = min(k_min, k[j] - grow)
+        k_max = max(k_max, k[j] + grow)
+    return fwd, k, k_min, k_max
+
+
+@njit(cache=True, nogil=True)
+def grid_kernel(trunk_next, alpha, k_min, size):
+    """
+    Prix des nœuds de la colonne suivante (mêmes opérations que next_column_kernel).
+    """
+    spots_next = np.empty(size)
+    for j in range(size):
+        spots_next[j] = trunk_next * alpha ** np.float64(k_min + j)
+    return spots_next
+
+
+@njit(cache=True, nogil=True)
+def transition_chunk_kernel(spots, p_total, fwd, k, spots_next, k_min, alpha, var_factor, seuil):
+    """
+    Seconde passe de next_column_kernel sur un bloc de nœuds : probabilités de transition et probabilités
+    totales apportées par le bloc à la colonne suivante, sur la plage [low, low + taille) de ses indices.
+    """
+    n = spots.shape[0]
+    size = spots_next.shape[0]
+    denominator = (1 - alpha) * (alpha ** -2 - 1)
+    low = size
+    high = 0
+    for j in range(n):
+        low = min(low, k[j] - k_min - 1)
+        high = max(high, k[j] - k_min + 1)
+    low = max(low, 0)
+    high = min(high, size - 1)
+
+    pup = np.zeros(n)
+    pmid = np.ones(n)
+    pdown = np.zeros(n)
+    mid = np.empty(n, dtype=np.int64)
+    p_part = np.zeros(high - low + 1)
+    for j in range(n):
+        mid[j] = k[j] - k_min
+        if p_total[j] > seuil:
+            s_mid = spots_next[mid[j]]
+            ratio = fwd[j] / s_mid
+            var = spots[j] ** 2 * var_factor
+            pdown[j] = ((var + fwd[j] ** 2) / s_mid ** 2 - 1 - (alpha + 1) * (ratio - 1)) / denominator
+            pup[j] = (ratio - 1 - pdown[j] * (1 / alpha - 1)) / (alpha - 1)
+            pmid[j] = 1 - pdown[j] - pup[j]
+            if pdown[j] < 0 or pup[j] < 0 or pmid[j] < 0:
+                raise ValueError("Les probabilités de transition ne peuvent pas être négatives, il y'a un problème.")
+            p_part[mid[j] + 1 - low] += pup[j] * p_total[j]
+            p_part[mid[j] - 1 - low] += pdown[j] * p_total[j]
+        p_part[mid[j] - low] += pmid[j] * p_total[j]
+    return pup, pmid, pdown, mid, p_part, low
+
+
+class NumbaLattice(Lattice):
+    """
+    Lattice dont la construction d'une colonne et l'induction backward passent par des noyaux compilés
+    par Numba (compilation mise en cache sur disque, GIL relâché pour les threads). Sans Numba, les mêmes
+    noyaux s'exécutent en Python pur.
+    """
+
+    def next_column(self, i: int, spots: np.ndarray, p_total: np.ndarray, trunk: int):
+        pup, pmid, pdown, mid, spots_next, p_next, trunk_next, k_min, k_max = next_column_kernel(
+            spots, p_total, int(trunk), float(self.model.alphas[i]), float(self.model.growths[i]),
+            float(self.model.var_factors[i]),
+            float(self.market.div) if self.have_div(i) else 0.0, float(self.seuil))
+        return (pup, pmid, pdown, mid), spots_next, p_next, int(trunk_next), int(k_min), int(k_max)
+
+    def rollback(self, i: int, values: np.ndarray, strikes: np.ndarray, is_call: np.ndarray,
+                 is_american: np.ndarray) -> np.ndarray:
+        pup, pmid, pdown, mid = self.column_transitions(i)
+        return rollback_kernel(np.ascontiguousarray(values), pup, pmid, pdown, mid, self.column_spots(i),
+                               float(self.df(i)), np.ascontiguousarray(strikes), np.ascontiguousarray(is_call),
+                               np.ascontiguousarray(is_american))
+
+
+class NumbaRollingLattice(NumbaLattice, RollingLattice):
+    """
+    Variante « prix seul » (mémoire O(N)) du NumbaLattice.
+    """
+
+
+class ThreadedLattice(NumbaLattice):
+    """
+    NumbaLattice dont chaque colonne est découpée en blocs de nœuds traités par un pool de threads, pour
+    les arbres très profonds (les noyaux compilés relâchent le GIL). La construction d'une colonne se fait
+    en deux passes par bloc (crans puis probabilités), l'induction backward bloc par bloc. Les colonnes de
+    moins de 2 * min_chunk nœuds restent traitées sur un seul thread.
+
+    Les prix sont identiques à ceux du NumbaLattice aux erreurs d'arrondi près (ordre de sommation des
+    probabilités totales).
+    """
+
+    def __init__(self, market, model, seuil: float = 0, smooth: bool = False, threads: Optional[int] = None,
+                 min_chunk: int = 8192):
+        """
+        Initialise le lattice sans le construire.
+
+        Args:
+            market: Objet contenant les données du marché.
+            model: Modèle utilisé pour la tarification.
+            seuil (float): Seuil de probabilité totale utilisé pour le pruning.
+            smooth (bool): Vrai pour remplacer le dernier pas par la valeur Black-Scholes (méthode BBS).
+            threads (Optional[int]): Nombre de threads (nombre de cœurs par défaut).
+            min_chunk (int): Nombre minimal de nœuds par bloc.
+        """
+        super().__init__(market, model, seuil, smooth)
+        self.threads = threads or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+        self.executor = None
+
+    @contextmanager
+    def thread_pool(self):
+        """
+        Ouvre le pool de threads pour la durée d'une construction ou d'une valorisation (réutilisé si déjà ouvert).
+        """
+        if self.executor is not None or self.threads == 1:
+            yield
+            return
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            self.executor = executor
+            try:
+                yield
+            finally:
+                self.executor = None
+
+    def chunks(self, n: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Découpe une colonne de n nœuds en blocs, ou renvoie None sous le seuil de parallélisation.
+        """
+        nb_chunks = min(self.threads, n // self.min_chunk)
+        if self.executor is None or nb_chunks < 2:
+            return None
+        bounds = np.linspace(0, n, nb_chunks + 1).astype(np.int64)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def build(self):
+        with self.thread_pool():
+            return super().build()
+
+    def price(self, strikes, is_call=True, is_american=False) -> np.ndarray:
+        with self.thread_pool():
+            return super().price(strikes, is_call, is_american)
+
+    def next_column(self, i: int, spots: np.ndarray, p_total: np.ndarray, trunk: int):
+        chunks = self.chunks(len(spots))
+        if chunks is None:
+            return super().next_column(i, spots, p_total, trunk)
+
+        alpha = float(self.model.alphas[i])
+        seuil = float(self.seuil)
+        growth = float(self.model.growths[i])
+        div = float(self.market.div) if self.have_div(i) else 0.0
+        trunk_next = spots[trunk] * growth - div
+        forwards = list(self.executor.map(
+            lambda bounds: forward_chunk_kernel(spots[bounds[0]:bounds[1]], p_total[bounds[0]:bounds[1]], growth,
+                                                div, trunk_next, alpha, seuil), chunks))
+        k_min = int(min(chunk[2] for chunk in forwards))
+        k_max = int(max(chunk[3] for chunk in forwards))
+        spots_next = grid_kernel(trunk_next, alpha, k_min, k_max - k_min + 1)
+
+        var_factor = float(self.model.var_factors[i])
+        transitions = list(self.executor.map(
+            lambda job: transition_chunk_kernel(spots[job[0][0]:job[0][1]], p_total[job[0][0]:job[0][1]], job[1][0],
+                                                job[1][1], spots_next, k_min, alpha, var_factor, seuil),
+            zip(chunks, forwards)))
+        p_next = np.zeros(len(spots_next))
+        for _, _, _, _, p_part, low in transitions:
+            p_next[low:low + len(p_part)] += p_part
+        pup, pmid, pdown, mid = (np.concatenate([chunk[field] for chunk in transitions]) for field in range(4))
+        return (pup, pmid, pdown, mid), spots_next, p_next, -k_min, k_min, k_max
+
+    def rollback(self, i: int, values: np.ndarray, strikes: np.ndarray, is_call: np.ndarray,
+                 is_american: np.ndarray) -> np.ndarray:
+        chunks = self.chunks(self.column_size(i))
+        if chunks is None:
+            return super().rollback(i, values, strikes, is_call, is_american)
+
+        pup, pmid, pdown, mid = self.column_transitions(i)
+        values = np.ascontiguousarray(values)
+        spots = self.column_spots(i)
+        strikes, is_call, is_american = (np.ascontiguousarray(x) for x in (strikes, is_call, is_american))
+        df = float(self.df(i))
+        return np.concatenate(list(self.executor.map(
+            lambda bounds: rollback_kernel(values, pup[bounds[0]:bounds[1]], pmid[bounds[0]:bounds[1]],
+                                           pdown[bounds[0]:bounds[1]], mid[bounds[0]:bounds[1]],
+                                           spots[bounds[0]:bounds[1]], df, strikes, is_call, is_american), chunks)))
+
+
+class ThreadedRollingLattice(ThreadedLattice, NumbaRollingLattice):
+    """
+    Variante « prix seul » (mémoire O(N)) du ThreadedLattice : les transitions recalculées pendant
+    l'induction backward sont elles aussi réparties par blocs sur le pool de threads.
+    """
+
+    def column_transitions(self, i: int):
+        chunks = self.chunks(self.column_size(i))
+        if chunks is None:
+            return super().column_transitions(i)
+
+        spots = self.column_spots(i)
+
+        # Nœuds au-dessus du seuil : probabilité 1, les autres 0, comparées au seuil 0.5 dans les noyaux
+        full = np.zeros(len(spots))
+        runs = self.full_runs[self.run_offsets[i]:self.run_offsets[i + 1]]
+        for start, end in zip(runs[::2], runs[1::2]):
+            full[start:end] = 1.0
+        alpha = float(self.model.alphas[i])
+        growth = float(self.model.growths[i])
+        div = float(self.market.div) if self.have_div(i) else 0.0
+        var_factor = float(self.model.var_factors[i])
+        trunk_next, k_min = self.trunk_spots[i + 1], int(self.k_range[i + 1, 0])
+        spots_next = self.column_spots(i + 1)
+
+        def transitions(bounds: Tuple[int, int]):
+            chunk_spots, chunk_full = spots[bounds[0]:bounds[1]], full[bounds[0]:bounds[1]]
+            fwd, k, _, _ = forward_chunk_kernel(chunk_spots, chunk_full, growth, div, trunk_next, alpha, 0.5)
+            return transition_chunk_kernel(chunk_spots, chunk_full, fwd, k, spots_next, k_min, alpha, var_factor,
+                                           0.5)[:4]
+
+        results = list(self.executor.map(transitions, chunks))
+        return tuple(np.concatenate([chunk[field] for chunk in results]) for field in range(4))
@@ -0,0 +1,272 @@
+import csv
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from Market import Market
+from Option import Option
+from Model import Model
+from Lattice import Lattice
+from BlackScholes import BlackScholes
+
+# Colonnes du portefeuille (une valeur par option)
+BOOK_COLUMNS = ('strike', 'maturity', 'is_call', 'is_american', 's0', 'r', 'vol', 'div', 'div_time')
+# Colonnes qui définissent un arbre : les options qui les partagent sont valorisées sur le même arbre
+MARKET_COLUMNS = ('maturity', 's0', 'r', 'vol', 'div', 'div_time')
+
+
+def to_days(values: Iterable[Any]) -> np.ndarray:
+    """
+    Convertit des dates (datetime, date ou texte 'AAAA-MM-JJ', vides acceptés) en datetime64 au jour près,
+    en une seule conversion NumPy.
+    """
+    return np.array([value if value not in ('', None) else None for value in values], dtype='datetime64[D]')
+
+
+class OptionBook:
+    """
+    Portefeuille d'options stocké en colonnes NumPy (une colonne par caractéristique), pour valoriser des
+    lots d'options sans créer d'objets Option, Market et Model par contrat.
+
+    Les maturités et les dates de dividende sont converties une seule fois en fractions d'année depuis la
+    date de pricing (jours / 365, comme Model). Un découpage par tranche renvoie un portefeuille dont les
+    colonnes sont des vues (aucune copie).
+
+    Attributs:
+        strike (np.ndarray): Prix d'exercice.
+        maturity (np.ndarray): Maturité en années.
+        is_call, is_american (np.ndarray): Vrai pour un Call, vrai pour un exercice américain.
+        s0, r, vol (np.ndarray): Spot, taux sans risque et volatilité.
+        div (np.ndarray): Dividende discret (0 sans dividende).
+        div_time (np.ndarray): Date de détachement en années (NaN sans date).
+        pricing_date (datetime): Date de pricing commune.
+    """
+
+    def __init__(self, pricing_date: datetime, strike, maturity, is_call, is_american, s0, r, vol, div=0.0,
+                 div_time=np.nan):
+        """
+        Initialise le portefeuille à partir de colonnes déjà converties (les scalaires sont diffusés).
+
+        Args:
+            pricing_date (datetime): Date de pricing commune.
+            strike, maturity, is_call, is_american, s0, r, vol, div, div_time: Colonnes du portefeuille
+                (voir les attributs).
+        """
+        self.pricing_date = pricing_date
+        columns = {'strike': strike, 'maturity': maturity, 'is_call': is_call, 'is_american': is_american,
+                   's0': s0, 'r': r, 'vol': vol, 'div': div, 'div_time': div_time}
+        size = max(np.size(value) for value in columns.values())
+        for name, value in columns.items():
+            dtype = bool if name in ('is_call', 'is_american') else float
+            array = np.asarray(value, dtype=dtype)
+            if array.ndim == 0:
+                array = np.full(size, array, dtype=dtype)
+            if array.shape != (size,):
+                raise ValueError(f"La colonne {name} doit avoir une valeur par option.")
+            setattr(self, name, array)
+        if np.any(self.maturity <= 0):
+            raise ValueError("Les maturités doivent être postérieures à la date de pricing.")
+
+    def __len__(self) -> int:
+        return len(self.strike)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> 'OptionBook':
+        """
+        Renvoie une partie du portefeuille : vues des colonnes pour une tranche, copies pour un tableau
+        d'indices ou un masque.
+        """
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 if index != -1 else None)
+        return OptionBook(self.pricing_date, **{name: getattr(self, name)[index] for name in BOOK_COLUMNS})
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]],
+                     pricing_date: Optional[Union[datetime, str]] = None) -> 'OptionBook':
+        """
+        Construit le portefeuille à partir de colonnes brutes, avec les clés de ExcelInterface.read_data
+        ('option_type', 'type', 'strike', 'maturity', 's0', 'r', 'vol', 'div', 'div_date' et éventuellement
+        'pricing_date'). Chaque colonne est convertie en un seul appel NumPy.
+
+        Args:
+            columns (Dict[str, Sequence[Any]]): Valeurs de chaque colonne.
+            pricing_date (Optional[Union[datetime, str]]): Date de pricing, lue dans la colonne 'pricing_date'
+                si absente.
+
+        Returns:
+            OptionBook: Le portefeuille.
+        """
+        if pricing_date is None:
+            dates = np.unique(to_days(columns['pricing_date']))
+            if len(dates) != 1:
+                raise ValueError("Le portefeuille doit avoir une seule date de pricing.")
+            pricing_date = dates[0].astype(datetime)
+        elif isinstance(pricing_date, str):
+            pricing_date = datetime.strptime(pricing_date, '%Y-%m-%d')
+        pricing_date = datetime(pricing_date.year, pricing_date.month, pricing_date.day)
+        start = np.datetime64(pricing_date, 'D')
+
+        size = len(columns['strike'])
+        div = np.asarray([value if value not in ('', None) else 0 for value in columns.get('div', [0] * size)],
+                         dtype=float)
+        div_days = to_days(columns.get('div_date', [None] * size)) - start
+        return cls(pricing_date,
+                   strike=np.asarray(columns['strike'], dtype=float),
+                   maturity=(to_days(columns['maturity']) - start).astype(float) / 365,
+                   is_call=np.asarray(columns['option_type']) == "Call",
+                   is_american=np.asarray(columns['type']) == "American",
+                   s0=np.asarray(columns['s0'], dtype=float),
+                   r=np.asarray(columns['r'], dtype=float),
+                   vol=np.asarray(columns['vol'], dtype=float),
+                   div=div,
+                   div_time=np.where(np.isnat(div_days), np.nan, div_days.astype(float)) / 365)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]],
+                     pricing_date: Optional[Union[datetime, str]] = None) -> 'OptionBook':
+        """
+        Construit le portefeuille à partir de paramètres par option (format de ExcelInterface.read_data).
+        """
+        keys = ('option_type', 'type', 'strike', 'maturity', 's0', 'r', 'vol', 'div', 'div_date', 'pricing_date')
+        return cls.from_columns({key: [record.get(key) for record in records] for key in keys}, pricing_date)
+
+    @classmethod
+    def from_csv(cls, path: str, pricing_date: Optional[Union[datetime, str]] = None,
+                 delimiter: str = ',') -> 'OptionBook':
+        """
+        Charge le portefeuille depuis un fichier CSV dont la première ligne nomme les colonnes (clés de
+        ExcelInterface.read_data, dates au format 'AAAA-MM-JJ').
+
+        Args:
+            path (str): Chemin du fichier.
+            pricing_date (Optional[Union[datetime, str]]): Date de pricing (colonne 'pricing_date' sinon).
+            delimiter (str): Séparateur des colonnes.
+
+        Returns:
+            OptionBook: Le portefeuille.
+        """
+        with open(path, newline='') as file:
+            rows = csv.reader(file, delimiter=delimiter)
+            header = [name.strip() for name in next(rows)]
+            values = list(zip(*rows))
+        return cls.from_columns(dict(zip(header, values)), pricing_date)
+
+    @classmethod
+    def from_excel(cls, workbook_path: str, sheet_name: str, cell_range: str,
+                   pricing_date: Optional[Union[datetime, str]] = None) -> 'OptionBook':
+        """
+        Charge le portefeuille depuis une plage d'un classeur Excel (première ligne : noms des colonnes),
+        lue en un seul parcours avec openpyxl sur les valeurs enregistrées, sans Excel ouvert.
+
+        Args:
+            workbook_path (str): Chemin d'accès au fichier Excel.
+            sheet_name (str): Nom de la feuille.
+            cell_range (str): Plage à lire, par exemple 'A1:J500'.
+            pricing_date (Optional[Union[datetime, str]]): Date de pricing (colonne 'pricing_date' sinon).
+
+        Returns:
+            OptionBook: Le portefeuille.
+        """
+        import openpyxl  # Dépendance nécessaire uniquement hors Excel
+        from openpyxl.utils import range_boundaries
+        min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        wb = openpyxl.load_workbook(workbook_path, data_only=True, read_only=True)
+        try:
+            rows = [row for row in wb[sheet_name].iter_rows(min_row=min_row, max_row=max_row, min_col=min_col,
+                                                            max_col=max_col, values_only=True)
+                    if any(value is not None for value in row)]
+        finally:
+            wb.close()
+        header = [str(name).strip() for name in rows[0]]
+        return cls.from_columns(dict(zip(header, zip(*rows[1:]))), pricing_date)
+
+    def has_dividend(self) -> np.ndarray:
+        """
+        Options dont le dividende est détaché avant maturité (même règle que Tree.have_div).
+        """
+        with np.errstate(invalid='ignore'):
+            return (self.div != 0) & (self.div_time > 0) & (self.div_time <= self.maturity)
+
+    def group_by(self, columns: Sequence[str] = MARKET_COLUMNS) -> List[Tuple[Tuple[float, ...], np.ndarray]]:
+        """
+        Regroupe les options qui partagent les mêmes valeurs de colonnes (par défaut maturité et marché,
+        c'est-à-dire le même arbre).
+
+        Args:
+            columns (Sequence[str]): Colonnes de regroupement.
+
+        Returns:
+            List[Tuple[Tuple[float, ...], np.ndarray]]: Valeurs communes et indices des options de chaque groupe.
+        """
+        if len(self) == 0:
+            return []
+        # NaN (pas de date de dividende) remplacé pour que np.unique le traite comme une valeur ordinaire
+        keys = np.column_stack([np.nan_to_num(getattr(self, name).astype(float), nan=-1.0) for name in columns])
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse.ravel(), minlength=len(unique)))[:-1])
+        return [(tuple(float(value) for value in key), indices) for key, indices in zip(unique, groups)]
+
+    def model(self, maturity: float, market: Market, nbsteps: int) -> Model:
+        """
+        Construit le modèle d'un groupe d'options (un seul objet par arbre).
+        """
+        option = Option("Call", "European", 0, self.pricing_date + timedelta(days=int(round(maturity * 365))))
+        return Model(self.pricing_date, nbsteps, option, market)
+
+    def price_black_scholes(self) -> np.ndarray:
+        """
+        Valorise tout le portefeuille par la formule de Black-Scholes en un seul appel vectorisé, avec la même
+        convention que BlackScholes et Convergence.run_black_scholes : le dividende discret est ignoré.
+
+        Returns:
+            np.ndarray: Prix des options.
+        """
+        return BlackScholes.price_array(self.s0, self.strike, self.r, self.vol, self.maturity, self.is_call)
+
+    def price_black_scholes_escrowed(self) -> np.ndarray:
+        """
+        Valorise tout le portefeuille par la formule de Black-Scholes appliquée au spot diminué du dividende
+        actualisé (modèle à dividende escompté), pour les options dont le dividende est détaché avant maturité.
+
+        Returns:
+            np.ndarray: Prix des options.
+        """
+        spots = np.where(self.has_dividend(), self.s0 - self.div * np.exp(-self.r * np.nan_to_num(self.div_time)),
+                         self.s0)
+        return BlackScholes.price_array(spots, self.strike, self.r, self.vol, self.maturity, self.is_call)
+
+    def price_lattice(self, nbsteps: int, lattice_class: type = Lattice, seuil: float = 0,
+                      smooth: bool = False) -> np.ndarray:
+        """
+        Valorise tout le portefeuille sur des arbres trinomiaux en tableaux, un arbre par groupe d'options
+        partageant maturité et marché, chaque groupe en une seule induction multi-payoff.
+
+        Sans dividende, l'arbre est invariant d'échelle en s0 : les options de même maturité, taux et volatilité
+        partagent un arbre construit au spot 1, valorisé aux strikes K / s0 puis multiplié par s0.
+
+        Args:
+            nbsteps (int): Nombre de pas de chaque arbre.
+            lattice_class (type): Classe d'arbre (Lattice, RollingLattice, NumbaLattice...).
+            seuil (float): Seuil de probabilité totale utilisé pour le pruning.
+            smooth (bool): Vrai pour remplacer le dernier pas par la valeur Black-Scholes (méthode BBS).
+
+        Returns:
+            np.ndarray: Prix des options.
+        """
+        prices = np.empty(len(self))
+        with_div = self.has_dividend()
+
+        plain = np.flatnonzero(~with_div)
+        for (maturity, r, vol), indices in self[plain].group_by(('maturity', 'r', 'vol')):
+            rows = plain[indices]
+            market = Market(r, vol, 1.0, 0, self.pricing_date)
+            lattice = lattice_class(market, self.model(maturity, market, nbsteps), seuil, smooth)
+            prices[rows] = self.s0[rows] * lattice.price(self.strike[rows] / self.s0[rows], self.is_call[rows],
+                                                         self.is_american[rows])
+
+        dividend = np.flatnonzero(with_div)
+        for (maturity, s0, r, vol, div, div_time), indices in self[dividend].group_by():
+            rows = dividend[indices]
+            market = Market(r, vol, s0, div, self.pricing_date + timedelta(days=int(round(div_time * 365))))
+            lattice = lattice_class(market, self.model(maturity, market, nbsteps), seuil, smooth)
+            prices[rows] = lattice.price(self.strike[rows], self.is_call[rows], self.is_american[rows])
+        return prices
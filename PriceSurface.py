@@ -0,0 +1,368 @@
+import json
+import argparse
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """
+        Remplace numba.njit quand Numba n'est pas installé : les noyaux d'interpolation restent du Python pur.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+# Grandeurs stockées, par unité de strike : Prix / K, Delta, Gamma * K, Theta / K (par jour), Vega / K
+SURFACE_QUANTITIES = ("Price", "Delta", "Gamma", "Theta", "Vega")
+SURFACE_FORMAT_VERSION = 1
+DATE_KEYS = ('pricing_date', 'maturity', 'div_date')
+
+
+@njit(cache=True, nogil=True)
+def hermite_slope(h_left, h_right, d_left, d_right, monotone):
+    """
+    Pente d'un nœud intérieur : dérivée de la parabole des trois points (cubique) ou moyenne harmonique
+    pondérée des pentes voisines, nulle aux extrema (monotone, Fritsch-Carlson).
+    """
+    if monotone:
+        if d_left * d_right <= 0:
+            return 0.0
+        w_left = 2 * h_right + h_left
+        w_right = h_right + 2 * h_left
+        return (w_left + w_right) / (w_left / d_left + w_right / d_right)
+    return (d_left * h_right + d_right * h_left) / (h_left + h_right)
+
+
+@njit(cache=True, nogil=True)
+def hermite_1d(axis, j, y0, y1, y2, y3, x, monotone):
+    """
+    Interpolation de Hermite cubique sur la maille [axis[j], axis[j + 1]] à partir des valeurs aux nœuds
+    j - 1 à j + 2 (pente de la corde aux bords de la grille).
+    """
+    n = axis.shape[0]
+    h = axis[j + 1] - axis[j]
+    d = (y2 - y1) / h
+    slope_left = d
+    if j >= 1:
+        h_left = axis[j] - axis[j - 1]
+        slope_left = hermite_slope(h_left, h, (y1 - y0) / h_left, d, monotone)
+    slope_right = d
+    if j + 2 <= n - 1:
+        h_right = axis[j + 2] - axis[j + 1]
+        slope_right = hermite_slope(h, h_right, d, (y3 - y2) / h_right, monotone)
+    t = (x - axis[j]) / h
+    t2 = t * t
+    t3 = t2 * t
+    return ((2 * t3 - 3 * t2 + 1) * y1 + (t3 - 2 * t2 + t) * h * slope_left +
+            (3 * t2 - 2 * t3) * y2 + (t3 - t2) * h * slope_right)
+
+
+@njit(cache=True, nogil=True)
+def surface_kernel(axis_0, axis_1, axis_2, values, queries, monotone):
+    """
+    Interpolation tricubique séparable (Hermite sur un voisinage 4 x 4 x 4) de chaque grandeur de la surface.
+
+    Args:
+        axis_0, axis_1, axis_2 (np.ndarray): Axes de la grille (moneyness, maturité résiduelle, volatilité).
+        values (np.ndarray): Grandeurs de forme (grandeurs, axe 0, axe 1, axe 2).
+        queries (np.ndarray): Points de forme (points, 3), dans la grille.
+        monotone (bool): Pentes monotones (Fritsch-Carlson) plutôt que cubiques.
+
+    Returns:
+        np.ndarray: Valeurs interpolées de forme (points, grandeurs).
+    """
+    nb_queries = queries.shape[0]
+    nb_quantities = values.shape[0]
+    out = np.empty((nb_queries, nb_quantities))
+    axes = (axis_0, axis_1, axis_2)
+    cells = np.empty(3, dtype=np.int64)
+    stencil = np.empty((3, 4), dtype=np.int64)
+    plane = np.empty((4, 4))
+    line = np.empty(4)
+    for p in range(nb_queries):
+        for a in range(3):
+            axis = axes[a]
+            n = axis.shape[0]
+            j = np.searchsorted(axis, queries[p, a], side='right') - 1
+            j = min(max(j, 0), n - 2)
+            cells[a] = j
+            for s in range(4):
+                stencil[a, s] = min(max(j - 1 + s, 0), n - 1)
+        for q in range(nb_quantities):
+            for u in range(4):
+                for v in range(4):
+                    i0, i1 = stencil[0, u], stencil[1, v]
+                    plane[u, v] = hermite_1d(axis_2, cells[2], values[q, i0, i1, stencil[2, 0]],
+                                             values[q, i0, i1, stencil[2, 1]], values[q, i0, i1, stencil[2, 2]],
+                                             values[q, i0, i1, stencil[2, 3]], queries[p, 2], monotone)
+                line[u] = hermite_1d(axis_1, cells[1], plane[u, 0], plane[u, 1], plane[u, 2], plane[u, 3],
+                                     queries[p, 1], monotone)
+            out[p, q] = hermite_1d(axis_0, cells[0], line[0], line[1], line[2], line[3], queries[p, 0], monotone)
+    return out
+
+
+def to_datetime(date) -> Optional[datetime]:
+    """
+    Convertit une date lue dans les paramètres (datetime, texte 'AAAA-MM-JJ' ou ISO).
+    """
+    if date is None or isinstance(date, datetime):
+        return date
+    return datetime.fromisoformat(date)
+
+
+class PriceSurface:
+    """
+    Surface précalculée des prix et Grecques trinomiaux sur une grille (spot / strike, maturité résiduelle,
+    volatilité), pour un taux, une maturité et un dividende donnés, servie par interpolation tricubique
+    (cubique ou monotone) en quelques microsecondes au lieu d'une construction d'arbre.
+
+    Les grandeurs sont stockées par unité de strike. Sans dividende, la surface sert tous les strikes ;
+    avec un dividende discret (montant fixe), elle n'est valable que pour le strike de construction. La
+    maturité résiduelle est comptée en jours jusqu'à la maturité de l'option (la date de dividende reste fixe).
+
+    Borne d'erreur : validate compare la surface à Convergence.run_lattice (même nombre de pas) en des
+    points hors grille et mémorise l'erreur maximale (error_bound), enregistrée avec la surface. Elle
+    cumule l'erreur d'interpolation (en h⁴ pour la cubique, plus grande près de la monnaie aux maturités
+    courtes où le payoff n'est pas dérivable) et l'oscillation du prix de l'arbre avec la position du strike.
+    """
+
+    def __init__(self, data: Dict[str, Any], moneyness: Sequence[float], days: Sequence[int],
+                 vols: Sequence[float], monotone: bool = False, backend: Optional[str] = None):
+        """
+        Initialise la surface sans la construire.
+
+        Args:
+            data (Dict[str, Any]): Paramètres de pricing (format de ExcelInterface.read_data).
+            moneyness (Sequence[float]): Grille des rapports spot / strike.
+            days (Sequence[int]): Grille des maturités résiduelles, en jours.
+            vols (Sequence[float]): Grille des volatilités.
+            monotone (bool): Interpolation monotone plutôt que cubique.
+            backend (Optional[str]): Backend des arbres ("numpy", "numba" ou "threaded", celui de Convergence
+                par défaut).
+        """
+        self.data = dict(data, print_arbre=False)
+        self.moneyness = np.asarray(moneyness, dtype=float)
+        self.days = np.asarray(days, dtype=np.int64)
+        self.vols = np.asarray(vols, dtype=float)
+        for axis in (self.moneyness, self.days, self.vols):
+            if len(axis) < 2 or np.any(np.diff(axis) <= 0):
+                raise ValueError("Chaque axe de la surface doit compter au moins 2 points strictement croissants.")
+        if self.days[0] < 1 or self.moneyness[0] <= 0:
+            raise ValueError("Les maturités résiduelles et les moneyness doivent être positives.")
+        # Le prix saute à la date de détachement : l'interpolation ne doit pas la traverser
+        div_days = self.div_days()
+        if div_days is not None and self.days[0] <= div_days < self.days[-1]:
+            raise ValueError("La grille des maturités résiduelles ne doit pas contenir la date de dividende : "
+                             "construire une surface de chaque côté.")
+        self.taus = self.days / 365
+        self.strike = float(data['strike'])
+        self.monotone = monotone
+        self.backend = backend
+        self.values = None
+        self.error_bound = None
+
+    def div_days(self) -> Optional[int]:
+        """
+        Renvoie la maturité résiduelle (en jours) à la date de dividende, ou None sans dividende discret.
+        """
+        if not self.data.get('div') or self.data.get('div_date') is None:
+            return None
+        return (to_datetime(self.data['maturity']) - to_datetime(self.data['div_date'])).days
+
+    def is_homogeneous(self) -> bool:
+        """
+        Indique si la surface sert tous les strikes (pas de dividende discret).
+        """
+        return not self.data.get('div')
+
+    def build(self) -> 'PriceSurface':
+        """
+        Construit la surface : un arbre par couple (maturité résiduelle, volatilité), toute la gamme de
+        moneyness étant valorisée par Lattice.greeks_spot_ladder. Le Vega est la dérivée de la surface des
+        prix selon la volatilité.
+
+        Returns:
+            PriceSurface: La surface construite (self).
+        """
+        maturity = to_datetime(self.data['maturity'])
+        is_call = self.data['option_type'] == "Call"
+        is_american = self.data['type'] == "American"
+        values = np.empty((len(SURFACE_QUANTITIES), len(self.moneyness), len(self.days), len(self.vols)))
+        for t, days in enumerate(self.days):
+            for v, vol in enumerate(self.vols):
+                convergence = Convergence(DataInterface(dict(self.data, s0=self.strike, vol=float(vol),
+                                                             pricing_date=maturity - timedelta(days=int(days)))))
+                if self.backend is not None:
+                    convergence.backend = self.backend
+                market, option, model = convergence.create_objects()
+                lattice = convergence.create_lattice(market, model)
+                ladder = lattice.greeks_spot_ladder(self.moneyness * self.strike, self.strike, is_call, is_american)
+                values[0, :, t, v] = ladder["Price"] / self.strike
+                values[1, :, t, v] = ladder["Delta"]
+                values[2, :, t, v] = ladder["Gamma"] * self.strike
+                values[3, :, t, v] = ladder["Theta"] / self.strike
+        values[4] = np.gradient(values[0], self.vols, axis=2, edge_order=2)
+        self.values = values
+        return self
+
+    def quote_array(self, spots: Sequence[float], taus: Sequence[float], vols: Sequence[float],
+                    strike: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Interpole prix et Grecques pour plusieurs points.
+
+        Args:
+            spots (Sequence[float]): Prix du sous-jacent.
+            taus (Sequence[float]): Maturités résiduelles en années.
+            vols (Sequence[float]): Volatilités.
+            strike (Optional[float]): Strike (celui de construction par défaut).
+
+        Returns:
+            Dict[str, np.ndarray]: Prix, Delta, Gamma, Theta (par jour) et Vega de chaque point.
+        """
+        strike = self.check_strike(strike)
+        queries = np.column_stack(np.broadcast_arrays(np.asarray(spots, dtype=float) / strike,
+                                                      np.asarray(taus, dtype=float), np.asarray(vols, dtype=float)))
+        for a, axis in enumerate((self.moneyness, self.taus, self.vols)):
+            if np.any((queries[:, a] < axis[0]) | (queries[:, a] > axis[-1])):
+                raise ValueError("Point hors de la grille de la surface : pas d'extrapolation.")
+
+        out = surface_kernel(self.moneyness, self.taus, self.vols, self.values, queries, self.monotone)
+        scales = (strike, 1.0, 1 / strike, strike, strike)
+        return {name: out[:, q] * scale for q, (name, scale) in enumerate(zip(SURFACE_QUANTITIES, scales))}
+
+    def check_strike(self, strike: Optional[float]) -> float:
+        """
+        Vérifie que la surface est construite et valable pour le strike demandé, et renvoie ce strike.
+        """
+        if self.values is None:
+            raise ValueError("La surface doit être construite (build) ou chargée (load) avant d'être interrogée.")
+        strike = self.strike if strike is None else float(strike)
+        if strike != self.strike and not self.is_homogeneous():
+            raise ValueError("Avec un dividende discret, la surface n'est valable que pour son strike de construction.")
+        return strike
+
+    def quote(self, spot: float, tau: float, vol: float, strike: Optional[float] = None) -> Dict[str, float]:
+        """
+        Interpole prix et Grecques en un point.
+
+        Args:
+            spot (float): Prix du sous-jacent.
+            tau (float): Maturité résiduelle en années.
+            vol (float): Volatilité.
+            strike (Optional[float]): Strike (celui de construction par défaut).
+
+        Returns:
+            Dict[str, float]: Prix, Delta, Gamma, Theta (par jour) et Vega.
+        """
+        # Chemin scalaire sans diffusion de tableaux : la latence est celle du noyau compilé
+        strike = self.check_strike(strike)
+        x = spot / strike
+        if not (self.moneyness[0] <= x <= self.moneyness[-1] and self.taus[0] <= tau <= self.taus[-1] and
+                self.vols[0] <= vol <= self.vols[-1]):
+            raise ValueError("Point hors de la grille de la surface : pas d'extrapolation.")
+        out = surface_kernel(self.moneyness, self.taus, self.vols, self.values, np.array([[x, tau, vol]]),
+                             self.monotone)[0]
+        return {"Price": float(out[0] * strike), "Delta": float(out[1]), "Gamma": float(out[2] / strike),
+                "Theta": float(out[3] * strike), "Vega": float(out[4] * strike)}
+
+    def validate(self, nb_samples: int = 50, seed: Optional[int] = None) -> Dict[str, float]:
+        """
+        Compare la surface à Convergence.run_lattice (même backend que build) en des points tirés au hasard dans la grille (maturités
+        résiduelles en jours entiers, comme le modèle) et mémorise l'erreur maximale comme borne d'erreur.
+
+        Args:
+            nb_samples (int): Nombre de points de contrôle.
+            seed (Optional[int]): Graine du générateur aléatoire.
+
+        Returns:
+            Dict[str, float]: Erreurs maximale et quadratique moyenne sur le prix.
+        """
+        rng = np.random.default_rng(seed)
+        maturity = to_datetime(self.data['maturity'])
+        errors = np.empty(nb_samples)
+        for j in range(nb_samples):
+            x = rng.uniform(self.moneyness[0], self.moneyness[-1])
+            days = int(rng.integers(self.days[0], self.days[-1] + 1))
+            vol = rng.uniform(self.vols[0], self.vols[-1])
+            convergence = Convergence(DataInterface(dict(self.data, s0=x * self.strike, vol=vol,
+                                                         pricing_date=maturity - timedelta(days=days))))
+            if self.backend is not None:
+                convergence.backend = self.backend
+            errors[j] = self.quote(x * self.strike, days / 365, vol)["Price"] - convergence.run_lattice()
+        self.error_bound = float(np.max(np.abs(errors)))
+        return {"MaxError": self.error_bound, "RMSE": float(np.sqrt(np.mean(errors ** 2))), "Samples": nb_samples}
+
+    def save(self, path: str):
+        """
+        Enregistre la surface dans un fichier .npz compressé (grandeurs en float32) avec un en-tête versionné.
+
+        Args:
+            path (str): Chemin du fichier.
+        """
+        if self.values is None:
+            raise ValueError("La surface doit être construite avant d'être enregistrée.")
+        data = {key: value.isoformat() if isinstance(value, datetime) else value for key, value in self.data.items()}
+        header = {'version': SURFACE_FORMAT_VERSION, 'data': data, 'monotone': self.monotone,
+                  'error_bound': self.error_bound}
+        np.savez_compressed(path, moneyness=self.moneyness, days=self.days, vols=self.vols,
+                            values=self.values.astype(np.float32), header=json.dumps(header))
+
+    @classmethod
+    def load(cls, path: str) -> 'PriceSurface':
+        """
+        Recharge une surface enregistrée par save.
+
+        Args:
+            path (str): Chemin du fichier.
+
+        Returns:
+            PriceSurface: La surface prête à être interrogée.
+        """
+        with np.load(path) as archive:
+            header = json.loads(str(archive['header']))
+            if header.get('version') != SURFACE_FORMAT_VERSION:
+                raise ValueError(f"Version de format de surface non supportée : {header.get('version')}")
+            data = {key: to_datetime(value) if key in DATE_KEYS else value for key, value in header['data'].items()}
+            surface = cls(data, archive['moneyness'], archive['days'], archive['vols'], header['monotone'])
+            surface.values = archive['values'].astype(np.float64)
+        surface.error_bound = header['error_bound']
+        return surface
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruit la surface de prix et Grecques trinomiaux.")
+    parser.add_argument("--workbook", help="Classeur dont la feuille 'Pricing' fournit les paramètres.")
+    parser.add_argument("--output", default="price_surface.npz")
+    parser.add_argument("--moneyness", type=float, nargs=3, default=[0.6, 1.4, 41], metavar=("MIN", "MAX", "COUNT"))
+    parser.add_argument("--days", type=int, nargs="+", help="Maturités résiduelles en jours.")
+    parser.add_argument("--vols", type=float, nargs=3, default=[0.05, 0.8, 16], metavar=("MIN", "MAX", "COUNT"))
+    parser.add_argument("--monotone", action="store_true")
+    parser.add_argument("--validate", type=int, default=50, help="Nombre de points de contrôle.")
+    args = parser.parse_args()
+
+    if args.workbook:
+        from ExcelInterface import open_interface
+        pricing_data = open_interface(args.workbook).read_data()
+    else:
+        pricing_data = dict(DEFAULT_DATA, nbsteps=100, is_pruned='Oui')
+    total_days = (to_datetime(pricing_data['maturity']) - to_datetime(pricing_data['pricing_date'])).days
+    first_day = 7
+    if pricing_data['div'] and pricing_data['div_date'] is not None:
+        # Côté de la date de dividende où se trouve la date de pricing
+        div_days = (to_datetime(pricing_data['maturity']) - to_datetime(pricing_data['div_date'])).days
+        if 0 <= div_days < total_days:
+            first_day = div_days + 1
+    grid_days = args.days or np.unique(np.round(np.geomspace(first_day, total_days, 16)).astype(int))
+
+    surface = PriceSurface(pricing_data, np.linspace(args.moneyness[0], args.moneyness[1], int(args.moneyness[2])),
+                           grid_days, np.linspace(args.vols[0], args.vols[1], int(args.vols[2])), args.monotone)
+    surface.build()
+    if args.validate:
+        print(f"Contrôle contre run_lattice : {surface.validate(args.validate, seed=0)}")
+    surface.save(args.output)
+    print(f"Surface enregistrée dans {args.output}")
@@ -0,0 +1,132 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+
+# État des processus de calcul, initialisé une fois par processus (voir init_worker)
+worker_state: Dict[str, Any] = {}
+
+
+def init_worker(shm_name: str, shape: Tuple[int, ...], positions: List[Dict[str, Any]], spot_shocks: np.ndarray,
+                vol_shocks: np.ndarray, rate_shocks: np.ndarray, backend: Optional[str]):
+    """
+    Mémorise le cube de résultats en mémoire partagée (nom et forme), les positions et les chocs.
+    """
+    worker_state.update(shm_name=shm_name, shape=shape, positions=positions, spot_shocks=spot_shocks,
+                        vol_shocks=vol_shocks, rate_shocks=rate_shocks, backend=backend)
+
+
+def price_scenario_job(job: Tuple[int, int, int]) -> None:
+    """
+    Valorise une position pour un choc de volatilité et de taux, sur toute la gamme de chocs de spot
+    (un seul arbre sans dividende), et écrit directement dans le cube partagé : rien n'est renvoyé. Le
+    processus s'attache au cube le temps de l'écriture et referme aussitôt son accès à la mémoire partagée.
+
+    Args:
+        job (Tuple[int, int, int]): Indices (position, choc de volatilité, choc de taux).
+    """
+    p, v, r = job
+    data = dict(worker_state['positions'][p])
+    data['vol'] += worker_state['vol_shocks'][v]
+    data['r'] += worker_state['rate_shocks'][r]
+    data['print_arbre'] = False
+
+    convergence = Convergence(DataInterface(data))
+    if worker_state['backend'] is not None:
+        convergence.backend = worker_state['backend']
+    spots = data['s0'] * (1 + worker_state['spot_shocks'])
+    prices = convergence.run_spot_ladder(spots)
+
+    shm = shared_memory.SharedMemory(name=worker_state['shm_name'])
+    try:
+        cube = np.ndarray(worker_state['shape'], dtype=np.float64, buffer=shm.buf)
+        cube[p, :, v, r] = prices
+        del cube  # La vue doit être libérée avant de fermer la mémoire partagée
+    finally:
+        shm.close()
+
+
+class ScenarioGrid:
+    """
+    Revalorisation complète de positions sous une grille de chocs de marché (spot ± x %, volatilité ± y
+    points, translations de taux).
+
+    Les couples (position, scénario) sont répartis sur un pool de processus. Chaque processus écrit ses
+    prix directement dans un cube NumPy en mémoire partagée, de forme (positions, chocs de spot, chocs de
+    volatilité, chocs de taux) : aucun résultat n'est renvoyé par pickle.
+    """
+
+    def __init__(self, positions: List[Dict[str, Any]], spot_shocks: Sequence[float] = (0.0,),
+                 vol_shocks: Sequence[float] = (0.0,), rate_shocks: Sequence[float] = (0.0,),
+                 backend: Optional[str] = None):
+        """
+        Initialise la grille de scénarios.
+
+        Args:
+            positions (List[Dict[str, Any]]): Paramètres de chaque position (format de ExcelInterface.read_data).
+            spot_shocks (Sequence[float]): Chocs relatifs du spot (0.05 pour +5 %).
+            vol_shocks (Sequence[float]): Chocs absolus de volatilité (0.01 pour +1 point).
+            rate_shocks (Sequence[float]): Chocs absolus de taux (0.0025 pour +25 pb).
+            backend (Optional[str]): Backend des arbres ("numpy", "numba" ou "threaded", celui de Convergence
+                par défaut).
+        """
+        self.positions = positions
+        self.spot_shocks = np.asarray(spot_shocks, dtype=float)
+        self.vol_shocks = np.asarray(vol_shocks, dtype=float)
+        self.rate_shocks = np.asarray(rate_shocks, dtype=float)
+        self.backend = backend
+        self.shape = (len(positions), len(self.spot_shocks), len(self.vol_shocks), len(self.rate_shocks))
+
+    def jobs(self) -> List[Tuple[int, int, int]]:
+        """
+        Liste les tâches indépendantes (position, choc de volatilité, choc de taux).
+        """
+        return [(p, v, r) for p in range(self.shape[0]) for v in range(self.shape[2]) for r in range(self.shape[3])]
+
+    def run(self, max_workers: Optional[int] = None) -> np.ndarray:
+        """
+        Valorise toute la grille en parallèle.
+
+        Args:
+            max_workers (Optional[int]): Nombre de processus (nombre de cœurs par défaut).
+
+        Returns:
+            np.ndarray: Cube des prix de forme (positions, chocs de spot, chocs de volatilité, chocs de taux).
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        jobs = self.jobs()
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(self.shape)) * 8, 1))
+        try:
+            cube = np.ndarray(self.shape, dtype=np.float64, buffer=shm.buf)
+            cube.fill(np.nan)
+            chunksize = max(1, len(jobs) // (4 * max_workers))
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                                     initargs=(shm.name, self.shape, self.positions, self.spot_shocks,
+                                               self.vol_shocks, self.rate_shocks, self.backend)) as executor:
+                for _ in executor.map(price_scenario_job, jobs, chunksize=chunksize):
+                    pass
+            return np.array(cube)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def pnl(self, cube: np.ndarray, quantities: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Calcule le P&L du portefeuille par scénario par rapport au scénario sans choc.
+
+        Args:
+            cube (np.ndarray): Cube des prix renvoyé par run.
+            quantities (Optional[Sequence[float]]): Quantité de chaque position (1 par défaut).
+
+        Returns:
+            np.ndarray: P&L de forme (chocs de spot, chocs de volatilité, chocs de taux).
+        """
+        base = [int(np.argmin(np.abs(shocks))) for shocks in (self.spot_shocks, self.vol_shocks, self.rate_shocks)]
+        if any(shocks[i] != 0 for shocks, i in zip((self.spot_shocks, self.vol_shocks, self.rate_shocks), base)):
+            raise ValueError("La grille doit contenir le scénario sans choc pour calculer le P&L.")
+        quantities = np.ones(self.shape[0]) if quantities is None else np.asarray(quantities, dtype=float)
+        values = np.tensordot(quantities, cube, axes=1)
+        return values - values[base[0], base[1], base[2]]
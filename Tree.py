@@ -1,4 +1,3 @@
-import math as math
 import xlwings as xw
 from datetime import timedelta
 from Node import Node
@@ -24,14 +23,17 @@ class Tree:
         self.market = market
         self.model = model
 
-    def df(self) -> float:
+    def df(self, i: int) -> float:
         """
-        Calcule le facteur d'actualisation.
+        Renvoie le facteur d'actualisation du pas i (précalculé par Model, sans exponentielle par nœud).
+
+        Args:
+            i (int): L'indice de temps.
 
         Returns:
             float: Le facteur d'actualisation.
         """
-        return math.exp(-self.market.r * self.model.delta_t)
+        return self.model.steps[i].df
 
     def build_tree(self, output: str = "S", print_tree: bool = False, ws: Optional[xw.main.Sheet] = None):
         """
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Les modules du projet sont à la racine du dépôt ; Node.price est récursif (une profondeur par pas)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
@@ -0,0 +1,24 @@
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+
+def convergence():
+    data = dict(DEFAULT_DATA, div=0, nbsteps=100, max_steps=10)
+    return Convergence(DataInterface(data))
+
+
+def test_adaptive_plain_stops_on_two_estimates():
+    result = convergence().run_adaptive(tol=1e-2, start_steps=25)
+    assert result["Converged"]
+    assert result["NbSteps"] >= 50
+
+
+def test_adaptive_extrapolated_compares_two_extrapolated_estimates():
+    # Première estimation brute, puis deux estimations extrapolées au minimum : N >= 25 * 2^2
+    c = convergence()
+    c.smooth = True
+    result = c.run_adaptive(tol=1e-2, extrapolate=True, start_steps=25)
+    assert result["Converged"]
+    assert result["NbSteps"] >= 100
+    assert c.data['nbsteps'] == 100
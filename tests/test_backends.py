@@ -0,0 +1,28 @@
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from NumbaLattice import NUMBA_AVAILABLE, ThreadedLattice, ThreadedRollingLattice
+
+
+def convergence(backend, div=0):
+    c = Convergence(DataInterface(dict(DEFAULT_DATA, div=div, nbsteps=300, max_steps=10, is_pruned='Non')))
+    c.backend = backend
+    return c
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba non installé")
+def test_threaded_backend_selects_threaded_lattices():
+    c = convergence("threaded")
+    assert c.lattice_class() is ThreadedLattice
+    assert c.lattice_class(price_only=True) is ThreadedRollingLattice
+
+
+@pytest.mark.parametrize("price_only", [False, True])
+def test_threaded_backend_matches_numpy(price_only):
+    threaded = convergence("threaded")
+    market, option, model = threaded.create_objects()
+    lattice = threaded.create_lattice(market, model, price_only)
+    if isinstance(lattice, ThreadedLattice):
+        # Blocs réduits pour que les colonnes soient effectivement découpées entre les threads
+        lattice.threads, lattice.min_chunk = 2, 64
+    assert lattice.price_option(option) == pytest.approx(convergence("numpy").run_lattice(price_only), abs=1e-10)
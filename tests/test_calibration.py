@@ -0,0 +1,47 @@
+import pytest
+from datetime import datetime
+from Calibration import VolCalibrator
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+MATURITIES = [datetime(2024, 3, 1), datetime(2024, 9, 1)]
+STRIKES = [90, 100, 110]
+
+
+def pricing_data():
+    return dict(DEFAULT_DATA, nbsteps=100, max_steps=10, is_pruned='Oui', print_arbre=False)
+
+
+def generate_quotes(vols, smooth=False):
+    # Primes générées par Convergence à des volatilités connues, avec les réglages de moteur donnés
+    quotes = []
+    for maturity, vol in zip(MATURITIES, vols):
+        for strike in STRIKES:
+            for option_type, exercise in (('Put', 'American'), ('Call', 'European')):
+                c = Convergence(DataInterface(dict(pricing_data(), vol=vol, maturity=maturity, strike=strike,
+                                                   option_type=option_type, type=exercise)))
+                c.smooth = smooth
+                quotes.append({'option_type': option_type, 'type': exercise, 'strike': strike,
+                               'maturity': maturity, 'premium': c.run_lattice()})
+    return quotes
+
+
+def test_flat_volatility_round_trip():
+    result = VolCalibrator(pricing_data(), generate_quotes([0.25, 0.25])).calibrate()
+    assert all(vol == pytest.approx(0.25, abs=1e-6) for vol in result['Vols'].values())
+    assert result['RMSE'] < 1e-6
+
+
+@pytest.mark.parametrize("smooth", [False, True])
+def test_term_structure_round_trip_with_engine_settings(smooth):
+    calibrator = VolCalibrator(pricing_data(), generate_quotes([0.35, 0.22], smooth), term_structure=True,
+                               backend="numpy", smooth=smooth)
+    result = calibrator.calibrate()
+    assert list(result['Vols'].values()) == pytest.approx([0.35, 0.22], abs=1e-6)
+    # Un arbre par maturité et par évaluation
+    assert result['Builds'] % len(MATURITIES) == 0
+
+
+def test_smoothed_quotes_are_not_recovered_exactly_without_smoothing():
+    result = VolCalibrator(pricing_data(), generate_quotes([0.35, 0.22], smooth=True), term_structure=True).calibrate()
+    assert result['RMSE'] > 1e-6
@@ -0,0 +1,28 @@
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+
+def convergence(exercise, option_type='Put', nbsteps=200):
+    data = dict(DEFAULT_DATA, div=0, option_type=option_type, type=exercise, nbsteps=nbsteps, max_steps=10)
+    return Convergence(DataInterface(data))
+
+
+@pytest.mark.parametrize("option_type", ['Call', 'Put'])
+def test_control_variate_european_returns_black_scholes(option_type):
+    result = convergence('European', option_type).run_control_variate()
+    assert result["American"] is None
+    assert result["Price"] == result["BlackScholes"]
+    assert result["European"] == pytest.approx(result["BlackScholes"], abs=2e-2)
+
+
+def test_control_variate_american_correction():
+    c = convergence('American')
+    result = c.run_control_variate()
+    assert result["Price"] == pytest.approx(result["American"] + result["BlackScholes"] - result["European"])
+    assert result["American"] == pytest.approx(c.run_lattice())
+
+
+def test_convergence_control_variate_rejects_european():
+    with pytest.raises(ValueError):
+        convergence('European').convergence_control_variate([50, 100], reference_steps=200)
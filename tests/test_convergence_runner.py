@@ -0,0 +1,24 @@
+import pytest
+from Convergence import Convergence
+from ConvergenceRunner import ConvergenceRunner
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+
+def convergence():
+    data = dict(DEFAULT_DATA, div=3, nbsteps=10, max_steps=12, is_pruned='Oui', print_arbre=False)
+    return Convergence(DataInterface(data))
+
+
+def test_stream_strike_yields_each_row_once_in_order():
+    c = convergence()
+    rows = list(ConvergenceRunner(c, max_workers=2).stream_strike(nb_steps=10))
+    assert [index for index, _ in rows] == list(range(len(rows)))
+    assert [row for _, row in rows] == convergence().convergence_strike(nb_steps=10)
+    assert c.data['strike'] == DEFAULT_DATA['strike']
+
+
+def test_stream_nbsteps_yields_each_row_once():
+    c = convergence()
+    rows = list(ConvergenceRunner(c, max_workers=2).stream_nbsteps())
+    assert sorted(index for index, _ in rows) == list(range(c.data['max_steps']))
+    assert ConvergenceRunner.collect(iter(rows)) == convergence().convergence_nbsteps()
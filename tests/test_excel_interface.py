@@ -0,0 +1,58 @@
+import shutil
+import openpyxl
+import pytest
+from ExcelInterface import (OpenpyxlInterface, parse_inputs, greeks_block, price_text, INPUT_NAMES, GREEKS_ROWS,
+                            TRINOMIAL_CELLS)
+
+WORKBOOK = "Excel_Projet_Python_VBA.xlsm"
+GREEKS = {'Delta': -0.45, 'Gamma': 0.0132, 'Vega': 27.5, 'Rho': -31.2, 'Theta': -0.0151}
+
+
+@pytest.fixture
+def workbook(tmp_path, request):
+    path = tmp_path / "pricing.xlsm"
+    shutil.copy(request.config.rootpath / WORKBOOK, path)
+    return path
+
+
+def test_parse_inputs_converts_cell_values():
+    values = {key: None for key in INPUT_NAMES}
+    values.update(nbsteps=100.0, max_steps=20.0, print_arbre=0, is_pruned=' Oui ')
+    data = parse_inputs(values)
+    assert (data['nbsteps'], data['max_steps'], data['print_arbre'], data['is_pruned']) == (100, 20, False, 'Oui')
+    assert isinstance(data['nbsteps'], int)
+
+
+def test_greeks_block_places_each_greek_every_other_row():
+    block = greeks_block(GREEKS)
+    assert len(block) == max(GREEKS_ROWS.values()) + 1
+    for greek, row in GREEKS_ROWS.items():
+        assert float(block[row][0]) == pytest.approx(GREEKS[greek])
+    assert all(block[row][0] is None for row in range(len(block)) if row not in GREEKS_ROWS.values())
+
+
+def test_openpyxl_round_trip(workbook, tmp_path):
+    output = tmp_path / "result.xlsm"
+    interface = OpenpyxlInterface(str(workbook), str(output))
+    data = interface.read_data()
+    assert set(INPUT_NAMES) <= set(data)
+    interface.write_trinomial_results(12.3456789, GREEKS)
+    interface.save()
+
+    price_cell, greeks_cell = TRINOMIAL_CELLS
+    sheet = openpyxl.load_workbook(output, keep_vba=True)['Pricing']
+    assert sheet[price_cell].value == price_text(12.3456789)
+    first = sheet[greeks_cell]
+    for greek, row in GREEKS_ROWS.items():
+        assert float(sheet.cell(row=first.row + row, column=first.column).value) == pytest.approx(GREEKS[greek])
+
+    # openpyxl n'enregistre pas les valeurs calculées : les entrées en formule ne peuvent plus être relues
+    with pytest.raises(ValueError, match="level_pruning"):
+        OpenpyxlInterface(str(output)).read_data()
+
+
+def test_read_data_matches_cached_inputs(workbook):
+    data = OpenpyxlInterface(str(workbook)).read_data()
+    assert (data['s0'], data['strike'], data['nbsteps'], data['pruned_level']) == (100, 101, 600, 1e-3)
+    # Relecture possible : le classeur des valeurs est refermé après chaque lecture
+    assert OpenpyxlInterface(str(workbook)).read_data() == data
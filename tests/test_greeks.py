@@ -0,0 +1,61 @@
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from Greeks import GreeksCalculator
+
+
+def convergence(div=0):
+    data = dict(DEFAULT_DATA, div=div, nbsteps=100, max_steps=10, is_pruned='Oui')
+    return Convergence(DataInterface(data))
+
+
+def test_scenario_copies_engine_settings():
+    c = convergence()
+    c.backend, c.smooth, c.refine_grid = "numpy", True, True
+    scenario = c.scenario(vol=0.3)
+    assert (scenario.backend, scenario.smooth, scenario.refine_grid) == ("numpy", True, True)
+    assert scenario.data['vol'] == 0.3 and c.data['vol'] == DEFAULT_DATA['vol']
+
+
+@pytest.mark.parametrize("smooth, refine_grid", [(False, False), (True, False), (True, True)])
+def test_calculate_all_prices_scenarios_with_engine_settings(smooth, refine_grid):
+    c = convergence(div=3)
+    c.smooth, c.refine_grid = smooth, refine_grid
+    greeks = GreeksCalculator(c).calculate_all(max_workers=1)
+    base = c.run_lattice()
+    assert greeks['Vega'] == pytest.approx((c.scenario(vol=c.data['vol'] + 0.01).run_lattice() - base) / 0.01)
+    assert greeks['Rho'] == pytest.approx((c.scenario(r=c.data['r'] + 0.01).run_lattice() - base) / 0.01)
+
+
+@pytest.mark.parametrize("div", [0, 3])
+def test_individual_greeks_match_calculate_all(div):
+    c = convergence(div)
+    calculator = GreeksCalculator(c)
+    greeks = calculator.calculate_all(max_workers=1)
+    assert calculator.calculate_vega() == pytest.approx(greeks['Vega'])
+    assert calculator.calculate_rho() == pytest.approx(greeks['Rho'])
+    assert calculator.calculate_theta() == pytest.approx(greeks['Theta'])
+
+
+def test_theta_is_per_day():
+    # Un jour de maturité en moins : Theta du même ordre que le Theta Black-Scholes journalier
+    c = convergence()
+    theta = GreeksCalculator(c).calculate_theta()
+    bs_theta = c.run_black_scholes()['Greeks']['Theta']
+    assert theta == pytest.approx(bs_theta / 365, rel=0.2)
+
+
+def test_theta_rejects_fractional_days():
+    with pytest.raises(ValueError):
+        GreeksCalculator(convergence()).calculate_theta(0.01)
+
+
+@pytest.mark.parametrize("div", [0, 3])
+def test_delta_and_gamma_use_the_lattice_price(div):
+    # Delta et Gamma sont lus sur l'arbre en tableaux qui donne le prix affiché (run_lattice)
+    c = convergence(div)
+    calculator = GreeksCalculator(c)
+    s0 = c.data['s0']
+    up, base, down = (c.scenario(s0=s0 * shift).run_lattice() for shift in (1.01, 1, 0.99))
+    assert calculator.calculate_delta() == pytest.approx((up - base) / (0.01 * s0), abs=1e-9)
+    assert calculator.calculate_gamma() == pytest.approx((up - 2 * base + down) / (0.01 * s0) ** 2, abs=1e-7)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import HedgeBacktest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from HedgeBacktest import DeltaHedgeBacktest, simulate_paths, init_worker, hedge_batch_job, value_at
+
+# Maturité de DEFAULT_DATA : 366 jours
+MATURITY_DAYS = 366
+
+
+def hedge_data(**overrides):
+    return dict(DEFAULT_DATA, option_type='Call', type='European', nbsteps=60, is_pruned='Oui', pruned_level=1e-9,
+                **overrides)
+
+
+def test_hedge_error_shrinks_with_rebalancing_frequency():
+    # Mêmes trajectoires journalières, rebalancées tous les 61, 12 puis 2 jours
+    data = hedge_data()
+    daily = np.arange(MATURITY_DAYS + 1)
+    paths = simulate_paths(data, daily, 400, seed=3)
+    stds = []
+    for every in (61, 12, 2):
+        days = daily[::every]
+        result = DeltaHedgeBacktest(data, days, backend="numpy").run(paths[:, days], batch_size=400, max_workers=1)
+        stds.append(result["Std"])
+    # L'écart-type décroît environ comme la racine du pas de rebalancement (ratios attendus ~2.3 et ~2.4)
+    assert stds[0] > 1.5 * stds[1]
+    assert stds[1] > 1.5 * stds[2]
+
+
+@pytest.mark.parametrize("div", [0, 3])
+def test_batches_match_single_paths(div):
+    data = dict(hedge_data(div=div), print_arbre=False)
+    days = np.arange(0, MATURITY_DAYS + 1, 61)
+    paths = simulate_paths(data, days, 6, seed=5)
+    batched = DeltaHedgeBacktest(data, days, backend="numpy").run(paths, batch_size=4, max_workers=1)
+
+    init_worker(data, days, "numpy")
+    single = [hedge_batch_job((0, path[None, :]))[1][0] for path in paths]
+    np.testing.assert_allclose(batched["HedgeError"], single, rtol=1e-10, atol=1e-10)
+    # Pas de revalorisation à la maturité : la dette est le payoff
+    assert batched["Repricings"] == len(paths) * (len(days) - 1)
+
+
+def test_multi_strike_values_match_a_lattice_per_spot():
+    # Sans dividende, un seul arbre valorise tous les spots : même prix et delta qu'un arbre construit à chaque spot
+    data = dict(hedge_data(), print_arbre=False)
+    days = np.array([0, 100, MATURITY_DAYS])
+    init_worker(data, days, "numpy")
+    spots = np.array([80.0, 100.0, 125.0])
+    prices, deltas = value_at(0, spots)
+    assert HedgeBacktest.worker_state['builds'] == 1
+    for spot, price, delta in zip(spots, prices, deltas):
+        c = Convergence(DataInterface(dict(data, s0=spot)))
+        c.backend = "numpy"
+        market, option, model = c.create_objects()
+        lattice = c.create_lattice(market, model)
+        assert price == pytest.approx(lattice.price_option(option), abs=1e-10)
+        assert delta == pytest.approx(lattice.greeks()["Delta"][0], abs=1e-10)
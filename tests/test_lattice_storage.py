@@ -0,0 +1,57 @@
+import json
+import os
+import numpy as np
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from Lattice import Lattice, LATTICE_ARRAYS, LATTICE_FORMAT_VERSION
+from Market import Curve
+
+
+def built_lattice(div=3, smooth=False, **overrides):
+    c = Convergence(DataInterface(dict(DEFAULT_DATA, div=div, nbsteps=80, max_steps=10, is_pruned='Oui', **overrides)))
+    c.backend, c.smooth, c.refine_grid = "numpy", smooth, True
+    market, option, model = c.create_objects()
+    return c.create_lattice(market, model).build(), option
+
+
+@pytest.mark.parametrize("smooth", [False, True])
+@pytest.mark.parametrize("mmap_mode", ['r', None])
+def test_save_load_round_trip(tmp_path, smooth, mmap_mode):
+    lattice, option = built_lattice(smooth=smooth)
+    strikes, is_call = np.array([90.0, 101.0, 110.0]), np.array([True, False, False])
+    expected = lattice.price(strikes, is_call, True)
+    lattice.save(str(tmp_path))
+
+    loaded = Lattice.load(str(tmp_path), mmap_mode=mmap_mode)
+    assert loaded.is_built()
+    for name in LATTICE_ARRAYS:
+        array = getattr(loaded, name)
+        assert isinstance(array, np.memmap) == (mmap_mode is not None)
+        np.testing.assert_array_equal(array, getattr(lattice, name))
+    np.testing.assert_array_equal(loaded.model.times, lattice.model.times)
+    np.testing.assert_allclose(loaded.price(strikes, is_call, True), expected, rtol=0, atol=1e-12)
+
+
+def test_save_load_keeps_curves(tmp_path):
+    lattice, option = built_lattice(div=0, r=Curve([0.5, 1], [0.01, 0.03]), vol=Curve([0.5, 1], [0.35, 0.3]))
+    lattice.save(str(tmp_path))
+    loaded = Lattice.load(str(tmp_path))
+    assert isinstance(loaded.market.r, Curve) and isinstance(loaded.market.vol, Curve)
+    assert loaded.price_option(option) == pytest.approx(lattice.price_option(option), abs=1e-12)
+
+
+def test_header_is_versioned(tmp_path):
+    lattice, _ = built_lattice()
+    lattice.save(str(tmp_path))
+    header_path = os.path.join(str(tmp_path), "lattice.json")
+    with open(header_path) as file:
+        header = json.load(file)
+    assert header['version'] == LATTICE_FORMAT_VERSION
+    assert header['nodes'] == len(lattice.spots)
+
+    header['version'] = LATTICE_FORMAT_VERSION + 1
+    with open(header_path, "w") as file:
+        json.dump(header, file)
+    with pytest.raises(ValueError, match="Version"):
+        Lattice.load(str(tmp_path))
@@ -0,0 +1,46 @@
+import pytest
+import LoadTest
+from LoadTest import generate_book, run_load_test
+
+
+def test_generate_book_is_deterministic_for_a_seed():
+    assert generate_book(20, seed=7) == generate_book(20, seed=7)
+    assert generate_book(20, seed=7) != generate_book(20, seed=8)
+    # Un portefeuille plus long commence par les mêmes options
+    assert generate_book(30, seed=7)[:20] == generate_book(20, seed=7)
+
+
+def test_generate_book_ranges():
+    book = generate_book(200, seed=0, div_share=0.5)
+    for data in book:
+        assert 0.7 * data['s0'] - 0.01 <= data['strike'] <= 1.3 * data['s0'] + 0.01
+        assert 14 <= (data['maturity'] - data['pricing_date']).days <= 730
+        assert data['pricing_date'] < data['div_date'] < data['maturity']
+    assert 0.3 < sum(1 for data in book if data['div']) / len(book) < 0.7
+
+
+def test_run_load_test_counts_every_failure(monkeypatch):
+    # Une erreur autre que ValueError est comptée comme un échec sans interrompre la mesure
+    monkeypatch.setitem(LoadTest.ENTRY_POINTS, 'failing', lambda convergence: convergence.run_lattice()
+                        if convergence.data['option_type'] == 'Call' else 1 / 0)
+    book = generate_book(12, seed=3, nbsteps=20)
+    result = run_load_test(book, 'failing', concurrency=2, mode='thread')
+    assert result['Options'] == 12
+    assert result['Errors'] == sum(1 for data in book if data['option_type'] == 'Put')
+    assert 0 < result['Errors'] < 12
+
+
+def test_thread_mode_initialises_once_per_thread(monkeypatch):
+    calls = []
+    monkeypatch.setattr(LoadTest, 'init_worker', calls.append)
+    result = run_load_test(generate_book(4, seed=0, nbsteps=20), 'lattice', concurrency=3, mode='thread')
+    assert len(calls) == 3
+    assert result['Errors'] == 0
+
+
+def test_unknown_entry_or_mode_is_rejected():
+    book = generate_book(1)
+    with pytest.raises(ValueError):
+        run_load_test(book, 'unknown')
+    with pytest.raises(ValueError):
+        run_load_test(book, mode='fiber')
@@ -0,0 +1,33 @@
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+# Prix de l'arbre Node/Tree à 100 pas (DEFAULT_DATA, pruning activé), dividende de 3 au 2024-03-01
+PINNED_PRICES = {
+    (0, 'Call', 'European'): 12.387194388928782,
+    (0, 'Put', 'European'): 11.381835880377466,
+    (0, 'Put', 'American'): 11.561818102953376,
+    (3, 'Call', 'European'): 10.937117257473089,
+    (3, 'Call', 'American'): 11.05390150816383,
+    (3, 'Put', 'European'): 12.901826840713625,
+    (3, 'Put', 'American'): 13.107097563131706,
+}
+
+
+def convergence(div, option_type, exercise, nbsteps=100):
+    data = dict(DEFAULT_DATA, div=div, option_type=option_type, type=exercise, nbsteps=nbsteps, max_steps=10,
+                print_arbre=False, is_pruned='Oui')
+    return Convergence(DataInterface(data))
+
+
+@pytest.mark.parametrize("key", sorted(PINNED_PRICES))
+def test_node_tree_pinned_prices(key):
+    assert convergence(*key).run_trinomial() == pytest.approx(PINNED_PRICES[key], abs=1e-9)
+
+
+@pytest.mark.parametrize("key", sorted(PINNED_PRICES))
+def test_node_tree_matches_lattice(key):
+    # Avec les nœuds up/down sur la grille, l'arbre Node/Tree et le Lattice construisent le même arbre
+    c = convergence(*key)
+    c.backend = "numpy"
+    assert c.run_trinomial() == pytest.approx(c.run_lattice(), abs=1e-10)
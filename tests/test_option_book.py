@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface
+from Lattice import Lattice
+from BlackScholes import BlackScholes
+from LoadTest import generate_book
+from OptionBook import OptionBook
+
+NBSTEPS = 40
+RECORDS = generate_book(30, seed=11, nbsteps=NBSTEPS, div_share=0.5)
+
+
+def convergence(record):
+    c = Convergence(DataInterface(record))
+    c.backend = "numpy"
+    return c
+
+
+def test_book_columns():
+    book = OptionBook.from_records(RECORDS)
+    assert len(book) == len(RECORDS)
+    assert 0 < book.has_dividend().sum() < len(book)
+    np.testing.assert_array_equal(book.is_call, [record['option_type'] == 'Call' for record in RECORDS])
+
+
+def test_price_lattice_matches_each_option():
+    book = OptionBook.from_records(RECORDS)
+    prices = book.price_lattice(NBSTEPS, Lattice, seuil=RECORDS[0]['pruned_level'])
+    expected = [convergence(record).run_lattice() for record in RECORDS]
+    np.testing.assert_allclose(prices, expected, rtol=1e-10, atol=1e-10)
+
+
+def test_price_black_scholes_matches_each_option():
+    # Même convention que Convergence.run_black_scholes : le dividende discret est ignoré
+    prices = OptionBook.from_records(RECORDS).price_black_scholes()
+    expected = [convergence(record).run_black_scholes()["Price"] for record in RECORDS]
+    np.testing.assert_allclose(prices, expected, rtol=1e-10, atol=1e-10)
+
+
+def test_price_black_scholes_escrowed_removes_discounted_dividend():
+    book = OptionBook.from_records(RECORDS)
+    escrowed = book.price_black_scholes_escrowed()
+    with_div = book.has_dividend()
+    np.testing.assert_allclose(escrowed[~with_div], book.price_black_scholes()[~with_div], rtol=1e-12)
+    for j in np.flatnonzero(with_div):
+        spot = book.s0[j] - book.div[j] * np.exp(-book.r[j] * book.div_time[j])
+        assert escrowed[j] == pytest.approx(BlackScholes.price_array(spot, book.strike[j], book.r[j], book.vol[j],
+                                                                     book.maturity[j], book.is_call[j]))
@@ -0,0 +1,65 @@
+import numpy as np
+from datetime import timedelta
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from PriceSurface import PriceSurface, SURFACE_QUANTITIES
+
+MONEYNESS = np.linspace(0.8, 1.2, 17)
+# Maturités résiduelles avant la date de dividende de DEFAULT_DATA (184 jours avant la maturité)
+DAYS = [200, 240, 280, 320, 360]
+VOLS = np.linspace(0.2, 0.4, 5)
+
+
+def surface(div=0, monotone=False):
+    data = dict(DEFAULT_DATA, nbsteps=60, is_pruned='Oui', div=div)
+    return PriceSurface(data, MONEYNESS, DAYS, VOLS, monotone, backend="numpy").build()
+
+
+@pytest.mark.parametrize("div", [0, 3])
+def test_validate_against_lattice_within_tolerance(div):
+    # Erreur d'interpolation et oscillation de l'arbre avec la position du strike : quelques centimes pour K = 101
+    result = surface(div).validate(30, seed=0)
+    assert result["MaxError"] < 0.05
+    assert result["RMSE"] < 0.02
+
+
+def test_quote_on_grid_matches_lattice():
+    # Sur un point de la grille (spot = strike), l'interpolation rend la valeur de l'arbre de construction
+    s = surface()
+    data = dict(s.data, s0=s.strike, vol=float(VOLS[2]),
+                pricing_date=s.data['maturity'] - timedelta(days=DAYS[1]))
+    c = Convergence(DataInterface(data))
+    c.backend = "numpy"
+    assert s.quote(s.strike, DAYS[1] / 365, VOLS[2])["Price"] == pytest.approx(c.run_lattice(), abs=1e-10)
+
+
+@pytest.mark.parametrize("monotone", [False, True])
+def test_save_load_round_trip(tmp_path, monotone):
+    s = surface(div=3, monotone=monotone)
+    s.validate(10, seed=1)
+    path = str(tmp_path / "surface.npz")
+    s.save(path)
+    loaded = PriceSurface.load(path)
+
+    assert loaded.data == s.data
+    assert loaded.monotone == monotone
+    assert loaded.error_bound == s.error_bound
+    np.testing.assert_array_equal(loaded.days, s.days)
+    # Grandeurs enregistrées en float32
+    np.testing.assert_allclose(loaded.values, s.values, rtol=1e-6, atol=1e-7)
+    before = s.quote_array(100 * MONEYNESS[3:9], np.full(6, 0.7), np.full(6, 0.27))
+    after = loaded.quote_array(100 * MONEYNESS[3:9], np.full(6, 0.7), np.full(6, 0.27))
+    for name in SURFACE_QUANTITIES:
+        np.testing.assert_allclose(after[name], before[name], rtol=1e-5, atol=1e-6)
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = str(tmp_path / "surface.npz")
+    surface().save(path)
+    with np.load(path) as archive:
+        arrays = dict(archive)
+    arrays['header'] = str(arrays['header']).replace('"version": 1', '"version": 0')
+    np.savez_compressed(path, **arrays)
+    with pytest.raises(ValueError):
+        PriceSurface.load(path)
@@ -0,0 +1,56 @@
+import tracemalloc
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+
+def convergence(div=0, nbsteps=200, is_pruned='Oui', backend="numpy"):
+    c = Convergence(DataInterface(dict(DEFAULT_DATA, div=div, nbsteps=nbsteps, max_steps=10, is_pruned=is_pruned)))
+    c.backend = backend
+    return c
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+@pytest.mark.parametrize("div, is_pruned", [(0, 'Non'), (0, 'Oui'), (3, 'Oui')])
+def test_rolling_price_matches_full_lattice(backend, div, is_pruned):
+    c = convergence(div, is_pruned=is_pruned, backend=backend)
+    assert c.run_lattice(price_only=True) == pytest.approx(c.run_lattice(), abs=1e-12)
+
+
+@pytest.mark.parametrize("div", [0, 3])
+def test_rolling_summary_matches_full_lattice(div):
+    c = convergence(div)
+    market, _, model = c.create_objects()
+    rolling = c.create_lattice(market, model, price_only=True).summary()
+    assert rolling == pytest.approx(c.create_lattice(market, model).summary(), abs=1e-12)
+
+
+def peak_memory(nbsteps: int, price_only: bool) -> int:
+    c = convergence(nbsteps=nbsteps, is_pruned='Non')
+    tracemalloc.start()
+    try:
+        c.run_lattice(price_only=price_only)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_rolling_memory_grows_linearly():
+    # Arbre non élagué : O(N) en mode prix seul contre O(N²) pour l'arbre complet
+    rolling_small, rolling_large = peak_memory(400, True), peak_memory(800, True)
+    assert rolling_large / rolling_small < 3
+    assert rolling_large < peak_memory(800, False) / 20
+
+
+def test_greeks_need_three_steps():
+    c = convergence(nbsteps=2)
+    market, option, model = c.create_objects()
+    lattice = c.create_lattice(market, model)
+    lattice.price_option(option)
+    with pytest.raises(ValueError, match="au moins 3 pas"):
+        lattice.greeks()
+    c.data['nbsteps'] = 3
+    market, option, model = c.create_objects()
+    lattice = c.create_lattice(market, model)
+    lattice.price_option(option)
+    assert set(lattice.greeks()) == {"Delta", "Gamma", "Theta"}
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from Scenarios import ScenarioGrid
+
+POSITIONS = [dict(DEFAULT_DATA, nbsteps=50, max_steps=10, is_pruned='Oui', print_arbre=False),
+             dict(DEFAULT_DATA, nbsteps=50, max_steps=10, is_pruned='Oui', print_arbre=False, div=3,
+                  option_type='Call', type='European', strike=95)]
+SPOT_SHOCKS, VOL_SHOCKS, RATE_SHOCKS = [-0.1, 0.0, 0.1], [-0.05, 0.0, 0.05], [0.0, 0.01]
+
+
+@pytest.fixture(scope="module")
+def grid_and_cube():
+    grid = ScenarioGrid(POSITIONS, SPOT_SHOCKS, VOL_SHOCKS, RATE_SHOCKS)
+    return grid, grid.run(max_workers=2)
+
+
+def test_cube_matches_direct_pricing(grid_and_cube):
+    _, cube = grid_and_cube
+    assert cube.shape == (2, 3, 3, 2)
+    for p, position in enumerate(POSITIONS):
+        for s, spot_shock in enumerate(SPOT_SHOCKS):
+            for v, vol_shock in enumerate(VOL_SHOCKS):
+                for r, rate_shock in enumerate(RATE_SHOCKS):
+                    data = dict(position, s0=position['s0'] * (1 + spot_shock), vol=position['vol'] + vol_shock,
+                                r=position['r'] + rate_shock)
+                    assert cube[p, s, v, r] == pytest.approx(Convergence(DataInterface(data)).run_lattice(),
+                                                             abs=1e-10)
+
+
+def test_pnl_is_zero_in_the_base_scenario(grid_and_cube):
+    grid, cube = grid_and_cube
+    pnl = grid.pnl(cube, quantities=[1, -2])
+    assert pnl[1, 1, 0] == 0
+    np.testing.assert_allclose(pnl, np.tensordot([1, -2], cube - cube[:, 1:2, 1:2, 0:1], axes=1))
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from Market import Curve
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+from Calibration import VolCalibrator
+from HedgeBacktest import DeltaHedgeBacktest, simulate_paths
+
+RATE_CURVE = Curve([0.25, 1, 2], [0.01, 0.03, 0.045])
+VOL_CURVE = Curve([0.25, 1, 2], [0.4, 0.3, 0.25])
+
+
+def convergence(r, vol, option_type='Call', nbsteps=200):
+    data = dict(DEFAULT_DATA, r=r, vol=vol, option_type=option_type, type='European', strike=105, nbsteps=nbsteps,
+                max_steps=10, print_arbre=False, is_pruned='Oui', pruned_level=1e-9)
+    c = Convergence(DataInterface(data))
+    c.backend = "numpy"
+    return c
+
+
+@pytest.mark.parametrize("option_type", ["Call", "Put"])
+def test_curves_match_black_scholes(option_type):
+    # Européenne : Black-Scholes au taux zéro-coupon et à la volatilité implicite de maturité
+    c = convergence(RATE_CURVE, VOL_CURVE, option_type)
+    assert c.run_lattice() == pytest.approx(c.run_black_scholes()["Price"], abs=5e-3)
+
+
+@pytest.mark.parametrize("vol", [VOL_CURVE, Curve([0.25, 1], [0.2, 0.35]), 0.3])
+def test_node_tree_matches_lattice_with_curves(vol):
+    c = convergence(RATE_CURVE, vol, nbsteps=60)
+    assert c.run_trinomial() == pytest.approx(c.run_lattice(), abs=1e-10)
+
+
+def test_flat_curve_matches_flat_market():
+    flat = convergence(0.02, 0.3).run_lattice()
+    assert convergence(Curve([1], [0.02]), Curve([1], [0.3])).run_lattice() == pytest.approx(flat, abs=1e-10)
+
+
+def test_decreasing_total_variance_is_rejected():
+    with pytest.raises(ValueError):
+        convergence(0.02, Curve([0.5, 1], [0.4, 0.2])).run_lattice()
+
+
+def test_calibration_with_rate_curve_recovers_volatility():
+    data = dict(convergence(RATE_CURVE, 0.25).data, type='American', option_type='Put', vol=0.4)
+    maturities = [datetime(2024, 3, 1), datetime(2024, 9, 1)]
+    quotes = []
+    for maturity in maturities:
+        for strike in (95, 105):
+            c = convergence(RATE_CURVE, 0.25)
+            c.data.update(maturity=maturity, strike=strike, option_type='Put', type='American')
+            quotes.append({'option_type': 'Put', 'type': 'American', 'strike': strike, 'maturity': maturity,
+                           'premium': c.run_lattice()})
+    result = VolCalibrator(data, quotes).calibrate()
+    assert list(result['Vols'].values())[0] == pytest.approx(0.25, abs=1e-5)
+
+
+def test_simulated_paths_with_flat_curves_match_flat_market():
+    days = [0, 30, 90, 180]
+    flat = simulate_paths(dict(DEFAULT_DATA), days, 100, seed=1)
+    curves = simulate_paths(dict(DEFAULT_DATA, r=Curve([1], [0.02]), vol=Curve([1], [0.3])), days, 100, seed=1)
+    np.testing.assert_allclose(curves, flat, rtol=1e-12)
+
+
+def test_simulated_paths_drift_follows_rate_curve():
+    days = [0, 91, 365]
+    paths = simulate_paths(dict(DEFAULT_DATA, r=RATE_CURVE, vol=1e-8), days, 2, seed=0)
+    np.testing.assert_allclose(paths[0, 1:], 100 * np.exp(RATE_CURVE.cumulative(np.array(days[1:]) / 365)))
+
+
+def test_hedge_backtest_rejects_curves():
+    with pytest.raises(ValueError):
+        DeltaHedgeBacktest(dict(DEFAULT_DATA, nbsteps=50, r=RATE_CURVE), [0, 30, 60])
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from Convergence import Convergence
+from ExcelInterface import DataInterface, DEFAULT_DATA
+
+STEPS = range(40, 161, 20)
+
+
+def convergence(nbsteps, refine_grid, **overrides):
+    data = dict(DEFAULT_DATA, nbsteps=nbsteps, print_arbre=False, **overrides)
+    c = Convergence(DataInterface(data))
+    c.refine_grid = refine_grid
+    return c
+
+
+def test_single_step_with_dividend_before_maturity():
+    # Aucune colonne intérieure où placer le dividende : la grille raffinée reste [0, T]
+    uniform = convergence(1, False, div=3, is_pruned='Oui')
+    refined = convergence(1, True, div=3, is_pruned='Oui')
+    _, _, model = refined.create_objects()
+    assert len(model.times) == 2
+    assert refined.run_lattice() == pytest.approx(uniform.run_lattice(), abs=1e-12)
+
+
+def test_dividend_date_is_a_column():
+    c = convergence(7, True, div=3, is_pruned='Oui')
+    _, _, model = c.create_objects()
+    div_t = (c.data['div_date'] - c.data['pricing_date']).total_seconds() / 86400 / 365
+    assert np.any(np.isclose(model.times, div_t))
+    assert np.all(np.diff(model.times) > 0)
+
+
+def priced(nbsteps, refine_grid, **overrides):
+    c = convergence(nbsteps, refine_grid, **overrides)
+    market, option, model = c.create_objects()
+    lattice = c.create_lattice(market, model)
+    return lattice.price_option(option), lattice.summary()["Nodes"]
+
+
+@pytest.mark.parametrize("overrides", [
+    dict(option_type='Put', type='American', div=0, is_pruned='Non'),
+    dict(option_type='Call', type='European', div=0, is_pruned='Non'),
+    dict(option_type='Put', type='American', div=3, is_pruned='Oui', pruned_level=1e-12),
+])
+def test_refined_grid_is_closer_to_reference_for_the_same_nodes(overrides):
+    # Les pas plus courts près de la maturité élargissent la grille en crans : à nombre de pas égal la grille
+    # raffinée a plus de noeuds, on la compare donc à la grille uniforme d'au moins autant de noeuds
+    reference = convergence(8000, False, **overrides).run_lattice(price_only=True)
+    errors = {False: [], True: []}
+    for nbsteps in STEPS:
+        refined, refined_nodes = priced(nbsteps, True, **overrides)
+        uniform_steps = nbsteps
+        uniform, uniform_nodes = priced(uniform_steps, False, **overrides)
+        while uniform_nodes < refined_nodes:
+            uniform_steps += 1
+            uniform, uniform_nodes = priced(uniform_steps, False, **overrides)
+        errors[True].append(refined - reference)
+        errors[False].append(uniform - reference)
+    rmse = {refine_grid: np.sqrt(np.mean(np.square(e))) for refine_grid, e in errors.items()}
+    assert rmse[True] < rmse[False] / 2